@@ -1,9 +1,6 @@
-from selenium import webdriver
+from launcher import browser_launch
 
-options = webdriver.ChromeOptions()
-options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-
-driver = webdriver.Chrome(options=options)
+driver = browser_launch.launch(headless=False, binary_location=browser_launch.BRAVE_MAC)
 
 driver.get("https://github.com")
 
@@ -1,5 +1,7 @@
 from selenium import webdriver
 
+from launcher import browser_launch
+
 print("Choose a browser:")
 print("1. Brave")
 print("2. Chrome")
@@ -9,12 +11,10 @@ choice = input("\nEnter your choice (1-3): ")
 
 try:
     if choice == "1":
-        options = webdriver.ChromeOptions()
-        options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-        driver = webdriver.Chrome(options=options)
+        driver = browser_launch.launch(headless=False, binary_location=browser_launch.BRAVE_MAC)
         print("Opening Brave...")
     elif choice == "2":
-        driver = webdriver.Chrome()
+        driver = browser_launch.launch(headless=False)
         print("Opening Chrome...")
     elif choice == "3":
         driver = webdriver.Firefox()
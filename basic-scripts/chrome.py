@@ -1,6 +1,6 @@
-from selenium import webdriver
+from launcher import browser_launch
 
-driver = webdriver.Chrome()
+driver = browser_launch.launch(headless=False)
 
 driver.get("https://github.com")
 
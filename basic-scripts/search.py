@@ -1,9 +1,8 @@
-from selenium import webdriver
+from selenium.webdriver.common.by import By
 
-options = webdriver.ChromeOptions()
-options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
+from launcher import browser_launch
 
-driver = webdriver.Chrome(options=options)
+driver = browser_launch.launch(headless=False, binary_location=browser_launch.BRAVE_MAC)
 
 driver.maximize_window()
 
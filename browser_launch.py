@@ -0,0 +1,267 @@
+"""
+Browser Launch - fast, repeatable Chrome/Brave startup shared by every suite
+Used by functional-testing (browser_pool.py), python-tests and basic-scripts
+- Driver and browser binaries are resolved by Selenium Manager once per
+  machine and cached in a versioned JSON file; later launches pass the cached
+  chromedriver to the Service, so Selenium Manager is never run again
+  (a browser update or another Selenium version invalidates the entry)
+- A user-data template is built once per browser and mode (headless or
+  headed, with that mode's arguments; first-run state, component files and
+  caches already written) and copied for every session, so no session starts
+  from a cold empty profile; the copy is removed on quit()
+- A lean argument set: no first-run UI, sync, extensions, background
+  networking or component updates; headless uses the new headless mode.
+  Flags the caller already set in options win over the lean ones
+- Every launch is timed; launch_stats() / report() give the percentiles
+Cache: ~/.cache/browser-launch (BROWSER_LAUNCH_CACHE to move it)
+
+Usage:
+    import browser_launch
+    driver = browser_launch.launch()                      # headless Chrome
+    driver = browser_launch.launch(headless=False, binary_location=BRAVE)
+    ...
+    driver.quit()
+    print(browser_launch.report())
+"""
+
+import json
+import math
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+
+import selenium
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+
+# Bump when the cache layout or the template contents change
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get('BROWSER_LAUNCH_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'browser-launch')
+BRAVE_MAC = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
+WINDOW_SIZE = '1920,1080'
+
+LEAN_ARGS = (
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions',
+    '--metrics-recording-only',
+    '--password-store=basic',
+    '--use-mock-keychain',
+    '--mute-audio',
+)
+HEADLESS_ARGS = (
+    '--headless=new',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    f'--window-size={WINDOW_SIZE}',
+)
+# Lock and crash-reporter files of the Chrome that built the template
+_PROFILE_IGNORE = shutil.ignore_patterns('Singleton*', 'lockfile', 'LOCK', 'Crashpad', '*.tmp')
+
+_lock = threading.Lock()
+# One entry per launch: {'seconds', 'resolution': 'cached'|'resolved', 'profile': 'template'|'built'}
+_launches = []
+
+
+class LaunchedChrome(webdriver.Chrome):
+    """Chrome session whose copied profile is deleted on quit()"""
+
+    profile_dir = None
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            if self.profile_dir:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+                self.profile_dir = None
+
+
+def lean_args(headless=True):
+    return list(LEAN_ARGS + HEADLESS_ARGS) if headless else list(LEAN_ARGS)
+
+
+def _cache_path():
+    return os.path.join(CACHE_DIR, f"drivers-v{CACHE_VERSION}.json")
+
+
+def _load_cache():
+    try:
+        with open(_cache_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Written to a temp file first: parallel workers may resolve at the same time
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, _cache_path())
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+
+
+def _cache_key(options):
+    browser = options.binary_location or options.capabilities['browserName']
+    return f"{browser}|selenium {selenium.__version__}|{platform.system()}-{platform.machine()}"
+
+
+def _selenium_manager(options):
+    """(driver_path, browser_path) from Selenium Manager"""
+    try:
+        finder = DriverFinder(Service(), options)  # selenium >= 4.20
+        return finder.get_driver_path(), finder.get_browser_path()
+    except TypeError:
+        # Older selenium: a static lookup that fills options.binary_location itself
+        return DriverFinder.get_path(Service(), options), options.binary_location
+
+
+def resolve(options):
+    """(driver_path, browser_path, 'cached'|'resolved') for options' browser"""
+    key = _cache_key(options)
+    with _lock:
+        entry = _load_cache().get(key)
+        if (entry and os.path.isfile(entry['driver_path'])
+                and _mtime(entry['browser_path']) == entry['browser_mtime']):
+            return entry['driver_path'], entry['browser_path'], 'cached'
+
+        driver_path, browser_path = _selenium_manager(options)
+        cache = _load_cache()
+        cache[key] = {'driver_path': driver_path, 'browser_path': browser_path or None,
+                      'browser_mtime': _mtime(browser_path), 'resolved_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        _save_cache(cache)
+        return driver_path, browser_path, 'resolved'
+
+
+def _template_dir(browser_path, headless):
+    name = ''.join(c if c.isalnum() else '_' for c in (browser_path or 'default'))[-80:]
+    mode = 'headless' if headless else 'headed'
+    return os.path.join(CACHE_DIR, f"profile-v{CACHE_VERSION}", f"{name}-{mode}")
+
+
+def _flag(arg):
+    """'--window-size=1,1' -> '--window-size'"""
+    return arg.split('=', 1)[0]
+
+
+def _build_template(template, driver_path, browser_path, headless):
+    """Run the browser once on a fresh profile, in the mode it will be used in, and keep what it wrote"""
+    os.makedirs(os.path.dirname(template), exist_ok=True)
+    building = tempfile.mkdtemp(prefix='building-', dir=os.path.dirname(template))
+    options = webdriver.ChromeOptions()
+    if browser_path:
+        options.binary_location = browser_path
+    for arg in lean_args(headless) + [f'--user-data-dir={building}']:
+        options.add_argument(arg)
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    try:
+        # One rendered page warms the caches a first navigation fills
+        driver.get('data:text/html,<title>warm</title><p>warm</p>')
+    finally:
+        driver.quit()
+    try:
+        os.rename(building, template)
+    except OSError:
+        # Another worker finished first; its template is as good as ours
+        shutil.rmtree(building, ignore_errors=True)
+
+
+def session_profile(driver_path, browser_path, headless=True):
+    """(fresh copy of the browser's template profile for the mode, 'template'|'built')"""
+    template = _template_dir(browser_path, headless)
+    state = 'template'
+    if not os.path.isdir(template):
+        _build_template(template, driver_path, browser_path, headless)
+        state = 'built'
+    profile = tempfile.mkdtemp(prefix='chrome-profile-')
+    shutil.copytree(template, profile, ignore=_PROFILE_IGNORE, dirs_exist_ok=True)
+    return profile, state
+
+
+def launch(headless=True, binary_location=None, options=None, profile=True):
+    """Start a Chrome-family browser with a cached driver, a warm profile copy and lean arguments"""
+    start = time.perf_counter()
+    options = options or webdriver.ChromeOptions()
+    if binary_location:
+        options.binary_location = binary_location
+    given = {_flag(arg) for arg in options.arguments}
+    for arg in lean_args(headless):
+        if _flag(arg) not in given:
+            options.add_argument(arg)
+
+    driver_path, browser_path, resolution = resolve(options)
+    if browser_path and not options.binary_location:
+        options.binary_location = browser_path
+    profile_dir, profile_state = None, None
+    # A profile the caller chose is used as is
+    if profile and '--user-data-dir' not in given:
+        profile_dir, profile_state = session_profile(driver_path, options.binary_location, headless)
+        options.add_argument(f'--user-data-dir={profile_dir}')
+
+    try:
+        driver = LaunchedChrome(service=Service(driver_path), options=options)
+    except Exception:
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_dir = profile_dir
+    with _lock:
+        _launches.append({'seconds': time.perf_counter() - start, 'resolution': resolution,
+                          'profile': profile_state})
+    return driver
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of samples (q in 0-100), 0.0 without samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(len(ordered), max(1, math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def launch_stats(samples=None):
+    """Launch-time percentiles for samples (seconds), or for this process's launches"""
+    if samples is None:
+        with _lock:
+            samples = [launch['seconds'] for launch in _launches]
+    return {
+        'launches': len(samples),
+        'p50': round(percentile(samples, 50), 3),
+        'p90': round(percentile(samples, 90), 3),
+        'p99': round(percentile(samples, 99), 3),
+        'max': round(max(samples, default=0.0), 3),
+    }
+
+
+def report(samples=None):
+    """One line: launch count and percentiles"""
+    stats = launch_stats(samples)
+    if not stats['launches']:
+        return "No browser launches"
+    with _lock:
+        cached = sum(1 for launch in _launches if launch['resolution'] == 'cached')
+    line = (f"{stats['launches']} browser launch(es): p50 {stats['p50']:.2f}s, p90 {stats['p90']:.2f}s, "
+            f"p99 {stats['p99']:.2f}s, max {stats['max']:.2f}s")
+    if samples is None:
+        line += f" ({cached} with a cached driver)"
+    return line
@@ -0,0 +1,92 @@
+"""
+Static Asset Pipeline - content-hashed, precompressed, cache-forever assets
+At startup every file in static/ is read once, given a content-hashed name
+(app.css -> app.3f2a9c1b7e4d.css) and compressed with gzip (and brotli when
+the brotli package is installed). Templates link through asset_url(), so a
+changed file gets a new URL and browsers can cache the old one immutably
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, abort, request
+
+from middleware import negotiate_encoding
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+URL_PREFIX = '/assets'
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+HASH_LENGTH = 12
+
+
+class Asset:
+    """One built asset and its precompressed variants"""
+
+    def __init__(self, name, data):
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.hashed_name = f"{stem}.{digest}{ext}"
+        self.etag = digest
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.variants = {'identity': data, 'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(data, quality=11)
+
+    def pick(self, accept_encoding):
+        """Smallest variant the client accepts: (encoding, bytes)"""
+        encoding = negotiate_encoding(accept_encoding, [c for c in ('br', 'gzip') if c in self.variants])
+        encoding = encoding or 'identity'
+        return encoding, self.variants[encoding]
+
+
+class AssetPipeline:
+    """Builds static/ at startup and serves it under /assets"""
+
+    def __init__(self, source_dir):
+        self.source_dir = source_dir
+        self.assets = {}
+        self.by_hashed_name = {}
+
+    def build(self):
+        self.assets, self.by_hashed_name = {}, {}
+        for root, _, files in os.walk(self.source_dir):
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.source_dir).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    asset = Asset(name, f.read())
+                self.assets[name] = asset
+                self.by_hashed_name[asset.hashed_name] = asset
+        return self
+
+    def url(self, name):
+        """Public URL of a source asset (used as asset_url() in templates)"""
+        return f"{URL_PREFIX}/{self.assets[name].hashed_name}"
+
+    def serve(self, hashed_name):
+        asset = self.by_hashed_name.get(hashed_name)
+        if asset is None:
+            abort(404)
+
+        headers = {'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding', 'ETag': f'"{asset.etag}"'}
+        if request.if_none_match.contains(asset.etag):
+            return Response(status=304, headers=headers)
+
+        encoding, data = asset.pick(request.headers.get('Accept-Encoding', ''))
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(data, mimetype=asset.mimetype, headers=headers)
+
+    def init_app(self, app):
+        self.build()
+        app.add_url_rule(f"{URL_PREFIX}/<path:hashed_name>", 'asset', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url
+        return self
@@ -0,0 +1,94 @@
+"""
+Batch Submit - many form submissions from one page load in a real browser
+Data-driven browser tests used to navigate, type field by field and click for
+every case: dozens of WebDriver round trips each. submit_batch() loads the
+form once and one execute_async_script call does the rest inside the page:
+- For each payload the form is reset and its fields set, so the browser
+  applies its own value sanitization (type=email trims whitespace)
+- form.checkValidity() decides whether the browser would block the submit;
+  blocked cases report the first invalid field's validationMessage
+- Allowed cases are POSTed with fetch() from the page: same origin, same
+  cookies, redirects followed like a navigation would
+- Every outcome comes back in the one script response: final path and the
+  flash messages of the page the browser would have shown
+"""
+
+from urllib.parse import urlsplit
+
+import profiler
+
+
+# Seconds allowed per payload, on top of a fixed allowance for the whole batch
+SCRIPT_TIMEOUT_PER_CASE = 2
+SCRIPT_TIMEOUT_BASE = 10
+
+_SUBMIT_ALL = """
+const [buttonId, payloads, done] = arguments;
+const button = document.getElementById(buttonId);
+const form = button && button.form;
+if (!form) {
+    done({error: 'No form with button #' + buttonId + ' on ' + location.pathname});
+    return;
+}
+const parser = new DOMParser();
+
+async function submitOne(payload) {
+    form.reset();
+    for (const [id, value] of Object.entries(payload)) {
+        const field = form.elements.namedItem(id) || document.getElementById(id);
+        if (!field) {
+            return {error: 'No field #' + id};
+        }
+        field.value = value;
+    }
+    if (!form.checkValidity()) {
+        const invalid = form.querySelector(':invalid');
+        return {blocked: invalid.validationMessage, field: invalid.id, status: null, path: location.pathname, flashes: []};
+    }
+    const response = await fetch(form.action, {
+        method: form.method.toUpperCase(),
+        body: new URLSearchParams(new FormData(form)),
+        credentials: 'same-origin',
+        redirect: 'follow',
+    });
+    const page = parser.parseFromString(await response.text(), 'text/html');
+    const flashes = Array.from(page.querySelectorAll('.flash'), element => [
+        element.className.replace('flash', '').trim(), element.textContent.trim(),
+    ]);
+    return {blocked: null, field: null, status: response.status, path: new URL(response.url).pathname, flashes};
+}
+
+(async () => {
+    const outcomes = [];
+    try {
+        for (const payload of payloads) {
+            outcomes.push(await submitOne(payload));
+        }
+        form.reset();
+        done(outcomes);
+    } catch (error) {
+        done({error: String(error), completed: outcomes.length});
+    }
+})();
+"""
+
+
+def submit_batch(driver, base_url, path, button_id, payloads):
+    """Open path once and submit every payload ({field id: value}) through the form owning button_id
+
+    Returns one outcome per payload: {'blocked': validation message or None,
+    'field', 'status', 'path', 'flashes': [(category, text), ...]}
+    """
+    payloads = list(payloads)
+    if urlsplit(driver.current_url).path != path or not driver.current_url.startswith(base_url):
+        driver.get(f"{base_url}{path}")
+    driver.set_script_timeout(SCRIPT_TIMEOUT_BASE + SCRIPT_TIMEOUT_PER_CASE * len(payloads))
+    with profiler.span(f"submit batch {path} x{len(payloads)}", 'interaction'):
+        result = driver.execute_async_script(_SUBMIT_ALL, button_id, payloads)
+    if isinstance(result, dict):
+        raise RuntimeError(f"Batch submit on {path} failed: {result['error']}")
+    for outcome in result:
+        if outcome.get('error'):
+            raise LookupError(outcome['error'])
+        outcome['flashes'] = [tuple(flash) for flash in outcome['flashes']]
+    return result
@@ -0,0 +1,87 @@
+"""
+Asset Bytes Report
+Bytes transferred per page view with the stylesheet inlined in every page
+(the old templates) versus linked through the hashed asset pipeline
+- Inline: the templates from before static/app.css existed, read from git
+  history and rendered; estimated as page + stylesheet when git has no history
+- First view: page + stylesheet (best compressed variant)
+- Repeat views: page only, the stylesheet is cached as immutable
+
+Usage:
+    python bench_assets.py
+"""
+
+import os
+import re
+import subprocess
+
+import demo_app
+
+
+PAGES = {'/login': 'login.html', '/signup': 'signup.html', '/dashboard': 'dashboard.html'}
+HERE = os.path.dirname(os.path.abspath(__file__))
+STYLESHEET_RE = re.compile(r'<link rel="stylesheet" href="([^"]+)"')
+
+
+def page_bytes(client, path):
+    """HTML bytes of path and the stylesheet URL it links"""
+    html = client.get(path).get_data()
+    match = STYLESHEET_RE.search(html.decode('utf-8'))
+    return len(html), match.group(1) if match else None
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=HERE, capture_output=True, check=True).stdout.decode()
+
+
+def inline_css_commit():
+    """Last commit whose templates still inlined the CSS, or None without git history"""
+    try:
+        added = _git('log', '--diff-filter=A', '--format=%H', '--', 'static/app.css').split()
+        return _git('rev-parse', '--verify', '--quiet', f"{added[-1]}^").strip() if added else None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def inline_page_bytes(commit, template):
+    """HTML bytes of template as it was at commit, rendered like the app renders it"""
+    source = _git('show', f"{commit}:./templates/{template}")
+    with demo_app.app.test_request_context():
+        html = demo_app.app.jinja_env.from_string(source).render(user=demo_app.users_db.get('test@example.com') or {})
+    return len(html.encode('utf-8'))
+
+
+def main():
+    client = demo_app.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'test@example.com'  # so /dashboard renders instead of redirecting
+
+    print("\n" + "="*70)
+    print("🎨 BYTES PER PAGE VIEW (inline CSS vs hashed asset pipeline)")
+    print("="*70)
+    print(f"{'page':<12} {'inline':>8} {'1st view':>9} {'repeat':>8} {'saved/repeat':>13}")
+
+    commit = inline_css_commit()
+    for path, template in PAGES.items():
+        html_len, css_url = page_bytes(client, path)
+        css = client.get(css_url).get_data()
+        compressed = client.get(css_url, headers={'Accept-Encoding': 'br, gzip'}).get_data()
+
+        # Old templates shipped the stylesheet inside every response
+        inline = inline_page_bytes(commit, template) if commit else html_len + len(css)
+        first_view = html_len + len(compressed)
+        repeat = html_len
+        print(f"{path:<12} {inline:>8} {first_view:>9} {repeat:>8} {inline - repeat:>13}")
+
+    asset = demo_app.assets.assets['app.css']
+    sizes = ', '.join(f"{encoding} {len(data)}B" for encoding, data in asset.variants.items())
+    if commit:
+        print(f"(inline = old templates rendered from {commit[:12]})")
+    else:
+        print("(inline ESTIMATED = page + the full stylesheet: no git history for static/app.css)")
+    print(f"\nstylesheet {asset.hashed_name}: {sizes}")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
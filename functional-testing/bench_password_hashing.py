@@ -0,0 +1,96 @@
+"""
+Password Hashing Benchmark
+Login latency and throughput at each password hash cost, with concurrent
+clients going through the real /login route (Flask test client)
+
+Usage:
+    python bench_password_hashing.py
+    python bench_password_hashing.py --costs test,50000,production --clients 8
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import demo_app
+from passwords import PasswordHasher, resolve_cost
+from user_store import MemoryUserStore
+
+
+DEFAULT_COSTS = 'test,10000,100000,production'
+DEFAULT_CLIENTS = 8
+DEFAULT_REQUESTS = 400
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_client(requests, start_barrier):
+    client = demo_app.app.test_client()
+    latencies = []
+    start_barrier.wait()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.post('/login', data={'email': 'test@example.com', 'password': 'Test123!'})
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 302, response.status_code
+    return latencies
+
+
+def run_cost(cost, clients, total_requests):
+    """Measure logins at one cost with a fresh hasher and store"""
+    previous = demo_app.hasher, demo_app.users_db, demo_app.app.config['LOGIN_THROTTLE']
+    # Every login comes from one client: measure hashing, not the throttle
+    demo_app.app.config['LOGIN_THROTTLE'] = False
+    demo_app.hasher = PasswordHasher(resolve_cost(cost))
+    demo_app.users_db = MemoryUserStore()
+    demo_app.seed_users(demo_app.users_db)
+    barrier = threading.Barrier(clients + 1)
+    per_client = max(1, total_requests // clients)
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [executor.submit(run_client, per_client, barrier) for _ in range(clients)]
+            barrier.wait()
+            start = time.perf_counter()
+            latencies = [latency for future in futures for latency in future.result()]
+            elapsed = time.perf_counter() - start
+    finally:
+        demo_app.hasher.shutdown()
+        demo_app.hasher, demo_app.users_db, demo_app.app.config['LOGIN_THROTTLE'] = previous
+
+    return {
+        'cost': cost,
+        'iterations': resolve_cost(cost),
+        'logins_per_s': len(latencies) / elapsed,
+        'p50_ms': 1000 * percentile(latencies, 50),
+        'p95_ms': 1000 * percentile(latencies, 95),
+        'p99_ms': 1000 * percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--costs', default=DEFAULT_COSTS, help='Presets or iteration counts')
+    parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Logins per cost')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(f"🔐 PASSWORD HASHING BENCHMARK ({args.clients} concurrent clients, /login)")
+    print("="*70)
+    print(f"{'cost':<12} {'iterations':>10} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    for cost in args.costs.split(','):
+        row = run_cost(cost, args.clients, args.requests)
+        print(f"{row['cost']:<12} {row['iterations']:>10} {row['logins_per_s']:>9.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Response Middleware Benchmark
+Bytes and latency for repeated page navigation (login <-> signup, like the
+navigation tests) with the middleware off, compression only, and
+compression plus ETag/304 revalidation
+
+Usage:
+    python bench_responses.py
+    python bench_responses.py --rounds 500
+"""
+
+import argparse
+import time
+
+import demo_app
+
+
+DEFAULT_ROUNDS = 200
+NAVIGATION = ('/login', '/signup', '/')
+MODES = (
+    ('off', False, False),
+    ('compression', True, False),
+    ('compression+etag', True, True),
+)
+
+
+def navigate(rounds, revalidate):
+    """Walk the navigation pages like a browser with a cache would"""
+    client = demo_app.app.test_client()
+    etags = {}
+    total_bytes = 0
+    not_modified = 0
+    latencies = []
+
+    for _ in range(rounds):
+        for path in NAVIGATION:
+            headers = {'Accept-Encoding': 'br, gzip'}
+            if revalidate and path in etags:
+                headers['If-None-Match'] = etags[path]
+
+            start = time.perf_counter()
+            response = client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+
+            total_bytes += len(response.data)
+            not_modified += response.status_code == 304
+            if response.headers.get('ETag'):
+                etags[path] = response.headers['ETag']
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'bytes': total_bytes,
+        'not_modified': not_modified,
+        'mean_ms': 1000 * sum(latencies) / len(latencies),
+        'p95_ms': 1000 * latencies[int(len(latencies) * 0.95)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args()
+    config = demo_app.app.config
+    saved = config['RESPONSE_COMPRESSION'], config['RESPONSE_ETAGS']
+
+    print("\n" + "="*70)
+    print(f"🗜️  RESPONSE MIDDLEWARE BENCHMARK ({args.rounds} navigation rounds)")
+    print("="*70)
+    print(f"{'mode':<18} {'requests':>8} {'bytes':>10} {'bytes/req':>10} {'304s':>6} {'mean ms':>8} {'p95 ms':>7}")
+
+    try:
+        for name, compression, etags in MODES:
+            config['RESPONSE_COMPRESSION'], config['RESPONSE_ETAGS'] = compression, etags
+            row = navigate(args.rounds, revalidate=etags)
+            print(f"{name:<18} {row['requests']:>8} {row['bytes']:>10} {row['bytes'] / row['requests']:>10.0f} "
+                  f"{row['not_modified']:>6} {row['mean_ms']:>8.3f} {row['p95_ms']:>7.3f}")
+    finally:
+        config['RESPONSE_COMPRESSION'], config['RESPONSE_ETAGS'] = saved
+
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Route Benchmarks - per-route timings with stored baselines
+Times each demo_app route handler through the Flask test client and compares
+the run against a baseline saved for this machine
+- Baselines live in <--baseline-dir>/<machine fingerprint>.json, so numbers
+  from different machines are never compared
+- The fingerprint is CPU, OS and Python only (no hostname): fresh CI runners
+  of one image share a baseline. .benchmarks/ (the default) is gitignored, so
+  on CI point --baseline-dir at a cached or committed directory
+- A route regresses when it is slower by more than --threshold (median) AND a
+  one-sided Mann-Whitney U test says the slowdown is significant (--alpha)
+- No baseline yet: the run is saved as the baseline and passes
+
+Usage:
+    python bench_routes.py                 # compare with the baseline (exit 1 on regression)
+    python bench_routes.py --save          # record a new baseline
+    python bench_routes.py --routes login_ok,dashboard --samples 50
+    python bench_routes.py --baseline-dir ci/benchmarks
+"""
+
+import argparse
+import gc
+import hashlib
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import demo_app
+from user_store import MemoryUserStore
+
+
+DEFAULT_BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmarks')
+DEFAULT_SAMPLES = 30
+DEFAULT_BATCH = 20
+DEFAULT_WARMUP = 20
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_ALPHA = 0.01
+
+INVALID_SIGNUPS = (
+    {'first_name': '', 'last_name': 'User', 'email': 'a@example.com', 'password': 'Test123!', 'confirm_password': 'Test123!'},
+    {'first_name': 'Test', 'last_name': 'User', 'email': 'not-an-email', 'password': 'Test123!', 'confirm_password': 'Test123!'},
+    {'first_name': 'Test', 'last_name': 'User', 'email': 'b@example.com', 'password': 'short', 'confirm_password': 'short'},
+    {'first_name': 'Test', 'last_name': 'User', 'email': 'c@example.com', 'password': 'Test123!', 'confirm_password': 'Other123!'},
+    {'first_name': 'Test', 'last_name': 'User', 'email': 'test@example.com', 'password': 'Test123!', 'confirm_password': 'Test123!'},
+)
+
+
+def _expect(response, status):
+    assert response.status_code == status, f"expected {status}, got {response.status_code}"
+
+
+def signup_invalid(client, n):
+    payload = INVALID_SIGNUPS[n % len(INVALID_SIGNUPS)]
+    _expect(client.post('/signup', data=payload), 200)
+
+
+def login_ok(client, n):
+    _expect(client.post('/login', data={'email': 'test@example.com', 'password': 'Test123!'}), 302)
+
+
+def login_bad(client, n):
+    _expect(client.post('/login', data={'email': 'test@example.com', 'password': 'WrongPassword123'}), 200)
+
+
+def dashboard(client, n):
+    with client.session_transaction() as session:
+        session['user'] = 'test@example.com'
+    _expect(client.get('/dashboard'), 200)
+
+
+def logout(client, n):
+    with client.session_transaction() as session:
+        session['user'] = 'test@example.com'
+    _expect(client.get('/logout'), 302)
+
+
+ROUTES = {
+    'signup_invalid': signup_invalid,
+    'login_ok': login_ok,
+    'login_bad': login_bad,
+    'dashboard': dashboard,
+    'logout': logout,
+}
+
+
+def machine_fingerprint():
+    """Short hash of the hardware/interpreter a baseline is valid for"""
+    parts = (platform.system(), platform.machine(), platform.processor(),
+             str(os.cpu_count()), platform.python_implementation(), platform.python_version())
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def baseline_path(baseline_dir):
+    return os.path.join(baseline_dir, f"{machine_fingerprint()}.json")
+
+
+def measure(names, samples, batch, warmup):
+    """samples x per-request seconds per route, each averaged over a batch of requests
+
+    Routes are sampled round-robin so machine-wide drift (CPU frequency, other
+    processes) is spread over every route instead of landing on one
+    """
+    client = demo_app.app.test_client()
+    counter = itertools.count()
+    for name in names:
+        for _ in range(warmup):
+            ROUTES[name](client, next(counter))
+    results = {name: [] for name in names}
+    for _ in range(samples):
+        for name in names:
+            route = ROUTES[name]
+            gc.collect()
+            start = time.perf_counter()
+            for _ in range(batch):
+                route(client, next(counter))
+            results[name].append((time.perf_counter() - start) / batch)
+    return results
+
+
+def mann_whitney_greater(new, old):
+    """One-sided Mann-Whitney U p-value for 'new is slower than old' (normal approximation, tie-corrected)"""
+    combined = sorted([(v, 0) for v in new] + [(v, 1) for v in old])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    n1, n2 = len(new), len(old)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def compare(current, baseline, threshold, alpha):
+    """Per-route verdicts; returns (rows, regressed route names)"""
+    rows = []
+    regressed = []
+    for name, samples in current.items():
+        old = baseline.get(name)
+        if not old:
+            rows.append((name, median(samples), None, None, None, 'new'))
+            continue
+        change = median(samples) / median(old) - 1
+        p = mann_whitney_greater(samples, old)
+        verdict = 'ok'
+        if change > threshold and p < alpha:
+            verdict = 'REGRESSED'
+            regressed.append(name)
+        elif change < -threshold and mann_whitney_greater(old, samples) < alpha:
+            verdict = 'faster'
+        rows.append((name, median(samples), median(old), change, p, verdict))
+    return rows, regressed
+
+
+def run_routes(names, samples, batch, warmup):
+    """Measure routes against a fresh seeded store so runs are comparable"""
+    previous = demo_app.users_db, demo_app.app.config['LOGIN_THROTTLE']
+    # Time the handlers themselves; the throttle would start answering 429
+    demo_app.app.config['LOGIN_THROTTLE'] = False
+    demo_app.users_db = MemoryUserStore()
+    demo_app.seed_users(demo_app.users_db)
+    try:
+        return measure(names, samples, batch, warmup)
+    finally:
+        demo_app.users_db.close()
+        demo_app.users_db, demo_app.app.config['LOGIN_THROTTLE'] = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--routes', default=','.join(ROUTES), help='Comma-separated routes (default: all)')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help='Requests averaged per sample')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed median slowdown (0.20 = 20%%)')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help='Significance level')
+    parser.add_argument('--save', action='store_true', help='Save this run as the baseline')
+    parser.add_argument('--baseline-dir', default=DEFAULT_BASELINE_DIR, help='Where baselines are read and saved')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.routes.split(',')]
+    unknown = [name for name in names if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)} (choose from {', '.join(ROUTES)})")
+
+    current = run_routes(names, args.samples, args.batch, args.warmup)
+    path = baseline_path(args.baseline_dir)
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+
+    print("\n" + "="*70)
+    print(f"⏱️  ROUTE BENCHMARKS (machine {machine_fingerprint()})")
+    print("="*70)
+
+    regressed = []
+    if stored and not args.save:
+        rows, regressed = compare(current, stored['routes'], args.threshold, args.alpha)
+        print(f"{'route':<16} {'median µs':>10} {'baseline':>10} {'change':>8} {'p':>8}  verdict")
+        for name, now, old, change, p, verdict in rows:
+            if old is None:
+                print(f"{name:<16} {now * 1e6:>10.1f} {'-':>10} {'-':>8} {'-':>8}  {verdict}")
+            else:
+                print(f"{name:<16} {now * 1e6:>10.1f} {old * 1e6:>10.1f} {change:>+8.1%} {p:>8.4f}  {verdict}")
+        print(f"(baseline {stored['saved_at']}, threshold {args.threshold:.0%}, alpha {args.alpha})")
+    else:
+        print(f"{'route':<16} {'median µs':>10}")
+        for name, samples in current.items():
+            print(f"{name:<16} {median(samples) * 1e6:>10.1f}")
+        # Keep baselines for routes that were not part of this run
+        routes = dict(stored.get('routes', {}), **current)
+        os.makedirs(args.baseline_dir, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'machine': platform.platform(),
+                       'python': platform.python_version(), 'routes': routes}, f, indent=2)
+        print(f"\n💾 Baseline saved: {os.path.relpath(path)}")
+
+    print("="*70)
+    if regressed:
+        print(f"❌ Slower than baseline: {', '.join(regressed)}")
+        print("   Re-run with --save once the slowdown is intended")
+    print()
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
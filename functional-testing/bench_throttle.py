@@ -0,0 +1,165 @@
+"""
+Login Throttle Load Test
+Legitimate login latency while a credential-stuffing attack runs against
+/login, with the throttle off and on
+- The app runs in its own server process (threaded werkzeug server); client
+  addresses are passed as X-Forwarded-For (DEMO_APP_PROXY_HOPS=1)
+- Attackers: a few addresses cycling through many emails with wrong
+  passwords at a fixed total rate (--attack-rate)
+- Legitimate users: a different address per login, correct password
+With the throttle on, attack requests are answered 429 before any password
+hashing, so the hashing pool stays free for legitimate logins
+
+Usage:
+    python bench_throttle.py
+    python bench_throttle.py --cost 100000 --attack-rate 500 --duration 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import socket
+import time
+from urllib.parse import urlencode
+
+from load_test import HttpConnection, percentile
+from serve import wait_until_ready
+
+
+DEFAULT_COST = '50000'
+DEFAULT_ATTACK_RATE = 300.0
+DEFAULT_LEGIT = 2
+DEFAULT_DURATION = 10.0
+ATTACK_ADDRESSES = ('203.0.113.1', '203.0.113.2', '203.0.113.3', '203.0.113.4')
+FORM = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def serve_app(port, cost, throttle):
+    """Child process: demo_app on a threaded server with the given settings"""
+    os.environ.update({'DEMO_APP_HASH_COST': cost, 'DEMO_APP_THROTTLE': '1' if throttle else '0',
+                       'DEMO_APP_PROXY_HOPS': '1', 'DEMO_APP_STORE': 'memory'})
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import demo_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server('127.0.0.1', port, demo_app.app, threaded=True, request_handler=QuietHandler).serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def login(connection, email, password, address):
+    body = urlencode({'email': email, 'password': password}).encode()
+    status, _, _ = await connection.request('POST', '/login', dict(FORM, **{'X-Forwarded-For': address}), body)
+    return status
+
+
+async def attack(port, rate, deadline, counts):
+    """Open loop: one request every 1/rate seconds, each on its own task"""
+    idle = []
+    tasks = set()
+
+    async def fire(n):
+        connection = idle.pop() if idle else HttpConnection('127.0.0.1', port)
+        try:
+            status = await login(connection, f"victim{n % 500}@example.com", 'hunter2',
+                                 ATTACK_ADDRESSES[n % len(ATTACK_ADDRESSES)])
+        except (ConnectionError, OSError):
+            counts['error'] = counts.get('error', 0) + 1
+            await connection.close()
+            return
+        counts[status] = counts.get(status, 0) + 1
+        idle.append(connection)
+
+    start = time.perf_counter()
+    for n in itertools.count():
+        scheduled = start + n / rate
+        if scheduled >= deadline:
+            break
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        task = asyncio.ensure_future(fire(n))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    for connection in idle:
+        await connection.close()
+
+
+async def legit_user(port, index, deadline, latencies, failures):
+    connection = HttpConnection('127.0.0.1', port)
+    for n in itertools.count():
+        if time.perf_counter() >= deadline:
+            break
+        start = time.perf_counter()
+        status = await login(connection, 'test@example.com', 'Test123!', f"198.51.{index}.{n % 250 + 1}")
+        latencies.append(time.perf_counter() - start)
+        if status != 302:
+            # 503 when the hashing pool is full, 429 if the throttle caught a legit user
+            failures[status] = failures.get(status, 0) + 1
+    await connection.close()
+
+
+async def drive(port, attack_rate, legit, duration):
+    deadline = time.perf_counter() + duration
+    latencies = []
+    failures = {}
+    counts = {}
+    jobs = [legit_user(port, i, deadline, latencies, failures) for i in range(legit)]
+    if attack_rate:
+        jobs.append(attack(port, attack_rate, deadline, counts))
+    await asyncio.gather(*jobs)
+    return latencies, failures, counts
+
+
+def run(cost, throttle, attack_rate, legit, duration):
+    """Legit latencies/failures and attack status counts against a fresh server"""
+    port = free_port()
+    server = multiprocessing.Process(target=serve_app, args=(port, cost, throttle), daemon=True)
+    server.start()
+    try:
+        wait_until_ready(f"http://127.0.0.1:{port}")
+        return asyncio.run(drive(port, attack_rate, legit, duration))
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cost', default=DEFAULT_COST, help='Password hash cost (default: %(default)s)')
+    parser.add_argument('--attack-rate', type=float, default=DEFAULT_ATTACK_RATE, help='Attack requests/s in total')
+    parser.add_argument('--legit', type=int, default=DEFAULT_LEGIT, help='Concurrent legitimate users')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(f"🛡️  LOGIN THROTTLE ({args.attack_rate:.0f} attack req/s, {args.legit} legit users, "
+          f"cost {args.cost}, {args.duration:.0f}s each)")
+    print("="*70)
+    print(f"{'scenario':<22} {'legit':>6} {'failed':>7} {'p50 ms':>8} {'p95 ms':>8} {'attack req':>11} {'429s':>7}")
+
+    scenarios = (
+        ('no attack', True, 0),
+        ('attack, throttle off', False, args.attack_rate),
+        ('attack, throttle on', True, args.attack_rate),
+    )
+    for name, throttle, rate in scenarios:
+        latencies, failures, counts = run(args.cost, throttle, rate, args.legit, args.duration)
+        ordered = sorted(latencies)
+        print(f"{name:<22} {len(ordered):>6} {sum(failures.values()):>7} {1000 * percentile(ordered, 50):>8.1f} "
+              f"{1000 * percentile(ordered, 95):>8.1f} {sum(counts.values()):>11} {counts.get(429, 0):>7}")
+
+    print("(throttle counters are on the app's /healthz under login_throttle)")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+User Store Benchmark
+Signup/login throughput of each user store backend at 1-64 concurrent
+clients, driven through the real demo_app routes with Flask's test client
+
+Usage:
+    python bench_user_store.py
+    python bench_user_store.py --clients 1,8,64 --ops 4000
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import demo_app
+from user_store import MemoryUserStore, SqliteUserStore
+
+
+DEFAULT_CLIENTS = (1, 2, 4, 8, 16, 32, 64)
+DEFAULT_OPS = 2000
+
+
+def make_store(backend, directory):
+    if backend == 'memory':
+        store = MemoryUserStore()
+    else:
+        store = SqliteUserStore(os.path.join(directory, f"bench_{time.time_ns()}.db"))
+    demo_app.seed_users(store)
+    return store
+
+
+def run_client(client_id, ops, start_barrier):
+    """One client: alternate a fresh signup with a login for that user"""
+    client = demo_app.app.test_client()
+    signup_seconds = login_seconds = 0.0
+    errors = 0
+    start_barrier.wait()
+
+    for i in range(ops // 2):
+        email = f"bench.{client_id}.{i}@example.com"
+
+        start = time.perf_counter()
+        response = client.post('/signup', data={
+            'first_name': 'Bench', 'last_name': 'User', 'email': email,
+            'password': 'Bench123!', 'confirm_password': 'Bench123!',
+        })
+        signup_seconds += time.perf_counter() - start
+        errors += response.status_code != 302
+
+        start = time.perf_counter()
+        response = client.post('/login', data={'email': email, 'password': 'Bench123!'})
+        login_seconds += time.perf_counter() - start
+        errors += response.status_code != 302
+
+    return signup_seconds, login_seconds, errors
+
+
+def run_level(backend, clients, total_ops, directory):
+    """Run total_ops requests split over clients threads; returns throughput numbers"""
+    store = make_store(backend, directory)
+    previous, demo_app.users_db = demo_app.users_db, store
+    barrier = threading.Barrier(clients + 1)
+    per_client = max(2, total_ops // clients)
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [executor.submit(run_client, c, per_client, barrier) for c in range(clients)]
+            barrier.wait()
+            start = time.perf_counter()
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+    finally:
+        demo_app.users_db = previous
+        store.close()
+
+    requests_done = clients * (per_client // 2) * 2
+    return {
+        'backend': backend,
+        'clients': clients,
+        'requests': requests_done,
+        'seconds': elapsed,
+        'req_per_s': requests_done / elapsed,
+        'signup_ms': 1000 * sum(r[0] for r in results) / (requests_done / 2),
+        'login_ms': 1000 * sum(r[1] for r in results) / (requests_done / 2),
+        'errors': sum(r[2] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--backends', default='memory,sqlite')
+    parser.add_argument('--clients', default=','.join(map(str, DEFAULT_CLIENTS)))
+    parser.add_argument('--ops', type=int, default=DEFAULT_OPS, help='Requests per concurrency level')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("📦 USER STORE BENCHMARK (signup + login through demo_app routes)")
+    print("="*70)
+    print(f"{'backend':<8} {'clients':>7} {'req/s':>9} {'signup ms':>10} {'login ms':>9} {'errors':>7}")
+
+    # Every login comes from the test client's one address: time the logins, not the throttle's 429s
+    previous_throttle = demo_app.app.config['LOGIN_THROTTLE']
+    demo_app.app.config['LOGIN_THROTTLE'] = False
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for backend in args.backends.split(','):
+                for clients in [int(c) for c in args.clients.split(',')]:
+                    row = run_level(backend, clients, args.ops, directory)
+                    print(f"{row['backend']:<8} {row['clients']:>7} {row['req_per_s']:>9.0f} "
+                          f"{row['signup_ms']:>10.2f} {row['login_ms']:>9.2f} {row['errors']:>7}")
+    finally:
+        demo_app.app.config['LOGIN_THROTTLE'] = previous_throttle
+
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Browser Pool - reusable headless Chrome sessions per xdist worker
+Launching Chrome is the most expensive part of a UI test, so each worker keeps
+a few long-lived sessions and hands them out per test instead
+- Fast state reset between tests (cookies, storage, about:blank)
+- Sessions are recycled after a failure or after max_uses tests
+- Tracks launch/reset timings to report the time saved vs per-test launch
+  and the launch-time percentiles
+- Sessions start through ../browser_launch.py: cached driver resolution, a
+  copied pre-warmed profile and lean headless arguments
+- prewarm() launches sessions in the background before the first test asks
+- acquire(timeout=...) raises PoolExhausted naming the current borrowers
+  instead of waiting forever when every session is checked out
+- Memory: after each reset the RSS of the browser's whole process tree is
+  read (resources.py); a session over max_rss_mb is restarted, which keeps
+  long runs from swapping or being OOM-killed on shared CI nodes
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+
+import browser_launch
+import profiler
+import resources
+
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_USES = 50
+DEFAULT_MAX_RSS_MB = 1024
+# Long enough for a session that is still launching (prewarm or recycle)
+DEFAULT_ACQUIRE_TIMEOUT = 120
+
+
+class PoolExhausted(RuntimeError):
+    """No session came free before acquire()'s timeout"""
+
+
+def launch_chrome():
+    """Start a fresh headless Chrome session"""
+    driver = browser_launch.launch(headless=True)
+    # No implicit wait: it silently stretches every negative lookup, the
+    # suite uses explicit event-driven waits (waits.py) instead
+    driver.implicitly_wait(0)
+    return driver
+
+
+class PooledBrowser:
+    """A pooled WebDriver session plus its bookkeeping"""
+
+    def __init__(self, driver, launch_seconds):
+        self.driver = driver
+        self.launch_seconds = launch_seconds
+        self.uses = 0
+        self.borrower = None
+
+
+class BrowserPool:
+    """Small pool of long-lived browser sessions for one worker process"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES, factory=launch_chrome,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.factory = factory
+        self._idle = deque()
+        self._live = 0
+        self._borrowed = []
+        self._cond = threading.Condition()
+        self._prewarm_thread = None
+
+        # Stats
+        self.launches = 0
+        self.launch_seconds = 0.0
+        self.launch_samples = []
+        self.checkouts = 0
+        self.resets = 0
+        self.reset_seconds = 0.0
+        self.recycled = 0
+        self.prewarmed = 0
+        self.prewarm_error = None
+        self.memory_recycled = 0
+        self.rss_samples = 0
+        self.rss_total_mb = 0.0
+        self.peak_rss_mb = 0.0
+
+    def acquire(self, timeout=None, borrower=None):
+        """Hand out an idle session, launching one if the pool is not full yet
+
+        With a timeout, PoolExhausted is raised when nothing comes free in
+        time; borrower (e.g. a test id) names the holder in that message
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self._live >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    holders = ', '.join(b.borrower or '?' for b in self._borrowed) or 'sessions still launching'
+                    raise PoolExhausted(
+                        f"No browser free after {timeout}s ({self.size} in the pool), held by: {holders}. "
+                        f"Raise --pool-size or give sessions back sooner"
+                    )
+                self._cond.wait(remaining)
+            if self._idle:
+                browser = self._idle.popleft()
+            else:
+                self._live += 1
+                browser = None
+
+        if browser is None:
+            try:
+                browser = self._launch()
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+
+        browser.uses += 1
+        browser.borrower = borrower
+        self.checkouts += 1
+        with self._cond:
+            self._borrowed.append(browser)
+        return browser
+
+    def release(self, browser, failed=False):
+        """Return a session after a test; reset it or recycle it"""
+        with self._cond:
+            if browser in self._borrowed:
+                self._borrowed.remove(browser)
+        browser.borrower = None
+        keep = not failed and (not self.max_uses or browser.uses < self.max_uses)
+        if keep:
+            with profiler.span('browser reset', 'reset'):
+                keep = self._reset(browser)
+        if keep and self._over_memory_limit(browser):
+            self.memory_recycled += 1
+            keep = False
+
+        if not keep:
+            self.recycled += 1
+            self._quit(browser)
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append(browser)
+            self._cond.notify()
+
+    def prewarm(self):
+        """Launch the pool's sessions on a background thread
+
+        acquire() waits for a session that is still launching instead of
+        starting another one. A failed launch is left to the first acquire(),
+        which retries and raises the real error in the test
+        """
+        with self._cond:
+            count = self.size - self._live
+            self._live += count
+
+        def launch_all():
+            for _ in range(count):
+                try:
+                    browser = self._launch()
+                except Exception as e:
+                    self.prewarm_error = repr(e)
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    continue
+                self.prewarmed += 1
+                with self._cond:
+                    self._idle.append(browser)
+                    self._cond.notify()
+
+        if count > 0:
+            self._prewarm_thread = threading.Thread(target=launch_all, name='browser-prewarm', daemon=True)
+            self._prewarm_thread.start()
+
+    def close(self):
+        """Quit every idle session"""
+        if self._prewarm_thread is not None:
+            # A cancelled run must not leave a half-launched browser behind
+            self._prewarm_thread.join()
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._live -= len(idle)
+        for browser in idle:
+            self._quit(browser)
+
+    def _launch(self):
+        start = time.perf_counter()
+        with profiler.span('browser launch', 'launch'):
+            driver = self.factory()
+        elapsed = time.perf_counter() - start
+        self.launches += 1
+        self.launch_seconds += elapsed
+        self.launch_samples.append(round(elapsed, 3))
+        return PooledBrowser(driver, elapsed)
+
+    def _reset(self, browser):
+        """Clear cookies and storage and park the session on about:blank"""
+        driver = browser.driver
+        start = time.perf_counter()
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            try:
+                # Clears cookies for every origin, not just the current page
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+        except WebDriverException:
+            return False
+        finally:
+            self.resets += 1
+            self.reset_seconds += time.perf_counter() - start
+        return True
+
+    def _over_memory_limit(self, browser):
+        """Sample the session's process tree RSS; True when it is over max_rss_mb"""
+        rss = resources.process_tree_rss(resources.driver_pid(browser.driver))
+        if not rss:
+            return False
+        rss_mb = rss / resources.MB
+        self.rss_samples += 1
+        self.rss_total_mb += rss_mb
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        return bool(self.max_rss_mb) and rss_mb > self.max_rss_mb
+
+    @staticmethod
+    def _quit(browser):
+        try:
+            browser.driver.quit()
+        except WebDriverException:
+            pass
+
+    def stats(self):
+        """Timing summary; time_saved compares against one launch per test"""
+        avg_launch = self.launch_seconds / self.launches if self.launches else 0.0
+        per_test_cost = self.checkouts * avg_launch
+        pooled_cost = self.launch_seconds + self.reset_seconds
+        return {
+            'tests': self.checkouts,
+            'launches': self.launches,
+            'recycled': self.recycled,
+            'prewarmed': self.prewarmed,
+            'launch_seconds': round(self.launch_seconds, 3),
+            'reset_seconds': round(self.reset_seconds, 3),
+            'avg_launch_seconds': round(avg_launch, 3),
+            'launch_samples': list(self.launch_samples),
+            'time_saved_seconds': round(per_test_cost - pooled_cost, 3),
+            'memory_recycled': self.memory_recycled,
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'avg_rss_mb': round(self.rss_total_mb / self.rss_samples, 1) if self.rss_samples else 0.0,
+            'worker_rss_mb': round(resources.process_rss(os.getpid()) / resources.MB, 1),
+        }
+
+
+def summarize(stats_list):
+    """Combine stats() dicts from several workers"""
+    total = {'workers': len(stats_list), 'tests': 0, 'launches': 0, 'recycled': 0, 'prewarmed': 0,
+             'launch_seconds': 0.0, 'reset_seconds': 0.0, 'time_saved_seconds': 0.0, 'memory_recycled': 0}
+    for stats in stats_list:
+        for key in total:
+            if key != 'workers':
+                total[key] += stats.get(key, 0)
+    total['peak_rss_mb'] = max((stats.get('peak_rss_mb', 0) for stats in stats_list), default=0)
+    total['launch_percentiles'] = browser_launch.launch_stats(
+        [seconds for stats in stats_list for seconds in stats.get('launch_samples', ())])
+    return total
+
+
+def measured_footprint(stats_list):
+    """{'browser_mb', 'worker_mb'} seen by the pools of one run, or None if nothing was sampled"""
+    peaks = [stats['peak_rss_mb'] for stats in stats_list if stats.get('peak_rss_mb')]
+    workers = [stats['worker_rss_mb'] for stats in stats_list if stats.get('worker_rss_mb')]
+    if not peaks:
+        return None
+    # Size for the peak: a session grows until it is recycled, and the
+    # largest pool in the run is the one that must still fit
+    return {'browser_mb': round(max(peaks), 1),
+            'worker_mb': round(max(workers), 1) if workers else None}
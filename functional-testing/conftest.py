@@ -1,9 +1,63 @@
 """
 Pytest configuration and hooks for enhanced HTML reporting
 """
+import json
+import urllib.error
+import urllib.request
 import pytest
 from datetime import datetime
 
+import browser_pool
+import live_server
+import page_driver
+import profiler
+import resources
+import streaming_report
+import waits
+import worker_stats
+
+# Tests listed in the wait-time summary
+WAIT_REPORT_TOP = 10
+
+# (nodeid, wait seconds, wait count, test duration) per finished test
+_wait_times = []
+
+# --event-log writer (controller / single process only) and the markers it records
+_event_log = None
+_event_markers = ()
+_event_phases = ()
+
+
+def pytest_addoption(parser):
+    """Browser pool options"""
+    group = parser.getgroup('browser-pool', 'Reusable browser sessions')
+    group.addoption('--pool-size', type=int, default=browser_pool.DEFAULT_POOL_SIZE,
+                    help='Browser sessions kept alive per worker (default: %(default)s)')
+    group.addoption('--pool-max-uses', type=int, default=browser_pool.DEFAULT_MAX_USES,
+                    help='Recycle a session after this many tests, 0 = never (default: %(default)s)')
+    group.addoption('--no-browser-pool', action='store_true', default=False,
+                    help='Launch a fresh browser for every test')
+    group.addoption('--prewarm-browsers', action='store_true', default=False,
+                    help='Launch each worker\'s browsers at session start, before the first test needs one')
+    group.addoption('--browser-max-rss', type=int, default=browser_pool.DEFAULT_MAX_RSS_MB, metavar='MB',
+                    help='Restart a browser whose process tree uses more than MB of memory, 0 = never '
+                         '(default: %(default)s)')
+
+    parser.addoption('--profile-trace', metavar='PATH', default=None,
+                     help='Record a Chrome-trace/Perfetto timeline of the run to PATH')
+
+    parser.addoption('--event-log', metavar='PATH', default=None,
+                     help='Append one JSON line per test result to PATH (see streaming_report.py)')
+    parser.addoption('--event-phase', metavar='NAME', default='run',
+                     help='Phase name recorded in the event log (default: %(default)s)')
+
+    parser.addoption('--base-url', metavar='URL', default=None,
+                     help='Test an already running app instead of starting demo_app in every worker')
+
+    parser.addoption('--page-backend', choices=page_driver.BACKENDS, default='selenium',
+                     help='Backend for tests using the page fixture: a real browser '
+                          'or the in-process Flask test client (default: %(default)s)')
+
 
 def pytest_html_report_title(report):
     """Customize report title"""
@@ -19,6 +73,55 @@ def pytest_configure(config):
         config._metadata['Environment'] = 'Local Development'
         config._metadata['Test Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
+    if config.getoption('--profile-trace'):
+        profiler.enable(profiler.worker_pid(worker_stats.worker_id(config)))
+
+    global _event_log, _event_markers, _event_phases
+    path = config.getoption('--event-log')
+    if path and not worker_stats.is_worker(config):
+        # Workers' reports all reach the controller, which is the only writer
+        _event_log = streaming_report.EventLog(path, config.getoption('--event-phase'))
+        _event_log.write('session_start', args=config.invocation_params.args)
+        _event_markers = {line.split(':')[0].split('(')[0].strip() for line in config.getini('markers')}
+        phases = config.getoption('--phases', default=None)
+        _event_phases = [name.strip() for name in phases.split(',')] if phases else []
+
+
+def pytest_unconfigure(config):
+    global _event_log
+    if _event_log is not None:
+        _event_log.close()
+        _event_log = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """Timeline span for fixture setup (browser launch lands here)"""
+    profiler.set_current_test(item.nodeid)
+    with profiler.span('setup', 'test', test=item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Timeline span for the test body"""
+    with profiler.span('call', 'test', test=item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Timeline span for fixture teardown"""
+    with profiler.span('teardown', 'test', test=item.nodeid):
+        yield
+    profiler.set_current_test(None)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_logstart(nodeid, location):
+    """Start a fresh wait tally for every test"""
+    waits.reset_stats()
+
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -26,3 +129,260 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     report.description = str(item.function.__doc__) if item.function.__doc__ else ''
+    # Let fixtures see how each phase went (used to recycle browsers after failures)
+    setattr(item, 'rep_' + report.when, report)
+    if report.when == 'call':
+        # user_properties survive the trip from xdist workers to the controller
+        tally = waits.stats()
+        report.user_properties.append(('wait_seconds', round(tally['seconds'], 3)))
+        report.user_properties.append(('wait_count', tally['count']))
+
+
+def pytest_runtest_logreport(report):
+    """Remember per-test wait time for the summary, stream the result to --event-log"""
+    if _event_log is not None:
+        _log_event(report)
+    if report.when != 'call':
+        return
+    props = dict(report.user_properties)
+    if 'wait_seconds' in props:
+        _wait_times.append((report.nodeid, props['wait_seconds'], props['wait_count'], report.duration))
+
+
+def _log_event(report):
+    # With -p phase_scheduler each result is filed under its own phase
+    phase = next((name for name in _event_phases if name in report.keywords), None)
+    gateway = getattr(getattr(report, 'node', None), 'gateway', None)
+    _event_log.test_report(
+        report,
+        phase=phase,
+        markers=[name for name in _event_markers if name in report.keywords],
+        worker=gateway.id if gateway is not None else None,
+    )
+
+
+def _make_browser_pool(config):
+    pool_size = 0 if config.getoption('--no-browser-pool') else config.getoption('--pool-size')
+    return browser_pool.BrowserPool(
+        size=pool_size or 1,
+        max_uses=1 if pool_size == 0 else config.getoption('--pool-max-uses'),
+        max_rss_mb=config.getoption('--browser-max-rss'),
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """-n auto: as many workers as CPUs and memory allow, using the browser footprint of earlier runs"""
+    browsers = 1 if config.getoption('--no-browser-pool') else config.getoption('--pool-size')
+    workers, reason = resources.auto_workers(resources.load_footprint(), browsers_per_worker=browsers)
+    config._auto_workers = (workers, reason)
+    return workers
+
+
+def pytest_sessionstart(session):
+    """--prewarm-browsers: start launching this worker's browsers while tests are collected and scheduled"""
+    config = session.config
+    config._browser_pool = None
+    # The xdist controller runs no tests, only its workers need browsers
+    if config.getoption('--prewarm-browsers') and not config.pluginmanager.has_plugin('dsession'):
+        config._browser_pool = _make_browser_pool(config)
+        config._browser_pool.prewarm()
+
+
+@pytest.fixture(scope='session')
+def base_url(request):
+    """URL of the app under test: --base-url, or an isolated demo_app on a free port in this worker"""
+    url = request.config.getoption('--base-url')
+    if url:
+        yield url.rstrip('/')
+        return
+    server = live_server.start_demo_app()
+    yield server.url
+    server.stop()
+
+
+def _post_json(url):
+    request = urllib.request.Request(url, data=b'', method='POST')
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+
+@pytest.fixture
+def app_state(request):
+    """Undo the test's changes to demo_app (signups, login throttling) when it ends
+
+    Only what the test itself did is undone, never other tests' users.
+    In-process apps (client backend, per-worker live server) are snapshotted
+    directly; against an app at --base-url (started with DEMO_APP_TEST_API=1)
+    the test's browser names its snapshot in every request
+    """
+    url = request.config.getoption('--base-url')
+    clients = [request.getfixturevalue(name) for name in ('page', 'driver') if name in request.fixturenames]
+    if not url or any(isinstance(client, page_driver.ClientPage) for client in clients):
+        import demo_app
+        snapshot_id = demo_app.snapshot_state()
+        yield
+        demo_app.restore_state(snapshot_id)
+        return
+
+    url = url.rstrip('/')
+    try:
+        snapshot = _post_json(f"{url}/_test/snapshot")
+    except urllib.error.HTTPError:
+        pytest.skip(f"{url} does not expose the test state API (start it with DEMO_APP_TEST_API=1)")
+    for client in clients:
+        page_driver.set_request_header(client, snapshot['header'], str(snapshot['snapshot']))
+    yield
+    for client in clients:
+        page_driver.set_request_header(client, snapshot['header'], None)
+    _post_json(f"{url}/_test/restore/{snapshot['snapshot']}")
+
+
+@pytest.fixture(scope='session')
+def browser_pool_session(request):
+    """One browser pool per worker process"""
+    config = request.config
+    pool = getattr(config, '_browser_pool', None) or _make_browser_pool(config)
+
+    yield pool
+
+    pool.close()
+    worker_stats.publish(config, 'browser_pool', pool.stats())
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """Ship this worker's timeline to the controller, or write the trace"""
+    config = session.config
+    if _event_log is not None:
+        _log_slowest_phases(config)
+        _event_log.write('session_finish', exitstatus=int(session.exitstatus))
+    _save_footprint(config)
+    if getattr(config, '_browser_pool', None) is not None:
+        # Prewarmed but never used (e.g. client-backend tests only)
+        config._browser_pool.close()
+    path = config.getoption('--profile-trace')
+    if not path:
+        return
+    if worker_stats.is_worker(config):
+        worker_stats.publish(config, 'profile', profiler.events())
+    else:
+        profiler.write_trace(path, _profile_event_lists(config))
+
+
+def _log_slowest_phases(config):
+    """Slowest profiled phases for the streaming report"""
+    if not config.getoption('--profile-trace'):
+        return
+    slowest, totals = profiler.slowest_phases(_profile_event_lists(config))
+    if slowest:
+        _event_log.write('slowest_phases', totals=totals, spans=[
+            {'seconds': round(event['dur'] / 1e6, 3), 'cat': event['cat'], 'name': event['name'],
+             'test': event['args'].get('test', '')}
+            for event in slowest
+        ])
+
+
+def _profile_event_lists(config):
+    event_lists = worker_stats.gather(config, 'profile')
+    if profiler.events():
+        event_lists.append(profiler.events())
+    return event_lists
+
+
+def _save_footprint(config):
+    """Remember the measured browser/worker memory for the next -n auto"""
+    if worker_stats.is_worker(config):
+        return
+    footprint = browser_pool.measured_footprint(worker_stats.gather(config, 'browser_pool'))
+    if footprint is not None:
+        resources.save_footprint(footprint)
+
+
+def pytest_testnodedown(node, error):
+    """Collect stats shipped back from xdist workers"""
+    worker_stats.collect(node.config, node)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report pool savings and where tests spent their time waiting"""
+    _report_workers(terminalreporter, config)
+    _report_browser_pool(terminalreporter, config)
+    _report_wait_times(terminalreporter)
+    _report_profile(terminalreporter, config)
+
+
+def _report_profile(terminalreporter, config):
+    path = config.getoption('--profile-trace')
+    if not path or worker_stats.is_worker(config):
+        return
+    event_lists = _profile_event_lists(config)
+    slowest, totals = profiler.slowest_phases(event_lists)
+    if not slowest:
+        return
+
+    terminalreporter.write_sep('=', 'slowest phases')
+    for cat, seconds in totals.items():
+        terminalreporter.write_line(f"{cat:>12}: {seconds:7.2f}s total")
+    for event in slowest:
+        terminalreporter.write_line(
+            f"{event['dur'] / 1e6:7.2f}s  {event['cat']:<11} {event['name']:<40} {event['args'].get('test', '')}"
+        )
+    for row in profiler.worker_utilization(event_lists):
+        terminalreporter.write_line(
+            f"{row['worker']}: busy {row['busy_s']:.1f}s, idle {row['idle_s']:.1f}s"
+        )
+    terminalreporter.write_line(f"timeline written to {path} (open in https://ui.perfetto.dev)")
+
+
+def _report_wait_times(terminalreporter):
+    timed = [entry for entry in _wait_times if entry[2]]
+    if not timed:
+        return
+
+    total_wait = sum(entry[1] for entry in timed)
+    total_run = sum(entry[3] for entry in timed)
+    terminalreporter.write_sep('=', 'wait time')
+    terminalreporter.write_line(
+        f"{total_wait:.1f}s of {total_run:.1f}s test time spent in {sum(e[2] for e in timed)} waits"
+    )
+    for nodeid, wait_seconds, count, duration in sorted(timed, key=lambda e: -e[1])[:WAIT_REPORT_TOP]:
+        terminalreporter.write_line(f"{wait_seconds:7.2f}s  {count:2d} waits  {duration:6.2f}s total  {nodeid}")
+
+
+def _report_workers(terminalreporter, config):
+    auto = getattr(config, '_auto_workers', None)
+    if auto is None:
+        return
+    terminalreporter.write_sep('=', 'workers')
+    terminalreporter.write_line(f"-n auto: {auto[0]} worker(s) - {auto[1]}")
+
+
+def _report_browser_pool(terminalreporter, config):
+    stats = worker_stats.gather(config, 'browser_pool')
+    if not stats:
+        return
+
+    total = browser_pool.summarize(stats)
+    terminalreporter.write_sep('=', 'browser pool')
+    terminalreporter.write_line(
+        f"{total['tests']} tests on {total['launches']} browser launches "
+        f"across {total['workers']} worker(s), {total['recycled']} recycled"
+    )
+    terminalreporter.write_line(
+        f"launch time: {total['launch_seconds']:.1f}s, reset time: {total['reset_seconds']:.1f}s, "
+        f"saved vs per-test launch: {total['time_saved_seconds']:.1f}s"
+    )
+    launches = total['launch_percentiles']
+    if launches['launches']:
+        terminalreporter.write_line(
+            f"launch percentiles: p50 {launches['p50']:.2f}s, p90 {launches['p90']:.2f}s, "
+            f"p99 {launches['p99']:.2f}s, max {launches['max']:.2f}s"
+        )
+    if total['prewarmed']:
+        terminalreporter.write_line(f"{total['prewarmed']} browser(s) launched ahead of time (--prewarm-browsers)")
+    if total['peak_rss_mb']:
+        terminalreporter.write_line(
+            f"browser memory: peak {total['peak_rss_mb']:.0f} MB per session, "
+            f"{total['memory_recycled']} restarted over --browser-max-rss"
+        )
@@ -3,14 +3,40 @@ Demo Web Application - Login & Signup System
 A simple Flask app to practice automation testing properly
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, request, redirect, url_for, session, flash, abort, g
+from werkzeug.middleware.proxy_fix import ProxyFix
+import argparse
+import itertools
 import os
 
-app = Flask(__name__)
-app.secret_key = 'demo_secret_key_for_testing'
+import serve
+from assets import AssetPipeline
+from middleware import ResponseOptimizer
+from render_cache import RenderCache
+from throttle import LoginThrottle
+from passwords import HashingBusy, PasswordHasher, resolve_cost
+from user_store import create_user_store
 
-# In-memory user database (for demo purposes)
-users_db = {
+# static/ is served only through the hashed, precompressed asset pipeline
+app = Flask(__name__, static_folder=None)
+app.secret_key = 'demo_secret_key_for_testing'
+assets = AssetPipeline(os.path.join(app.root_path, 'static')).init_app(app)
+# gzip/brotli + ETag/304 for HTML pages
+ResponseOptimizer(app)
+# Cached static renderings of pages without flash messages or a logged-in user
+pages = RenderCache(app)
+# Per-client/per-email token buckets checked before any credential work
+throttle = LoginThrottle(app)
+# Behind a reverse proxy, DEMO_APP_PROXY_HOPS=1 takes the client address from X-Forwarded-For
+if int(os.environ.get('DEMO_APP_PROXY_HOPS', 0)):
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.environ['DEMO_APP_PROXY_HOPS']))
+# DEMO_APP_IMPACT=1 records per-test coverage for test impact analysis (impact.py, test runs only)
+if os.environ.get('DEMO_APP_IMPACT'):
+    from impact import ImpactRecorder
+    ImpactRecorder(app)
+
+# Users every fresh store starts with
+SEED_USERS = {
     'test@example.com': {
         'password': 'Test123!',
         'first_name': 'Test',
@@ -18,10 +44,106 @@ users_db = {
     }
 }
 
+# Password hashing work factor: DEMO_APP_HASH_COST=test (cheap), production or an iteration count
+hasher = PasswordHasher(resolve_cost(os.environ.get('DEMO_APP_HASH_COST', 'test')))
+
+
+def seed_users(store):
+    """Create the seed users in store, storing only password hashes"""
+    store.seed({
+        email: {
+            'password_hash': hasher.hash(user['password']),
+            'first_name': user['first_name'],
+            'last_name': user['last_name']
+        }
+        for email, user in SEED_USERS.items()
+    })
+
+
+# User database: in-memory by default, DEMO_APP_STORE=sqlite:<path> to persist
+users_db = create_user_store(os.environ.get('DEMO_APP_STORE', 'memory'))
+seed_users(users_db)
+
+# ==================== Test-only state API ====================
+# Sessions are signed cookies, so the server-side state is the user store and
+# the throttle buckets. Every open snapshot has its own journal of the signups
+# and throttle charges made under it, and restoring undoes only those, so tests
+# sharing a server never roll back each other's users. Requests name their
+# snapshot in the X-Test-Snapshot header; requests without it belong to the
+# innermost in-process snapshot. DEMO_APP_TEST_API=1 exposes snapshot/restore
+# over HTTP for test runs against a separately started app (never in production)
+SNAPSHOT_HEADER = 'X-Test-Snapshot'
+app.config.setdefault('TEST_STATE_API', os.environ.get('DEMO_APP_TEST_API') == '1')
+_journals = {}
+_local_snapshots = []
+_snapshot_ids = itertools.count(1)
+
+
+def snapshot_state(local=True):
+    """Open a journal and return its id for restore_state()
+
+    local snapshots also collect requests that carry no X-Test-Snapshot header
+    """
+    snapshot_id = next(_snapshot_ids)
+    _journals[snapshot_id] = {'store': users_db, 'users': [], 'throttle': []}
+    if local:
+        _local_snapshots.append(snapshot_id)
+    return snapshot_id
+
+
+def restore_state(snapshot_id):
+    """Delete the users created under the snapshot and refund its throttle charges"""
+    journal = _journals.pop(snapshot_id)
+    if snapshot_id in _local_snapshots:
+        _local_snapshots.remove(snapshot_id)
+    for email in reversed(journal['users']):
+        journal['store'].delete(email)
+    throttle.refund(journal['throttle'])
+
+
+@app.before_request
+def select_journal():
+    if not _journals:
+        return
+    snapshot_id = request.headers.get(SNAPSHOT_HEADER, type=int)
+    if snapshot_id is None and _local_snapshots:
+        snapshot_id = _local_snapshots[-1]
+    journal = _journals.get(snapshot_id)
+    if journal is not None:
+        g.journal = journal
+        g.throttle_charges = journal['throttle']
+
+
+@app.errorhandler(HashingBusy)
+def hashing_busy(error):
+    return 'Server busy, please try again', 503, {'Retry-After': '1'}
+
+
+@app.route('/healthz')
+def healthz():
+    """Liveness/readiness probe: the app is up and its user store answers"""
+    return {'status': 'ok', 'users': users_db.count(), 'pid': os.getpid(), 'render_cache': pages.stats(),
+            'login_throttle': throttle.stats()}
+
+
+@app.route('/_test/snapshot', methods=['POST'])
+def state_snapshot():
+    if not app.config['TEST_STATE_API']:
+        abort(404)
+    return {'snapshot': snapshot_state(local=False), 'header': SNAPSHOT_HEADER}
+
+
+@app.route('/_test/restore/<int:snapshot_id>', methods=['POST'])
+def state_restore(snapshot_id):
+    if not app.config['TEST_STATE_API'] or snapshot_id not in _journals:
+        abort(404)
+    restore_state(snapshot_id)
+    return {'users': users_db.count()}
+
 
 @app.route('/')
 def home():
-    return render_template('login.html')
+    return pages.render('login.html')
 
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -33,22 +155,31 @@ def login():
         # Validation
         if not email:
             flash('Email is required', 'error')
-            return render_template('login.html')
+            return pages.render('login.html')
 
         if not password:
             flash('Password is required', 'error')
-            return render_template('login.html')
+            return pages.render('login.html')
+
+        # Throttle before touching the user store or the hasher
+        retry_after = throttle.check(email)
+        if retry_after:
+            flash('Too many login attempts, please try again later', 'error')
+            return pages.render('login.html'), 429, {'Retry-After': str(max(1, round(retry_after)))}
 
         # Check credentials
-        if email in users_db and users_db[email]['password'] == password:
+        user = users_db.get(email)
+        password_hash = user.get('password_hash') if user is not None else None
+        if hasher.verify(password, password_hash):
             session['user'] = email
             flash('Login successful!', 'success')
             return redirect(url_for('dashboard'))
         else:
+            throttle.failed(email)
             flash('Invalid email or password', 'error')
-            return render_template('login.html')
+            return pages.render('login.html')
 
-    return render_template('login.html')
+    return pages.render('login.html')
 
 
 @app.route('/signup', methods=['GET', 'POST'])
@@ -85,22 +216,26 @@ def signup():
         if email in users_db:
             errors.append('Email already registered')
 
+        # Create user (atomic, so a parallel signup for the same email loses cleanly)
+        if not errors and not users_db.create(email, {
+            'password_hash': hasher.hash(password),
+            'first_name': first_name,
+            'last_name': last_name
+        }):
+            errors.append('Email already registered')
+
         if errors:
             for error in errors:
                 flash(error, 'error')
-            return render_template('signup.html')
+            return pages.render('signup.html')
 
-        # Create user
-        users_db[email] = {
-            'password': password,
-            'first_name': first_name,
-            'last_name': last_name
-        }
+        if 'journal' in g:
+            g.journal['users'].append(email)
 
         flash('Account created successfully! Please login.', 'success')
         return redirect(url_for('login'))
 
-    return render_template('signup.html')
+    return pages.render('signup.html')
 
 
 @app.route('/dashboard')
@@ -110,9 +245,9 @@ def dashboard():
         return redirect(url_for('login'))
 
     user_email = session['user']
-    user_data = users_db.get(user_email, {})
+    user_data = users_db.get(user_email) or {}
 
-    return render_template('dashboard.html', user=user_data)
+    return pages.render('dashboard.html', user=user_data)
 
 
 @app.route('/logout')
@@ -122,10 +257,28 @@ def logout():
     return redirect(url_for('login'))
 
 
+def parse_args(argv=None):
+    """Serving options; DEMO_APP_MODE=prod selects production mode without flags"""
+    parser = argparse.ArgumentParser(description='Demo login/signup app')
+    parser.add_argument('--mode', choices=['dev', 'prod'], default=os.environ.get('DEMO_APP_MODE', 'dev'),
+                        help='dev: Flask debug server, prod: pre-forking gunicorn server')
+    parser.add_argument('--host', default=os.environ.get('DEMO_APP_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('DEMO_APP_PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('DEMO_APP_WORKERS', serve.DEFAULT_WORKERS)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('DEMO_APP_THREADS', serve.DEFAULT_THREADS)))
+    parser.add_argument('--keepalive', type=int, default=int(os.environ.get('DEMO_APP_KEEPALIVE', serve.DEFAULT_KEEPALIVE)))
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    # Create templates directory
-    os.makedirs('templates', exist_ok=True)
+    args = parse_args()
 
-    print("Demo app running at http://localhost:5000")
+    print(f"Demo app running at http://localhost:{args.port}")
     print("Test credentials: test@example.com / Test123!")
-    app.run(debug=True, port=5000)
+
+    if args.mode == 'prod':
+        serve.run_production(args.host, args.port, args.workers, args.threads, args.keepalive)
+    else:
+        # Create templates directory
+        os.makedirs('templates', exist_ok=True)
+        app.run(debug=True, host=args.host, port=args.port)
@@ -0,0 +1,240 @@
+"""
+Duration Scheduler - longest-processing-time-first distribution for pytest-xdist
+Enabled with -p duration_scheduler --lpt
+- Every run records how long each test took (setup + call + teardown) into
+  the pytest cache, smoothed across runs
+- Tests are handed out longest first, each worker keeping only one test in
+  hand besides the one it runs (LptScheduling.check_schedule tops workers up
+  to exactly two; xdist's own heuristic would queue more once the pending
+  list is long), so the short tests fill the tail of the run instead of one
+  long test starting last
+- New tests are estimated from the average of tests sharing their markers
+- The summary compares the achieved makespan with the ideal one
+  (total work / workers, or the longest test if that is longer)
+Combined with -p phase_scheduler the same order is used inside each phase
+
+Workers tell the controller their estimates through a small JSON file, like
+phase_scheduler.py does for phases
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # durations are still recorded without pytest-xdist
+    LoadScheduling = object
+
+
+CACHE_KEY = 'duration_scheduler/durations'
+# Weight of the newest run in the smoothed duration
+SMOOTHING = 0.5
+DEFAULT_ESTIMATE = 1.0
+# Items a worker holds under --lpt: the running test and the next one
+IN_HAND = 2
+
+# Filled on the controller: nodeid -> seconds of this run, nodeid -> markers,
+# failed nodeids (not recorded), worker -> busy seconds / last finish
+_durations = defaultdict(float)
+_markers = {}
+_failed = set()
+_workers = {}
+_run = {'start': None, 'end': None, 'known_markers': set()}
+
+
+def pytest_addoption(parser):
+    parser.addoption('--lpt', action='store_true', default=False,
+                     help='Distribute tests across xdist workers longest first, using durations of earlier runs')
+
+
+def _is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def _marker_names(config):
+    return {line.split(':')[0].split('(')[0].strip() for line in config.getini('markers')}
+
+
+def estimate_durations(durations, tests):
+    """{nodeid: seconds} for tests given as {nodeid: markers}; unknown tests get their markers' average"""
+    per_marker = defaultdict(list)
+    for entry in durations.values():
+        for marker in entry['markers']:
+            per_marker[marker].append(entry['seconds'])
+    overall = [entry['seconds'] for entry in durations.values()]
+    fallback = sum(overall) / len(overall) if overall else DEFAULT_ESTIMATE
+
+    estimates = {}
+    for nodeid, markers in tests.items():
+        if nodeid in durations:
+            estimates[nodeid] = durations[nodeid]['seconds']
+            continue
+        # The most expensive marker wins: underestimating a long test is what hurts the tail
+        averages = [sum(per_marker[m]) / len(per_marker[m]) for m in markers if per_marker[m]]
+        estimates[nodeid] = max(averages) if averages else fallback
+    return estimates
+
+
+def interleave(ordered, workers):
+    """Longest first, arranged so each worker's first two items are the k-th and (workers+k)-th longest"""
+    first, second = ordered[:workers], ordered[workers:2 * workers]
+    head = []
+    for k in range(workers):
+        head.extend(first[k:k + 1] + second[k:k + 1])
+    return head + ordered[2 * workers:]
+
+
+def lpt_order(scheduler, indices):
+    """Collection indices ordered for dispatch by an xdist scheduler"""
+    if getattr(scheduler, '_estimates', None) is None:
+        scheduler._estimates = read_estimates(scheduler.node2collection)
+    estimates = scheduler._estimates
+    # Stable: equal estimates keep collection order
+    ordered = sorted(indices, key=lambda i: -estimates.get(scheduler.collection[i], DEFAULT_ESTIMATE))
+    return interleave(ordered, len(scheduler.nodes))
+
+
+def read_estimates(nodes):
+    for node in nodes:
+        path = node.workerinput.get('duration_estimates')
+        if path and os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+    return {}
+
+
+def pytest_configure(config):
+    config._duration_dir = None
+    _durations.clear()
+    _markers.clear()
+    _failed.clear()
+    _workers.clear()
+    _run.update(start=None, end=None, known_markers=_marker_names(config))
+    if config.getoption('--lpt') and not _is_worker(config):
+        config._duration_dir = tempfile.mkdtemp(prefix='durations-')
+
+
+def pytest_unconfigure(config):
+    if getattr(config, '_duration_dir', None):
+        shutil.rmtree(config._duration_dir, ignore_errors=True)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    """On workers: write {nodeid: estimated seconds} before the collection is sent to the controller"""
+    path = getattr(session.config, 'workerinput', {}).get('duration_estimates')
+    if path:
+        known = _marker_names(session.config)
+        tests = {item.nodeid: sorted(m.name for m in item.iter_markers() if m.name in known)
+                 for item in session.items}
+        with open(path, 'w') as f:
+            json.dump(estimate_durations(session.config.cache.get(CACHE_KEY, {}), tests), f)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    if node.config._duration_dir:
+        node.workerinput['duration_estimates'] = os.path.join(node.config._duration_dir, f"{node.gateway.id}.json")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    # phase_scheduler builds its own scheduler and asks for lpt_order
+    if config.getoption('--lpt') and not config.getoption('--phases', default=None):
+        return LptScheduling(config, log)
+    return None
+
+
+def pytest_runtest_logstart(nodeid, location):
+    if _run['start'] is None:
+        _run['start'] = time.time()
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] += report.duration
+    if report.failed:
+        _failed.add(report.nodeid)
+    if report.when != 'teardown':
+        return
+    _markers[report.nodeid] = sorted(name for name in _run['known_markers'] if name in report.keywords)
+    now = time.time()
+    _run['end'] = now
+    gateway = getattr(getattr(report, 'node', None), 'gateway', None)
+    worker = _workers.setdefault(gateway.id if gateway is not None else 'main', {'busy': 0.0, 'finish': now})
+    worker['busy'] += _durations[report.nodeid]
+    worker['finish'] = now
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if _is_worker(config) or not _durations:
+        return
+    stored = config.cache.get(CACHE_KEY, {})
+    for nodeid, seconds in _durations.items():
+        if nodeid in _failed or nodeid not in _markers:
+            continue  # a failure or an interrupted test says little about its usual duration
+        previous = stored.get(nodeid)
+        if previous is not None:
+            seconds = SMOOTHING * seconds + (1 - SMOOTHING) * previous['seconds']
+        stored[nodeid] = {'seconds': round(seconds, 4), 'markers': _markers[nodeid]}
+    config.cache.set(CACHE_KEY, stored)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _is_worker(config) or not _workers or _run['start'] is None:
+        return
+    makespan = _run['end'] - _run['start']
+    work = sum(_durations.values())
+    longest = max(_durations.values())
+    ideal = max(work / len(_workers), longest)
+    terminalreporter.write_sep('=', 'makespan')
+    terminalreporter.write_line(
+        f"{makespan:.1f}s achieved vs {ideal:.1f}s ideal ({work:.1f}s of tests on {len(_workers)} worker(s), "
+        f"longest test {longest:.1f}s) - {ideal / max(makespan, 1e-9):.0%} efficient"
+    )
+    for name, worker in sorted(_workers.items()):
+        terminalreporter.write_line(
+            f"{name}: busy {worker['busy']:.1f}s, idle at the end {_run['end'] - worker['finish']:.1f}s"
+        )
+
+
+class LptScheduling(LoadScheduling):
+    """LoadScheduling that dispatches longest-estimate first, one test at a time"""
+
+    def order(self, indices):
+        return lpt_order(self, indices)
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending[:] = self.order(range(len(self.collection)))
+        if not self.collection:
+            return
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration=0):
+        """Top the node up to IN_HAND items; xdist's heuristic would queue more"""
+        if node.shutting_down:
+            return
+        if not self.pending:
+            node.shutdown()
+            return
+        missing = IN_HAND - len(self.node2pending[node])
+        if missing > 0:
+            self._send_tests(node, min(missing, len(self.pending)))
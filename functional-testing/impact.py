@@ -0,0 +1,390 @@
+"""
+Test Impact Analysis - run only the tests a change can affect
+Enabled with -p impact
+- --impact-record: the app traces the lines of its own modules and the
+  templates each request runs, keyed by the X-Test-Id header the browser
+  (CDP Network.setExtraHTTPHeaders) or the test client sends; at the end of
+  the run the traces are merged into a per-test map in the pytest cache
+- --impact=REF: selects the tests whose recorded lines or templates are
+  touched by `git diff REF` (working tree against REF)
+- Tests missing from the map always run; the whole suite runs when the diff
+  touches module-level code or suite files the map cannot see (tests,
+  static/, ...), and when any test was recorded against different file
+  contents than REF (stale): its line numbers no longer mean anything
+
+The recorder is installed on the in-process demo_app (live_server.py and the
+client backend); an app started by hand for --base-url needs DEMO_APP_IMPACT=1
+
+Usage:
+    pytest -p impact --impact-record                   # build or refresh the map
+    pytest -p impact --impact=HEAD                     # tests affected by uncommitted changes
+"""
+
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import defaultdict
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TRACE_DIR = os.path.join(ROOT, '.impact_traces')
+CACHE_KEY = 'impact/map'
+TEST_ID_HEADER = 'X-Test-Id'
+# Changes to these always affect every browser test, but never show up in a trace
+SUITE_FILES = ('pytest.ini', 'static/')
+
+# nodeid -> passed, filled on the controller (or the only process)
+_outcomes = {}
+
+
+def trace_dir(value=None):
+    """DEMO_APP_IMPACT=1 means the default directory, anything else is a path"""
+    value = value if value is not None else os.environ.get('DEMO_APP_IMPACT', '')
+    return DEFAULT_TRACE_DIR if value in ('', '1') else value
+
+
+def _relative(filename):
+    if filename.startswith('<'):
+        return None  # <frozen ...>, <string>
+    path = os.path.abspath(filename)
+    if not path.startswith(ROOT + os.sep) or 'site-packages' in path or path == os.path.abspath(__file__):
+        return None
+    return os.path.relpath(path, ROOT).replace(os.sep, '/')
+
+
+class ImpactRecorder:
+    """Per-request line tracing for one Flask app, written to one JSONL file per process"""
+
+    def __init__(self, app, directory=None):
+        self.directory = directory or trace_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self._files = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # A cached page skips its template, so every render has to run while recording
+        app.config['RENDER_CACHE'] = False
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+        app.extensions['impact_recorder'] = self
+
+    def _start(self):
+        from flask import request
+        test_id = request.headers.get(TEST_ID_HEADER)
+        if not test_id:
+            return
+        self._local.test_id = test_id
+        self._local.lines = defaultdict(set)
+        sys.settrace(self._trace_calls)
+
+    def _trace_calls(self, frame, event, arg):
+        filename = frame.f_code.co_filename
+        rel = self._files.get(filename, '')
+        if rel == '':
+            rel = self._files[filename] = _relative(filename)
+        if rel is None:
+            return None
+        lines = self._local.lines[rel]
+
+        def trace_lines(frame, event, arg):
+            if event == 'line':
+                lines.add(frame.f_lineno)
+            return trace_lines
+        return trace_lines
+
+    def _stop(self, error=None):
+        test_id = getattr(self._local, 'test_id', None)
+        if test_id is None:
+            return
+        sys.settrace(None)
+        self._local.test_id = None
+        line = json.dumps({'test': test_id, 'files': {rel: sorted(lines) for rel, lines in self._local.lines.items()}})
+        with self._lock:
+            with open(os.path.join(self.directory, f"{os.getpid()}.jsonl"), 'a') as f:
+                f.write(line + '\n')
+
+
+def install(app, directory=None):
+    """The app's recorder, created once per process"""
+    return app.extensions.get('impact_recorder') or ImpactRecorder(app, directory)
+
+
+def read_traces(directory):
+    """{test id: {file: set of lines}} from every process's trace file"""
+    coverage = defaultdict(lambda: defaultdict(set))
+    for path in glob.glob(os.path.join(directory, '*.jsonl')):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                for rel, lines in record['files'].items():
+                    coverage[record['test']][rel].update(lines)
+    return coverage
+
+
+def file_hash(data):
+    return hashlib.sha1(data).hexdigest() if data is not None else None
+
+
+def working_tree_hash(rel):
+    try:
+        with open(os.path.join(ROOT, rel), 'rb') as f:
+            return file_hash(f.read())
+    except OSError:
+        return None
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, check=True).stdout
+
+
+def git_show(ref, rel):
+    """File content at ref, or None if it did not exist there"""
+    try:
+        return _git('show', f"{ref}:./{rel}")
+    except subprocess.CalledProcessError:
+        return None
+
+
+def changed_lines(ref):
+    """{file: set of changed line numbers on the REF side} for `git diff REF` below ROOT"""
+    names = _git('diff', '--name-only', '--relative', '--no-renames', ref).decode().splitlines()
+    changes = {name: set() for name in names}
+    diff = _git('diff', '-U0', '--relative', '--no-renames', '--no-color', ref).decode(errors='replace')
+    current = None
+    in_header = False
+    for line in diff.splitlines():
+        if line.startswith('diff --git '):
+            current, in_header = None, True
+        elif in_header and line.startswith('--- a/'):
+            current = line[6:]
+        elif in_header and line.startswith('+++ b/') and current is None:
+            current = line[6:]
+        elif line.startswith('@@') and current is not None:
+            in_header = False
+            start, _, count = line.split()[1][1:].partition(',')
+            start, count = int(start), int(count) if count else 1
+            lines = changes.setdefault(current, set())
+            if count == 0:
+                # Pure insertion after `start`: the lines around it are what changed
+                lines.update((start, start + 1))
+            else:
+                lines.update(range(start, start + count))
+    return changes
+
+
+def suite_modules():
+    """App-root files the test process imports: conftest, the tests and everything they import"""
+    pending = ['conftest.py'] + sorted(os.path.basename(p) for p in glob.glob(os.path.join(ROOT, 'test_*.py')))
+    seen = set()
+    while pending:
+        rel = pending.pop()
+        if rel in seen or not os.path.exists(os.path.join(ROOT, rel)):
+            continue
+        seen.add(rel)
+        with open(os.path.join(ROOT, rel)) as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(f"{alias.name}.py" for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(f"{node.module}.py")
+    return seen
+
+
+def function_body_lines(source):
+    """Line numbers inside function bodies; everything else runs at import time"""
+    lines = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.update(range(node.body[0].lineno, node.end_lineno + 1))
+    return lines
+
+
+def plan_selection(impact_map, ref):
+    """Which tests `git diff ref` can affect: {'full': reason or None, 'affected', 'stale', 'changed'}"""
+    plan = {'full': None, 'affected': set(), 'stale': set(), 'changed': {}}
+    tests = impact_map.get('tests', {})
+    if not tests:
+        plan['full'] = 'no impact map yet (run with --impact-record first)'
+        return plan
+    try:
+        changes = changed_lines(ref)
+    except (OSError, subprocess.CalledProcessError) as error:
+        plan['full'] = f"git diff {ref} failed: {error}"
+        return plan
+    plan['changed'] = changes
+
+    traced = {rel for entry in tests.values() for rel in entry['files']}
+    suite = suite_modules()
+    ref_hashes = {}
+    for rel, lines in changes.items():
+        is_template = rel.startswith('templates/')
+        if rel in traced and rel.endswith('.py'):
+            source = git_show(ref, rel)
+            if source is not None and not lines <= function_body_lines(source):
+                plan['full'] = f"{rel} changed outside a function (import-time code)"
+                return plan
+        elif not is_template and (rel in suite or rel.startswith(SUITE_FILES)):
+            plan['full'] = f"{rel} changed and is used by the suite but not traced"
+            return plan
+
+    for nodeid, entry in tests.items():
+        for rel, recorded in entry['hashes'].items():
+            if rel not in ref_hashes:
+                ref_hashes[rel] = file_hash(git_show(ref, rel))
+            if ref_hashes[rel] != recorded:
+                plan['stale'].add(nodeid)
+                break
+        else:
+            for rel, lines in entry['files'].items():
+                if rel in changes and (rel.startswith('templates/') or changes[rel].intersection(lines)):
+                    plan['affected'].add(nodeid)
+                    break
+    if plan['stale']:
+        plan['full'] = (f"{len(plan['stale'])} test(s) recorded against other file contents "
+                        f"(refresh the map with --impact-record)")
+    return plan
+
+
+# ==================== pytest plugin ====================
+
+def pytest_addoption(parser):
+    group = parser.getgroup('impact', 'Test impact analysis')
+    group.addoption('--impact-record', action='store_true', default=False,
+                    help='Record which app lines and templates each test exercises into the pytest cache')
+    group.addoption('--impact', metavar='REF', default=None,
+                    help='Only run tests affected by `git diff REF` according to the recorded map')
+
+
+def _is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def _plan(config):
+    """The selection for --impact, computed once per process (workers and controller agree)"""
+    if config._impact_plan is None:
+        config._impact_plan = plan_selection(config.cache.get(CACHE_KEY, {}), config.getoption('--impact'))
+    return config._impact_plan
+
+
+def pytest_configure(config):
+    config._impact_plan = None
+    _outcomes.clear()
+    if config.getoption('--impact-record') and not _is_worker(config):
+        # Start from empty trace files; a running server reopens its file on every request
+        os.makedirs(trace_dir(), exist_ok=True)
+        for path in glob.glob(os.path.join(trace_dir(), '*.jsonl')):
+            os.remove(path)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption('--impact'):
+        return
+    plan = _plan(config)
+    if plan['full']:
+        return
+    mapped = config.cache.get(CACHE_KEY, {}).get('tests', {})
+    keep = plan['affected']
+
+    def selected(item):
+        return item.nodeid in keep or item.nodeid not in mapped
+
+    deselected = [item for item in items if not selected(item)]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = [item for item in items if selected(item)]
+
+
+def _tag(value, nodeid):
+    """Send nodeid as X-Test-Id from a driver, page or test client"""
+    import page_driver
+    page_driver.set_request_header(value, TEST_ID_HEADER, nodeid)
+
+
+def pytest_sessionstart(session):
+    """Record the in-process app; Flask only accepts the hooks before its first request"""
+    config = session.config
+    if config.getoption('--impact-record') and not config.pluginmanager.has_plugin('dsession'):
+        import demo_app
+        install(demo_app.app)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    if item.config.getoption('--impact-record'):
+        for value in getattr(item, 'funcargs', {}).values():
+            _tag(value, item.nodeid)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    if item.config.getoption('--impact-record'):
+        # Before the driver goes back to the pool, so resets are not charged to this test
+        for value in getattr(item, 'funcargs', {}).values():
+            _tag(value, None)
+
+
+def pytest_runtest_logreport(report):
+    if report.when == 'call' or report.failed:
+        _outcomes[report.nodeid] = _outcomes.get(report.nodeid, True) and report.passed
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not config.getoption('--impact-record') or _is_worker(config):
+        return
+    coverage = read_traces(trace_dir())
+    impact_map = config.cache.get(CACHE_KEY, {})
+    tests = impact_map.setdefault('tests', {})
+    hashes = {}
+    recorded = 0
+    for nodeid, passed in _outcomes.items():
+        files = coverage.get(nodeid)
+        if not passed or not files:
+            # Failed, or no request reached a recording app: leave it unmapped so it always runs
+            tests.pop(nodeid, None)
+            continue
+        for rel in files:
+            if rel not in hashes:
+                hashes[rel] = working_tree_hash(rel)
+        tests[nodeid] = {
+            'files': {rel: sorted(lines) for rel, lines in files.items()},
+            'hashes': {rel: hashes[rel] for rel in files},
+        }
+        recorded += 1
+    config.cache.set(CACHE_KEY, impact_map)
+    config._impact_recorded = (recorded, len(_outcomes) - recorded)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _is_worker(config):
+        return
+    recorded = getattr(config, '_impact_recorded', None)
+    plan = _plan(config) if config.getoption('--impact') else None
+    if recorded is None and plan is None:
+        return
+    terminalreporter.write_sep('=', 'impact')
+    if recorded is not None:
+        terminalreporter.write_line(f"map updated for {recorded[0]} test(s)")
+        if recorded[1]:
+            terminalreporter.write_line(
+                f"{recorded[1]} test(s) failed or sent no traced requests and stay unmapped "
+                f"(a --base-url app has to be started with DEMO_APP_IMPACT=1)"
+            )
+    if plan is not None:
+        if plan['full']:
+            terminalreporter.write_line(f"running the full suite: {plan['full']}")
+        else:
+            changed = ', '.join(sorted(plan['changed'])) or 'nothing'
+            terminalreporter.write_line(f"changed: {changed}")
+            terminalreporter.write_line(f"{len(plan['affected'])} affected; unmapped tests always run")
@@ -0,0 +1,359 @@
+"""
+Input Generator - combinatorial signup/login validation cases, run in batches
+- Every form field is split into input classes (empty, blank, padded, too
+  short, malformed, already registered, ...) and each class generates values
+- n_wise(): rows that contain every combination of classes of any `strength`
+  fields at least once (greedy covering array; strength 2 = pairwise)
+- random_cases(): seeded property-based cases, a random class per field and a
+  freshly generated value per class, so long runs keep finding new inputs
+- A model of the validation rules in signup()/login() gives every case its
+  expected outcome; run_batches() posts the cases through the Flask test client
+  batch by batch and reports the cases where the app and the model disagree
+- Mismatching random cases are shrunk to the fewest unusual fields
+The run happens between demo_app.snapshot_state()/restore_state() with the
+login throttle off, so it leaves no users behind
+
+Usage:
+    python input_generator.py                          # pairwise signup + login
+    python input_generator.py --random 20000           # property-based cases
+    python input_generator.py --strength 3 --batch-size 500 --form signup
+"""
+
+import argparse
+import html
+import itertools
+import random
+import re
+import string
+import sys
+import time
+
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_STRENGTH = 2
+NAMES = ('John', 'Alice', 'Bob', 'Diana', 'Eve', "O'Brien", 'Mary-Jane')
+UNICODE_NAMES = ('Zoë', 'José', 'Łukasz', 'Søren', '李', 'Ангелина')
+PASSWORD_CHARS = string.ascii_letters + string.digits + '!@#$%^&*'
+FLASH_RE = re.compile(r'<div class="flash (\w+)">(.*?)</div>', re.S)
+
+
+# ==================== Input classes ====================
+# Each class: fn(rng, serial, values) -> value; values holds the fields generated so far
+
+def _name(rng, serial, values):
+    return rng.choice(NAMES)
+
+
+def _password(rng, length):
+    return ''.join(rng.choice(PASSWORD_CHARS) for _ in range(length))
+
+
+def _blank(rng, serial, values):
+    return rng.choice((' ', '  ', '\t', ' \t '))
+
+
+NAME_CLASSES = {
+    'valid': _name,
+    'empty': lambda rng, serial, values: '',
+    'blank': _blank,
+    'padded': lambda rng, serial, values: f"  {_name(rng, serial, values)} ",
+    'unicode': lambda rng, serial, values: rng.choice(UNICODE_NAMES),
+    'long': lambda rng, serial, values: 'x' * rng.randint(100, 300),
+}
+
+SIGNUP_FIELDS = {
+    'first_name': NAME_CLASSES,
+    'last_name': NAME_CLASSES,
+    'email': {
+        # The serial keeps every generated address unique within a run
+        'valid': lambda rng, serial, values: f"user{serial}@example.com",
+        'padded': lambda rng, serial, values: f"  user{serial}@example.com ",
+        'empty': lambda rng, serial, values: '',
+        'blank': _blank,
+        'no_at': lambda rng, serial, values: f"user{serial}.example.com",
+        'no_dot': lambda rng, serial, values: f"user{serial}@example",
+        'bare': lambda rng, serial, values: rng.choice(('@.', '.@', 'a@.')),
+        'registered': lambda rng, serial, values: 'test@example.com',
+    },
+    'password': {
+        'valid': lambda rng, serial, values: _password(rng, rng.randint(7, 24)),
+        'min_length': lambda rng, serial, values: _password(rng, 6),
+        'short': lambda rng, serial, values: _password(rng, rng.randint(1, 5)),
+        'empty': lambda rng, serial, values: '',
+        'blank': lambda rng, serial, values: ' ' * rng.randint(1, 8),
+    },
+    'confirm_password': {
+        'same': lambda rng, serial, values: values['password'],
+        'different': lambda rng, serial, values: values['password'] + rng.choice(PASSWORD_CHARS),
+        'empty': lambda rng, serial, values: '',
+        'case_swapped': lambda rng, serial, values: values['password'].swapcase(),
+    },
+}
+
+LOGIN_FIELDS = {
+    'email': {
+        'registered': lambda rng, serial, values: 'test@example.com',
+        'padded': lambda rng, serial, values: ' test@example.com  ',
+        'upper': lambda rng, serial, values: 'TEST@example.com',
+        'unregistered': lambda rng, serial, values: f"nobody{serial}@example.com",
+        'empty': lambda rng, serial, values: '',
+        'blank': _blank,
+    },
+    'password': {
+        'correct': lambda rng, serial, values: 'Test123!',
+        'wrong': lambda rng, serial, values: _password(rng, rng.randint(6, 16)),
+        'case_swapped': lambda rng, serial, values: 'Test123!'.swapcase(),
+        'padded': lambda rng, serial, values: ' Test123! ',
+        'empty': lambda rng, serial, values: '',
+    },
+}
+
+
+# ==================== Validation model ====================
+# Restates the rules of demo_app's views; a case's outcome is ('redirect', [])
+# or ('error', [flash messages in order]). users maps email -> password and
+# grows as modelled signups succeed
+
+def expected_signup(values, users):
+    first_name = values['first_name'].strip()
+    last_name = values['last_name'].strip()
+    email = values['email'].strip()
+    password = values['password']
+
+    errors = []
+    if not first_name:
+        errors.append('First name is required')
+    if not last_name:
+        errors.append('Last name is required')
+    if not email:
+        errors.append('Email is required')
+    elif '@' not in email or '.' not in email:
+        errors.append('Invalid email format')
+    if not password:
+        errors.append('Password is required')
+    elif len(password) < 6:
+        errors.append('Password must be at least 6 characters')
+    if password != values['confirm_password']:
+        errors.append('Passwords do not match')
+    if email in users:
+        errors.append('Email already registered')
+
+    if errors:
+        return 'error', errors
+    users[email] = password
+    return 'redirect', []
+
+
+def expected_login(values, users):
+    email = values['email'].strip()
+    password = values['password']
+    if not email:
+        return 'error', ['Email is required']
+    if not password:
+        return 'error', ['Password is required']
+    if users.get(email) == password:
+        return 'redirect', []
+    return 'error', ['Invalid email or password']
+
+
+FORMS = {
+    'signup': {'path': '/signup', 'fields': SIGNUP_FIELDS, 'model': expected_signup},
+    'login': {'path': '/login', 'fields': LOGIN_FIELDS, 'model': expected_login},
+}
+
+
+# ==================== Case generation ====================
+
+def n_wise(fields, strength=DEFAULT_STRENGTH):
+    """Rows ({field: class}) covering every class combination of any `strength` fields"""
+    names = list(fields)
+    domains = [list(fields[name]) for name in names]
+    strength = min(strength, len(names))
+    combos = list(itertools.combinations(range(len(names)), strength))
+    uncovered = {(combo, values) for combo in combos
+                 for values in itertools.product(*(domains[i] for i in combo))}
+
+    rows = []
+    while uncovered:
+        # Start from the first uncovered combination, then fill the other
+        # fields with the class completing the most uncovered combinations
+        combo, values = min(uncovered)
+        row = dict(zip(combo, values))
+        for i in range(len(names)):
+            if i not in row:
+                row[i] = max(domains[i], key=lambda value: _gain(row, i, value, combos, uncovered))
+        uncovered -= {(combo, tuple(row[i] for i in combo)) for combo in combos}
+        rows.append({names[i]: row[i] for i in range(len(names))})
+    return rows
+
+
+def _gain(row, field, value, combos, uncovered):
+    gain = 0
+    for combo in combos:
+        if field in combo and all(i in row or i == field for i in combo):
+            if (combo, tuple(value if i == field else row[i] for i in combo)) in uncovered:
+                gain += 1
+    return gain
+
+
+def build_case(form, classes, rng, serial):
+    values = {}
+    for field, generators in FORMS[form]['fields'].items():
+        values[field] = generators[classes[field]](rng, serial, values)
+    return {'classes': classes, 'values': values}
+
+
+def n_wise_cases(form, strength=DEFAULT_STRENGTH, seed=0):
+    """Concrete cases for the covering array of form's input classes"""
+    rng = random.Random(seed)
+    return [build_case(form, classes, rng, serial)
+            for serial, classes in enumerate(n_wise(FORMS[form]['fields'], strength))]
+
+
+def random_cases(form, count, seed=0):
+    """count property-based cases: a random class per field, fresh values every time"""
+    rng = random.Random(seed)
+    fields = FORMS[form]['fields']
+    # Serials continue past the n-wise ones so generated emails never repeat across sets
+    offset = 1_000_000 * (seed + 1)
+    return [build_case(form, {field: rng.choice(list(classes)) for field, classes in fields.items()}, rng, offset + serial)
+            for serial in range(count)]
+
+
+# ==================== Batched execution ====================
+
+def _outcome(response):
+    if response.status_code in (301, 302, 303):
+        return 'redirect', []
+    body = response.get_data(as_text=True)
+    return 'error', [html.unescape(message) for category, message in FLASH_RE.findall(body)]
+
+
+def _check(client, form, case, users):
+    spec = FORMS[form]
+    expected = spec['model'](case['values'], users)
+    actual = _outcome(client.post(spec['path'], data=case['values']))
+    if actual[0] == 'redirect':
+        # Drop the session so its success flash does not show up in the next case's page
+        client.delete_cookie('session')
+    if actual != expected:
+        return {'form': form, 'classes': case['classes'], 'values': case['values'],
+                'expected': expected, 'actual': actual}
+    return None
+
+
+def _initial_users(demo_app):
+    return {email: user['password'] for email, user in demo_app.SEED_USERS.items()}
+
+
+def shrink(form, mismatch, client, users, rng):
+    """Swap unusual classes back to the first class while the case still mismatches"""
+    fields = FORMS[form]['fields']
+    classes = dict(mismatch['classes'])
+    for field, generators in fields.items():
+        plain = next(iter(generators))
+        if classes[field] == plain:
+            continue
+        attempt = dict(classes, **{field: plain})
+        result = _check(client, form, build_case(form, attempt, rng, rng.randrange(10**9)), dict(users))
+        if result is not None:
+            classes, mismatch = attempt, result
+    return mismatch
+
+
+def run_batches(form, cases, batch_size=DEFAULT_BATCH_SIZE, report=None, shrink_failures=False):
+    """Post cases to demo_app in batches; report(summary) is called after every batch
+
+    Returns {'cases', 'seconds', 'batches': [summary, ...], 'mismatches': [...]}
+    """
+    import demo_app
+
+    app = demo_app.app
+    previous_throttle = app.config['LOGIN_THROTTLE']
+    app.config['LOGIN_THROTTLE'] = False
+    token = demo_app.snapshot_state()
+    client = app.test_client()
+    users = _initial_users(demo_app)
+    rng = random.Random(0)
+    result = {'cases': 0, 'seconds': 0.0, 'batches': [], 'mismatches': []}
+    try:
+        for number, start in enumerate(range(0, len(cases), batch_size), 1):
+            batch = cases[start:start + batch_size]
+            began = time.perf_counter()
+            mismatches = [m for m in (_check(client, form, case, users) for case in batch) if m is not None]
+            seconds = time.perf_counter() - began
+            if shrink_failures:
+                mismatches = [shrink(form, m, client, users, rng) for m in mismatches]
+
+            summary = {'form': form, 'batch': number, 'cases': len(batch), 'mismatches': len(mismatches),
+                       'seconds': seconds, 'cases_per_second': len(batch) / max(seconds, 1e-9)}
+            result['batches'].append(summary)
+            result['mismatches'].extend(mismatches)
+            result['cases'] += len(batch)
+            result['seconds'] += seconds
+            if report is not None:
+                report(summary)
+    finally:
+        demo_app.restore_state(token)
+        app.config['LOGIN_THROTTLE'] = previous_throttle
+    return result
+
+
+def describe(mismatches, limit=5):
+    """Readable lines for the first mismatches"""
+    lines = []
+    for m in mismatches[:limit]:
+        classes = ', '.join(f"{field}={name}" for field, name in m['classes'].items())
+        lines.append(f"{m['form']} [{classes}] values={m['values']!r}\n"
+                     f"    expected {m['expected']}, got {m['actual']}")
+    if len(mismatches) > limit:
+        lines.append(f"... and {len(mismatches) - limit} more")
+    return '\n'.join(lines)
+
+
+def print_batch(summary):
+    status = '✅' if not summary['mismatches'] else '❌'
+    print(f"{status} {summary['form']:<7} batch {summary['batch']:>3}: {summary['cases']:>6} cases, "
+          f"{summary['mismatches']} mismatch(es), {summary['cases_per_second']:,.0f} cases/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--form', choices=['signup', 'login', 'both'], default='both')
+    parser.add_argument('--strength', type=int, default=DEFAULT_STRENGTH,
+                        help='Fields whose class combinations are all covered (default: %(default)s = pairwise)')
+    parser.add_argument('--random', type=int, default=0, metavar='N',
+                        help='Also run N property-based cases per form')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    forms = ['signup', 'login'] if args.form == 'both' else [args.form]
+    print("\n" + "="*70)
+    print(f"🧪 GENERATED VALIDATION CASES ({args.strength}-wise"
+          f"{f' + {args.random} random' if args.random else ''} per form)")
+    print("="*70)
+
+    total = {'cases': 0, 'seconds': 0.0, 'mismatches': []}
+    for form in forms:
+        for cases, shrink_failures in ((n_wise_cases(form, args.strength, args.seed), False),
+                                       (random_cases(form, args.random, args.seed), True)):
+            if not cases:
+                continue
+            result = run_batches(form, cases, args.batch_size, print_batch, shrink_failures)
+            total['cases'] += result['cases']
+            total['seconds'] += result['seconds']
+            total['mismatches'].extend(result['mismatches'])
+
+    rate = total['cases'] / max(total['seconds'], 1e-9)
+    print("="*70)
+    print(f"{total['cases']:,} cases in {total['seconds']:.1f}s - {rate * 60:,.0f} cases/minute")
+    if total['mismatches']:
+        print(f"❌ {len(total['mismatches'])} case(s) disagree with the validation model:")
+        print(describe(total['mismatches'], limit=10))
+    print()
+    return 1 if total['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Live Server - demo_app served in-process on an ephemeral port
+Each pytest(-xdist) worker starts its own server, so workers never queue
+behind one shared dev server or share its users
+- Threaded werkzeug server on 127.0.0.1:0 (the OS picks a free port)
+- A fresh, seeded in-memory user store per server
+- The login throttle is off: every request comes from 127.0.0.1
+
+Usage:
+    server = live_server.start_demo_app()
+    ...  # drive server.url
+    server.stop()
+"""
+
+import threading
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from serve import wait_until_ready
+
+
+class QuietHandler(WSGIRequestHandler):
+    """No per-request access log lines in the test output"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LiveServer:
+    """A WSGI app on a background thread; url is known once start() returns"""
+
+    def __init__(self, app, host='127.0.0.1', port=0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.url = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        self._server = make_server(self.host, self.port, self.app, threaded=True, request_handler=QuietHandler)
+        self.port = self._server.server_port
+        self.url = f"http://{self.host}:{self.port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name='live-server', daemon=True)
+        self._thread.start()
+        wait_until_ready(self.url)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+def isolate_demo_app(throttle=False):
+    """Give demo_app a fresh seeded in-memory store; returns the module"""
+    import demo_app
+    from user_store import MemoryUserStore
+
+    demo_app.app.config['LOGIN_THROTTLE'] = throttle
+    demo_app.users_db = MemoryUserStore()
+    demo_app.seed_users(demo_app.users_db)
+    return demo_app
+
+
+def start_demo_app(throttle=False):
+    """Serve an isolated demo_app on a free port"""
+    return LiveServer(isolate_demo_app(throttle).app).start()
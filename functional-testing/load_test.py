@@ -0,0 +1,445 @@
+"""
+Load Generator - asyncio load test for the demo app
+Runs weighted scenarios against a running demo app (or one it starts
+itself) and reports p50/p95/p99 latency, throughput and error rate per
+scenario as JSON and HTML. Standard library only: a small keep-alive
+HTTP/1.1 client on asyncio streams, one cookie jar per virtual user
+
+Scenarios (weights are configurable):
+    login_ok    POST /login with valid credentials   -> 302 to /dashboard
+    login_bad   POST /login with a wrong password    -> 200 "Invalid email or password"
+    signup      POST /signup with a fresh email      -> 302 to /login
+    dashboard   GET /dashboard with a logged-in session -> 200
+    logout      GET /logout                          -> 302 to /login
+
+Logins answered 429 by the login throttle are counted as "throttled", not as
+errors. Every virtual user shares this machine's address, so against an app
+started by hand (--url) only the first logins get through unless it was
+started with DEMO_APP_THROTTLE=0; --start-app turns the throttle off itself
+
+Usage:
+    python load_test.py --start-app --concurrency 32 --duration 20
+    DEMO_APP_THROTTLE=0 python demo_app.py   # then, in another terminal:
+    python load_test.py --url http://localhost:5000 --rate 200 --duration 30
+    python load_test.py --start-app --json load.json --html load.html
+"""
+
+import argparse
+import asyncio
+import html
+import itertools
+import json
+import random
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+DEFAULT_URL = 'http://localhost:5000'
+DEFAULT_WEIGHTS = 'login_ok=3,login_bad=2,signup=1,dashboard=4,logout=1'
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DURATION = 10.0
+REQUEST_TIMEOUT = 10.0
+
+CREDENTIALS = ('test@example.com', 'Test123!')
+
+
+class HttpError(Exception):
+    pass
+
+
+class Throttled(Exception):
+    """The login throttle answered 429"""
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=b''):
+        """Send one request; returns (status, headers, body)"""
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._open()
+            try:
+                return await self._exchange(method, path, headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Stale keep-alive connection: retry once on a fresh one
+                await self.close()
+                if attempt == 2:
+                    raise
+
+    async def _exchange(self, method, path, headers, body):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by server')
+        status = int(status_line.split()[1])
+        response_headers = []
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers.append((name.strip().lower(), value.strip()))
+        header_map = dict(response_headers)
+
+        if 'content-length' in header_map:
+            data = await self.reader.readexactly(int(header_map['content-length']))
+        elif header_map.get('transfer-encoding', '').lower() == 'chunked':
+            data = await self._read_chunked()
+        else:
+            data = await self.reader.read()
+            await self.close()
+
+        if header_map.get('connection', '').lower() == 'close' or status_line.startswith(b'HTTP/1.0'):
+            await self.close()
+        return status, response_headers, data
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await self.reader.readline()
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+
+class VirtualUser:
+    """A client with its own connection and cookie jar"""
+
+    _ids = itertools.count()
+
+    def __init__(self, host, port):
+        self.id = next(self._ids)
+        self.connection = HttpConnection(host, port)
+        self.cookies = {}
+        self.logged_in = False
+        self._signups = itertools.count()
+
+    async def call(self, method, path, form=None):
+        headers = {}
+        body = b''
+        if form is not None:
+            body = urlencode(form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+
+        status, response_headers, data = await asyncio.wait_for(
+            self.connection.request(method, path, headers, body), REQUEST_TIMEOUT)
+        for name, value in response_headers:
+            if name == 'set-cookie':
+                cookie, _, attributes = value.partition(';')
+                key, _, val = cookie.partition('=')
+                if 'max-age=0' in attributes.lower().replace(' ', '') or not val:
+                    self.cookies.pop(key.strip(), None)
+                else:
+                    self.cookies[key.strip()] = val.strip()
+        location = dict(response_headers).get('location', '')
+        return status, location, data
+
+    async def login_ok(self):
+        status, location, _ = await self.call('POST', '/login', {
+            'email': CREDENTIALS[0], 'password': CREDENTIALS[1]})
+        if status == 429:
+            raise Throttled()
+        if status != 302 or 'dashboard' not in location:
+            raise HttpError(f"login_ok: {status} -> {location}")
+        self.logged_in = True
+
+    async def login_bad(self):
+        status, _, data = await self.call('POST', '/login', {
+            'email': CREDENTIALS[0], 'password': 'WrongPassword123'})
+        if status == 429:
+            raise Throttled()
+        if status != 200 or b'Invalid email or password' not in data:
+            raise HttpError(f"login_bad: {status}")
+
+    async def signup(self):
+        email = f"load.{self.id}.{next(self._signups)}.{time.time_ns()}@example.com"
+        status, location, _ = await self.call('POST', '/signup', {
+            'first_name': 'Load', 'last_name': 'Test', 'email': email,
+            'password': 'Load123!', 'confirm_password': 'Load123!'})
+        if status != 302 or 'login' not in location:
+            raise HttpError(f"signup: {status} -> {location}")
+
+    async def dashboard(self):
+        if not self.logged_in:
+            await self.login_ok()
+        status, _, _ = await self.call('GET', '/dashboard')
+        if status != 200:
+            raise HttpError(f"dashboard: {status}")
+
+    async def logout(self):
+        status, _, _ = await self.call('GET', '/logout')
+        self.logged_in = False
+        if status != 302:
+            raise HttpError(f"logout: {status}")
+
+
+class Recorder:
+    """Latencies and errors per scenario"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.error_samples = {}
+        self.throttled = {}
+
+    def add(self, scenario, seconds, error=None):
+        self.latencies.setdefault(scenario, []).append(seconds)
+        if isinstance(error, Throttled):
+            self.throttled[scenario] = self.throttled.get(scenario, 0) + 1
+        elif error is not None:
+            self.errors[scenario] = self.errors.get(scenario, 0) + 1
+            self.error_samples.setdefault(scenario, str(error))
+
+    def summary(self, elapsed):
+        scenarios = {}
+        for scenario, values in sorted(self.latencies.items()):
+            scenarios[scenario] = _stats(values, self.errors.get(scenario, 0), elapsed,
+                                         self.throttled.get(scenario, 0))
+            if scenario in self.error_samples:
+                scenarios[scenario]['error_sample'] = self.error_samples[scenario]
+        everything = [v for values in self.latencies.values() for v in values]
+        total = (_stats(everything, sum(self.errors.values()), elapsed, sum(self.throttled.values()))
+                 if everything else {})
+        return {'elapsed_s': round(elapsed, 3), 'total': total, 'scenarios': scenarios}
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _stats(values, errors, elapsed, throttled=0):
+    ordered = sorted(values)
+    return {
+        'requests': len(ordered),
+        'throughput_rps': round(len(ordered) / elapsed, 1),
+        'error_rate': round(errors / len(ordered), 4),
+        'throttled': throttled,
+        'p50_ms': round(1000 * percentile(ordered, 50), 2),
+        'p95_ms': round(1000 * percentile(ordered, 95), 2),
+        'p99_ms': round(1000 * percentile(ordered, 99), 2),
+        'max_ms': round(1000 * ordered[-1], 2),
+    }
+
+
+def parse_weights(spec):
+    weights = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if not hasattr(VirtualUser, name.strip()):
+            raise SystemExit(f"Unknown scenario {name!r}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+async def run_scenario(user, scenario, recorder):
+    start = time.perf_counter()
+    try:
+        await getattr(user, scenario)()
+    except Throttled as e:
+        recorder.add(scenario, time.perf_counter() - start, e)
+    except (HttpError, ConnectionError, OSError, asyncio.TimeoutError, ValueError) as e:
+        recorder.add(scenario, time.perf_counter() - start, e)
+        await user.connection.close()
+    else:
+        recorder.add(scenario, time.perf_counter() - start)
+
+
+async def closed_loop(host, port, weights, concurrency, duration, recorder, seed):
+    """concurrency virtual users, each firing its next scenario as soon as the last finishes"""
+    deadline = time.perf_counter() + duration
+    names, values = list(weights), list(weights.values())
+
+    async def worker(index):
+        rng = random.Random(seed + index)
+        user = VirtualUser(host, port)
+        while time.perf_counter() < deadline:
+            await run_scenario(user, rng.choices(names, values)[0], recorder)
+        await user.connection.close()
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+async def open_loop(host, port, weights, rate, concurrency, duration, recorder, seed):
+    """Start scenarios at a fixed arrival rate, using up to concurrency idle users"""
+    rng = random.Random(seed)
+    names, values = list(weights), list(weights.values())
+    idle = asyncio.Queue()
+    for _ in range(concurrency):
+        idle.put_nowait(VirtualUser(host, port))
+    tasks = set()
+    start = time.perf_counter()
+    dropped = 0
+
+    async def fire(user, scenario):
+        try:
+            await run_scenario(user, scenario, recorder)
+        finally:
+            idle.put_nowait(user)
+
+    for n in itertools.count():
+        scheduled = start + n / rate
+        if scheduled - start >= duration:
+            break
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        if idle.empty():
+            # Every user is busy: the app is not keeping up with the target rate
+            dropped += 1
+            continue
+        task = asyncio.ensure_future(fire(idle.get_nowait(), rng.choices(names, values)[0]))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    while not idle.empty():
+        await idle.get_nowait().connection.close()
+    return dropped
+
+
+def start_local_app(throttle=False):
+    """Serve demo_app in a background thread on a free port; returns (base_url, server)
+
+    All virtual users share one address, so the login throttle is off unless asked for
+    """
+    from live_server import LiveServer
+    import demo_app
+
+    demo_app.app.config['LOGIN_THROTTLE'] = throttle
+    server = LiveServer(demo_app.app).start()
+    return server.url, server
+
+
+def render_html(result):
+    """Standalone HTML report"""
+    rows = []
+    for name, stats in [('TOTAL', result['total'])] + list(result['scenarios'].items()):
+        rows.append(
+            f"<tr><td>{html.escape(name)}</td><td>{stats['requests']}</td><td>{stats['throughput_rps']}</td>"
+            f"<td>{stats['error_rate'] * 100:.2f}%</td><td>{stats['throttled']}</td><td>{stats['p50_ms']}</td><td>{stats['p95_ms']}</td>"
+            f"<td>{stats['p99_ms']}</td><td>{stats['max_ms']}</td></tr>"
+        )
+    settings = html.escape(json.dumps(result['settings']))
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Demo App - Load Test Report</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; padding: 20px; color: #333; }}
+        h1 {{ color: #667eea; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ border: 1px solid #e0e0e0; padding: 8px 12px; text-align: right; }}
+        th {{ background: #667eea; color: white; }}
+        td:first-child {{ text-align: left; font-weight: 600; }}
+    </style>
+</head>
+<body>
+    <h1>Load Test Report</h1>
+    <p>{result['target']} - {result['elapsed_s']}s - dropped arrivals: {result['dropped']}</p>
+    <p><code>{settings}</code></p>
+    <table>
+        <tr><th>Scenario</th><th>Requests</th><th>Req/s</th><th>Errors</th><th>429s</th>
+            <th>p50 ms</th><th>p95 ms</th><th>p99 ms</th><th>max ms</th></tr>
+        {''.join(rows)}
+    </table>
+</body>
+</html>
+"""
+
+
+def run(url, weights, concurrency, duration, rate=None, seed=0):
+    """Run one load test and return the summary dict"""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    recorder = Recorder()
+    start = time.perf_counter()
+    if rate:
+        dropped = asyncio.run(open_loop(host, port, weights, rate, concurrency, duration, recorder, seed))
+    else:
+        asyncio.run(closed_loop(host, port, weights, concurrency, duration, recorder, seed))
+        dropped = 0
+    result = recorder.summary(time.perf_counter() - start)
+    result.update({
+        'target': url,
+        'dropped': dropped,
+        'settings': {'weights': weights, 'concurrency': concurrency, 'duration': duration, 'rate': rate},
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Async load generator for the demo app')
+    parser.add_argument('--url', default=DEFAULT_URL, help='Base URL of a running app (default: %(default)s)')
+    parser.add_argument('--start-app', action='store_true', help='Start demo_app in-process on a free port')
+    parser.add_argument('--throttle', action='store_true', help='Keep the login throttle on with --start-app')
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS, help='scenario=weight,... (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Virtual users')
+    parser.add_argument('--rate', type=float, default=None, help='Target requests/s (open loop); default closed loop')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help='Seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help='Write the JSON summary here')
+    parser.add_argument('--html', metavar='PATH', help='Write an HTML report here')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.start_app:
+        url, server = start_local_app(args.throttle)
+
+    try:
+        result = run(url, parse_weights(args.weights), args.concurrency, args.duration, args.rate, args.seed)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print("\n" + "="*70)
+    print(f"📈 LOAD TEST: {url} ({result['elapsed_s']}s)")
+    print("="*70)
+    print(f"{'scenario':<10} {'reqs':>7} {'req/s':>8} {'errors':>7} {'429s':>6} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in [('TOTAL', result['total'])] + list(result['scenarios'].items()):
+        print(f"{name:<10} {stats['requests']:>7} {stats['throughput_rps']:>8} {stats['error_rate']:>7.2%} "
+              f"{stats['throttled']:>6} {stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}")
+    if result['total'].get('throttled'):
+        print(f"⚠️  {result['total']['throttled']} login(s) throttled (429): these latencies time the throttle, "
+              f"start the app with DEMO_APP_THROTTLE=0")
+    if result['dropped']:
+        print(f"⚠️  {result['dropped']} arrivals dropped: all {args.concurrency} users were busy")
+    print("="*70 + "\n")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.html:
+        with open(args.html, 'w') as f:
+            f.write(render_html(result))
+
+
+if __name__ == '__main__':
+    main()
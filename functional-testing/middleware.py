@@ -0,0 +1,104 @@
+"""
+Response Middleware - compression and conditional GET for HTML pages
+- Negotiates brotli/gzip from Accept-Encoding for pages above a minimum size
+- Adds a strong ETag to pages rendered without flash messages and answers a
+  matching If-None-Match with 304 Not Modified
+Pages showing flash messages are one-off renders, so they are never tagged
+
+Config switches: RESPONSE_COMPRESSION, RESPONSE_ETAGS, COMPRESSION_MIN_SIZE
+"""
+
+import gzip
+import hashlib
+
+from flask import current_app, g, message_flashed, request, session
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+DEFAULT_MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def negotiate_encoding(accept_encoding, codings=None):
+    """Best of codings (default: every supported one) the client accepts, or None"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    if codings is None:
+        codings = ('br', 'gzip') if brotli is not None else ('gzip',)
+    for coding in codings:
+        if accepted.get(coding, 0) > 0:
+            return coding
+    return None
+
+
+def compress(data, coding):
+    if coding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class ResponseOptimizer:
+    """Flask extension wiring compression and ETags into after_request"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_COMPRESSION', True)
+        app.config.setdefault('RESPONSE_ETAGS', True)
+        app.config.setdefault('COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+        app.before_request(self._note_pending_flashes)
+        message_flashed.connect(self._note_flash, app)
+        app.after_request(self._optimize)
+        return self
+
+    @staticmethod
+    def _note_pending_flashes():
+        g.has_flashes = '_flashes' in session
+
+    @staticmethod
+    def _note_flash(sender, **extra):
+        g.has_flashes = True
+
+    def _optimize(self, response):
+        config = current_app.config
+
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.mimetype != 'text/html' or 'Content-Encoding' in response.headers):
+            return response
+
+        body = response.get_data()
+        coding = None
+        if config['RESPONSE_COMPRESSION'] and len(body) >= config['COMPRESSION_MIN_SIZE']:
+            coding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+        response.vary.add('Accept-Encoding')
+
+        if config['RESPONSE_ETAGS'] and request.method == 'GET' and not g.get('has_flashes'):
+            # One strong validator per representation (identity/gzip/br)
+            etag = hashlib.sha256(body).hexdigest()[:32] + (f"-{coding}" if coding else '')
+            response.set_etag(etag)
+            if request.if_none_match.contains(etag):
+                response.status_code = 304
+                response.set_data(b'')
+                response.headers.pop('Content-Length', None)
+                return response
+
+        if coding:
+            response.set_data(compress(body, coding))
+            response.headers['Content-Encoding'] = coding
+        return response
@@ -0,0 +1,293 @@
+"""
+Page Driver - one small page API with two interchangeable backends
+- SeleniumPage: drives a real browser through WebDriver
+- ClientPage: drives demo_app in-process through Flask's test client,
+  parsing forms and flash messages and emulating the browser's HTML5
+  constraint validation (required, type=email)
+The same test body runs on either backend, so server-side validation
+suites can skip the browser entirely
+submit_batch() runs a whole dataset through one form: in the browser from a
+single page load (batch_submit.py), on the client backend case by case
+set_request_header() adds a header to every later request of a page, driver or
+test client; headers set by different callers are kept side by side
+"""
+
+import re
+from html.parser import HTMLParser
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+import batch_submit
+import profiler
+import waits
+
+
+BACKENDS = ('selenium', 'client')
+
+# WHATWG "valid e-mail address" - what browsers enforce for <input type="email">
+HTML5_EMAIL_RE = re.compile(
+    r"^[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+)
+
+
+class SeleniumPage:
+    """Page API on top of a WebDriver session"""
+
+    backend = 'selenium'
+
+    def __init__(self, driver, base_url):
+        self.driver = driver
+        self.base_url = base_url
+
+    def open(self, path):
+        self.driver.get(f"{self.base_url}{path}")
+
+    def fill(self, field_id, value):
+        """Type into a field; empty values are left untouched like a user would"""
+        if value:
+            self.driver.find_element(By.ID, field_id).send_keys(value)
+
+    def submit(self, button_id):
+        self.driver.find_element(By.ID, button_id).click()
+
+    def submit_batch(self, path, button_id, payloads):
+        """One outcome per payload ({field id: value}), all submitted from a single load of path"""
+        return batch_submit.submit_batch(self.driver, self.base_url, path, button_id, payloads)
+
+    def wait_until(self, condition, timeout=10):
+        """Wait until condition(page) is truthy"""
+        return waits.timed(WebDriverWait(self.driver, timeout).until, lambda d: condition(self))
+
+    def wait_for_flash(self, text, timeout=10):
+        return waits.wait_for_flash(self.driver, text, timeout)
+
+    def wait_for_url(self, fragment, timeout=10):
+        return waits.wait_for_url(self.driver, fragment, timeout)
+
+    def wait_for_element(self, element_id, timeout=10):
+        return waits.wait_for_element(self.driver, element_id, timeout)
+
+    def has_element(self, element_id):
+        return bool(self.driver.find_elements(By.ID, element_id))
+
+    @property
+    def url(self):
+        return self.driver.current_url
+
+    @property
+    def title(self):
+        return self.driver.title
+
+    @property
+    def source(self):
+        return self.driver.page_source
+
+    def flash_messages(self):
+        return [
+            (element.get_attribute('class').replace('flash', '').strip(), element.text)
+            for element in self.driver.find_elements(By.CSS_SELECTOR, '.flash')
+        ]
+
+
+class _PageParser(HTMLParser):
+    """Pull forms, element ids and flash messages out of a rendered page"""
+
+    def __init__(self):
+        super().__init__()
+        self.title = ''
+        self.ids = set()
+        self.forms = []
+        self.flashes = []
+        self._in_title = False
+        self._flash = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if attrs.get('id'):
+            self.ids.add(attrs['id'])
+
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'form':
+            self.forms.append({
+                'action': attrs.get('action', ''),
+                'method': (attrs.get('method') or 'GET').upper(),
+                'fields': [],
+                'buttons': [],
+            })
+        elif tag == 'input' and self.forms:
+            self.forms[-1]['fields'].append({
+                'id': attrs.get('id'),
+                'name': attrs.get('name'),
+                'type': (attrs.get('type') or 'text').lower(),
+                'required': 'required' in attrs,
+                'value': attrs.get('value') or '',
+            })
+        elif tag == 'button' and self.forms:
+            self.forms[-1]['buttons'].append(attrs.get('id'))
+        elif tag == 'div' and 'flash' in (attrs.get('class') or '').split():
+            category = (attrs.get('class') or '').replace('flash', '').strip()
+            self._flash = [category, '']
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'div' and self._flash is not None:
+            self.flashes.append((self._flash[0], self._flash[1].strip()))
+            self._flash = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if self._flash is not None:
+            self._flash[1] += data
+
+
+class ClientPage:
+    """Page API on top of the Flask test client - no browser involved"""
+
+    backend = 'client'
+
+    def __init__(self, app, base_url='http://localhost'):
+        self.client = app.test_client()
+        self.base_url = base_url
+        self.path = ''
+        self._source = ''
+        self._parsed = _PageParser()
+        self._values = {}
+        self.validation_message = None
+        self._blocked_field = None
+        self.status = None
+
+    def open(self, path):
+        with profiler.span('get ' + path, 'navigation'):
+            response = self.client.get(path, follow_redirects=True)
+        self._load(response)
+
+    def fill(self, field_id, value):
+        if value:
+            self._values[field_id] = self._values.get(field_id, '') + value
+
+    def submit(self, button_id):
+        """Submit the form owning button_id, unless the browser would block it"""
+        form = next((f for f in self._parsed.forms if button_id in f['buttons']), None)
+        if form is None:
+            raise LookupError(f"No form with button #{button_id} on {self.path}")
+
+        data = {}
+        for field in form['fields']:
+            value = self._values.get(field['id'], field['value'])
+            if field['type'] == 'email':
+                # Browsers strip surrounding whitespace from email inputs
+                value = value.strip()
+            message = self._constraint_error(field, value)
+            if message:
+                # Constraint validation failed: no request is sent, page stays put
+                self.validation_message = message
+                self._blocked_field = field['id']
+                return
+            if field['name']:
+                data[field['name']] = value
+
+        action = form['action'] or self.path
+        with profiler.span(f"submit {action}", 'interaction'):
+            if form['method'] == 'POST':
+                response = self.client.post(action, data=data, follow_redirects=True)
+            else:
+                response = self.client.get(action, query_string=data, follow_redirects=True)
+        self._load(response)
+
+    def submit_batch(self, path, button_id, payloads):
+        """Same outcomes as SeleniumPage.submit_batch, one request cycle per payload"""
+        outcomes = []
+        for payload in payloads:
+            self.open(path)
+            for field_id, value in payload.items():
+                self.fill(field_id, value)
+            self.submit(button_id)
+            blocked = self.validation_message
+            outcomes.append({
+                'blocked': blocked,
+                'field': self._blocked_field if blocked else None,
+                'status': None if blocked else self.status,
+                'path': self.path,
+                'flashes': [] if blocked else self.flash_messages(),
+            })
+        return outcomes
+
+    @staticmethod
+    def _constraint_error(field, value):
+        if field['required'] and not value:
+            return 'Please fill out this field.'
+        if field['type'] == 'email' and value and not HTML5_EMAIL_RE.match(value):
+            return 'Please enter an email address.'
+        return None
+
+    def _load(self, response):
+        self.status = response.status_code
+        self.path = response.request.path
+        self._source = response.get_data(as_text=True)
+        self._parsed = _PageParser()
+        self._parsed.feed(self._source)
+        self._values = {}
+        self.validation_message = None
+
+    def wait_until(self, condition, timeout=10):
+        """Responses are synchronous, so the condition either holds now or never will"""
+        result = condition(self)
+        if not result:
+            raise AssertionError(f"Condition not met on {self.url}")
+        return result
+
+    def wait_for_flash(self, text, timeout=10):
+        return self.wait_until(lambda p: any(text in message for _, message in p.flash_messages()))
+
+    def wait_for_url(self, fragment, timeout=10):
+        return self.wait_until(lambda p: fragment in p.url)
+
+    def wait_for_element(self, element_id, timeout=10):
+        return self.wait_until(lambda p: p.has_element(element_id))
+
+    def has_element(self, element_id):
+        return element_id in self._parsed.ids
+
+    @property
+    def url(self):
+        return f"{self.base_url}{self.path}"
+
+    @property
+    def title(self):
+        return self._parsed.title.strip()
+
+    @property
+    def source(self):
+        return self._source
+
+    def flash_messages(self):
+        return list(self._parsed.flashes)
+
+
+def set_request_header(value, name, header_value):
+    """Send name: header_value with every request from a page, driver or test client (None removes it)"""
+    if isinstance(value, ClientPage):
+        key = 'HTTP_' + name.upper().replace('-', '_')
+        if header_value is None:
+            value.client.environ_base.pop(key, None)
+        else:
+            value.client.environ_base[key] = header_value
+        return
+    if isinstance(value, SeleniumPage):
+        value = value.driver
+    driver = getattr(value, 'wrapped_driver', value)
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return
+    # Network.setExtraHTTPHeaders replaces the whole set, so keep it per driver
+    headers = driver.__dict__.setdefault('_extra_http_headers', {})
+    if header_value is None:
+        headers.pop(name, None)
+    else:
+        headers[name] = header_value
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {'headers': dict(headers)})
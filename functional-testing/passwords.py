@@ -0,0 +1,106 @@
+"""
+Password Hashing - salted PBKDF2-SHA256 with a tunable work factor
+Hashes run on a bounded thread pool: hashlib releases the GIL while it
+works, so a slow hash only occupies a pool thread and never stalls the
+other request threads; when the pool is saturated callers get
+HashingBusy instead of queueing without limit
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+ALGORITHM = 'pbkdf2_sha256'
+
+# Work factor presets (PBKDF2 iterations)
+COST_PRESETS = {
+    'test': 1_000,
+    'production': 600_000,
+}
+
+DEFAULT_WORKERS = os.cpu_count() or 2
+# Hash jobs allowed to wait for a pool thread before callers are turned away
+PENDING_PER_WORKER = 8
+# Seconds a caller may wait for a queue slot
+ADMISSION_TIMEOUT = 5.0
+
+
+class HashingBusy(Exception):
+    """The hashing pool is saturated; the request should be retried later"""
+
+
+def resolve_cost(cost):
+    """Iterations for a preset name or a plain number"""
+    if str(cost) in COST_PRESETS:
+        return COST_PRESETS[str(cost)]
+    iterations = int(cost)
+    if iterations < 1:
+        raise ValueError(f"Invalid password hash cost {cost!r}")
+    return iterations
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a bounded worker pool"""
+
+    def __init__(self, iterations=COST_PRESETS['test'], workers=DEFAULT_WORKERS):
+        self.iterations = iterations
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pwhash')
+        self._slots = threading.BoundedSemaphore(workers * (1 + PENDING_PER_WORKER))
+        # Compared against for unknown users so response time does not reveal registration
+        self._dummy = self._encode(os.urandom(16), 'dummy-password')
+
+    def _encode(self, salt, password, iterations=None):
+        iterations = iterations or self.iterations
+        return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(_derive(password, salt, iterations))}"
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(timeout=ADMISSION_TIMEOUT):
+            raise HashingBusy('Password hashing pool is saturated')
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        """Encoded hash string: algorithm$iterations$salt$digest"""
+        return self._submit(self._encode, os.urandom(16), password)
+
+    def verify(self, password, encoded):
+        """True if password matches encoded; encoded=None burns the same work and fails"""
+        return self._submit(self._check, password, encoded)
+
+    def _check(self, password, encoded):
+        if encoded is None:
+            self._check(password, self._dummy)
+            return False
+        try:
+            algorithm, iterations, salt, digest = encoded.split('$')
+        except ValueError:
+            return False
+        if algorithm != ALGORITHM:
+            return False
+        candidate = _derive(password, _unb64(salt), int(iterations))
+        return hmac.compare_digest(candidate, _unb64(digest))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
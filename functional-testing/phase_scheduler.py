@@ -0,0 +1,273 @@
+"""
+Phase Scheduler - run test phases (smoke, then regression) in one pytest session
+Enabled with -p phase_scheduler --phases=smoke,regression
+- Items are grouped by the first phase marker they carry and run phase by
+  phase; items with none of the markers are deselected
+- A failure in the first phase stops the run (the same stop path as -x)
+- With pytest-xdist the later phases reuse the workers, browsers and
+  collection of the first one: the scheduler only holds them back until every
+  worker has the earlier phase in hand
+- Per-phase outcomes are kept in `results` for run_all_tests.py
+- With -p duration_scheduler --lpt each phase is dispatched longest test first
+
+Workers tell the controller which phase each collected item belongs to through
+a small JSON file (the controller never collects items itself)
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # the plugin also works without pytest-xdist
+    LoadScheduling = object
+
+
+# phase name -> {'passed': n, 'failed': n, 'skipped': n}, filled on the controller
+results = {}
+_outcomes = {}
+_session = None
+
+
+def pytest_addoption(parser):
+    parser.addoption('--phases', default=None, metavar='MARKERS',
+                     help='Comma-separated markers run as ordered phases in one session, '
+                          'e.g. smoke,regression; a failure in the first phase stops the run')
+
+
+def get_phases(config):
+    spec = config.getoption('--phases')
+    return [name.strip() for name in spec.split(',') if name.strip()] if spec else []
+
+
+def phase_index(keywords, phases):
+    """Index of the first phase whose marker is in keywords, or None"""
+    for index, name in enumerate(phases):
+        if name in keywords:
+            return index
+    return None
+
+
+def _is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def pytest_configure(config):
+    config._phase_dir = None
+    results.clear()
+    _outcomes.clear()
+    if get_phases(config) and not _is_worker(config):
+        config._phase_dir = tempfile.mkdtemp(prefix='phases-')
+
+
+def pytest_unconfigure(config):
+    if getattr(config, '_phase_dir', None):
+        shutil.rmtree(config._phase_dir, ignore_errors=True)
+
+
+def pytest_sessionstart(session):
+    global _session
+    _session = session
+
+
+def pytest_collection_modifyitems(config, items):
+    phases = get_phases(config)
+    if not phases:
+        return
+    selected = [item for item in items if phase_index(item.keywords, phases) is not None]
+    deselected = [item for item in items if phase_index(item.keywords, phases) is None]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    # Stable sort: collection order is kept inside each phase
+    items[:] = sorted(selected, key=lambda item: phase_index(item.keywords, phases))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    """On workers: write {nodeid: phase} before the collection is sent to the controller"""
+    path = getattr(session.config, 'workerinput', {}).get('phase_map')
+    if path:
+        phases = get_phases(session.config)
+        with open(path, 'w') as f:
+            json.dump({item.nodeid: phase_index(item.keywords, phases) for item in session.items}, f)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    if node.config._phase_dir:
+        node.workerinput['phase_map'] = os.path.join(node.config._phase_dir, f"{node.gateway.id}.json")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if get_phases(config):
+        order = None
+        if config.pluginmanager.has_plugin('duration_scheduler') and config.getoption('--lpt'):
+            from duration_scheduler import lpt_order
+            order = lpt_order
+        return PhaseScheduling(config, log, order)
+    return None
+
+
+def pytest_runtest_logreport(report):
+    if _session is None:
+        return
+    config = _session.config
+    phases = get_phases(config)
+    phase = phase_index(report.keywords, phases)
+    if phase is None:
+        return
+
+    if report.failed and phase == 0 and len(phases) > 1:
+        reason = f"{phases[0]} test failed: {report.nodeid}"
+        dsession = config.pluginmanager.get_plugin('dsession')
+        if dsession is not None:
+            # xdist controller: same stop path as --maxfail, workers are shut down right away
+            dsession.shouldstop = dsession.shouldstop or reason
+        else:
+            _session.shouldstop = reason
+
+    if _is_worker(config):
+        return
+    if report.when == 'call' or report.failed or report.skipped:
+        previous = _outcomes.get(report.nodeid)
+        if previous != 'failed':
+            _outcomes[report.nodeid] = report.outcome
+            counts = results.setdefault(phases[phase], {'passed': 0, 'failed': 0, 'skipped': 0})
+            if previous is not None:
+                counts[previous] -= 1
+            counts[report.outcome] += 1
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _is_worker(config) or not results:
+        return
+    terminalreporter.write_sep('=', 'phases')
+    phases = get_phases(config)
+    for name in phases:
+        counts = results.get(name)
+        if counts is None:
+            terminalreporter.write_line(f"{name:<12} not run")
+            continue
+        terminalreporter.write_line(
+            f"{name:<12} {counts['passed']} passed, {counts['failed']} failed, {counts['skipped']} skipped"
+        )
+
+
+class PhaseScheduling(LoadScheduling):
+    """LoadScheduling that hands out one phase at a time
+
+    Until every earlier-phase item has finished, nodes get at most two items
+    at a time (an xdist worker only runs an item once it knows the next one)
+    and nodes without earlier-phase work park a single later-phase item, so a
+    failure in a gated phase stops the run after at most one more test per
+    worker. The rest of the last phase is scheduled exactly like --dist load
+    """
+
+    def __init__(self, config, log=None, order=None):
+        super().__init__(config, log)
+        self.held = []
+        self.phase_of = []
+        self.last_phase = 0
+        # order(scheduler, indices): dispatch order inside a phase, collection order by default
+        self.order = order
+        self.was_gated = False
+
+    @property
+    def tests_finished(self):
+        return not self.held and super().tests_finished
+
+    @property
+    def has_pending(self):
+        return bool(self.held) or super().has_pending
+
+    def _read_phase_map(self):
+        for node in self.node2collection:
+            path = node.workerinput.get('phase_map')
+            if path and os.path.exists(path):
+                with open(path) as f:
+                    return json.load(f)
+        return {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        phase_map = self._read_phase_map()
+        self.phase_of = [phase_map.get(nodeid) or 0 for nodeid in self.collection]
+        first = min(self.phase_of, default=0)
+        self.last_phase = max(self.phase_of, default=0)
+        self.pending[:] = self._ordered(i for i, phase in enumerate(self.phase_of) if phase == first)
+        self.held = sorted((i for i, phase in enumerate(self.phase_of) if phase != first),
+                           key=lambda i: self.phase_of[i])
+        if not self.collection:
+            return
+        if self.order is not None:
+            # One item at a time keeps the dispatch order intact
+            self.maxschedchunk = 1
+        if self.maxschedchunk is None:
+            self.maxschedchunk = len(self.collection)
+
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def _ordered(self, indices):
+        indices = list(indices)
+        return indices if self.order is None else self.order(self, indices)
+
+    def _gated(self):
+        """True until every item of the earlier phases has finished"""
+        return bool(self.held) or any(
+            self.phase_of[i] != self.last_phase for pending in self.node2pending.values() for i in pending
+        )
+
+    def _phase_drained(self):
+        # Each node keeps its last item until it receives another one (or shutdown)
+        return not self.pending and all(len(pending) <= 1 for pending in self.node2pending.values())
+
+    def _open_next_phase(self):
+        phase = self.phase_of[self.held[0]]
+        self.pending[:] = self._ordered(i for i in self.held if self.phase_of[i] == phase)
+        self.held = [i for i in self.held if self.phase_of[i] != phase]
+        self.log("opening phase", phase, "with", len(self.pending), "items")
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+
+        if self.held and self._phase_drained():
+            self._open_next_phase()
+            for other in self.nodes:
+                if other is not node:
+                    self.check_schedule(other)
+
+        if self._gated():
+            self.was_gated = True
+            node_pending = self.node2pending[node]
+            # A node needs a second item to run its earlier-phase one; otherwise it
+            # parks a single later-phase item until the earlier phase has finished
+            earlier = any(self.phase_of[i] != self.last_phase for i in node_pending + self.pending[:1])
+            wanted = 2 if earlier else 1
+            if self.pending and len(node_pending) < wanted:
+                self._send_tests(node, wanted - len(node_pending))
+            return
+
+        if self.was_gated:
+            # The gate just opened: the nodes parked on one item need their next one to start
+            self.was_gated = False
+            for other in self.nodes:
+                if other is not node:
+                    super().check_schedule(other)
+        super().check_schedule(node, duration)
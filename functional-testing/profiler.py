@@ -0,0 +1,169 @@
+"""
+Suite Profiler - timeline of where test time goes
+Records spans for every test phase (setup/call/teardown) and for the work
+inside them (browser launch, navigation, waits, interactions) per worker,
+then exports one Chrome-trace JSON for the whole run
+Open the trace in chrome://tracing or https://ui.perfetto.dev
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.support.events import AbstractEventListener
+
+
+# Rows in the "slowest phases" table
+SLOWEST_TOP = 15
+
+_events = []
+_state = {'enabled': False, 'pid': 0, 'test': None}
+
+
+def enable(pid):
+    """Start recording; pid is the trace process row for this worker"""
+    _state['enabled'] = True
+    _state['pid'] = pid
+
+
+def enabled():
+    return _state['enabled']
+
+
+def set_current_test(nodeid):
+    _state['test'] = nodeid
+
+
+def _now_us():
+    # Wall clock so timelines from different worker processes line up
+    return time.time_ns() // 1000
+
+
+@contextmanager
+def span(name, cat, **args):
+    """Record a complete ('X') trace event around the block"""
+    if not _state['enabled']:
+        yield
+        return
+
+    start = _now_us()
+    try:
+        yield
+    finally:
+        if _state['test']:
+            args.setdefault('test', _state['test'])
+        _events.append({
+            'name': name, 'cat': cat, 'ph': 'X',
+            'ts': start, 'dur': _now_us() - start,
+            'pid': _state['pid'], 'tid': 0, 'args': args,
+        })
+
+
+def events():
+    """Events recorded in this process"""
+    return list(_events)
+
+
+class TimelineListener(AbstractEventListener):
+    """Selenium listener that turns navigation and interactions into spans"""
+
+    def __init__(self):
+        self._open = {}
+
+    def _begin(self, key, name, cat):
+        context = span(name, cat)
+        context.__enter__()
+        self._open[key] = context
+
+    def _end(self, key):
+        context = self._open.pop(key, None)
+        if context is not None:
+            context.__exit__(None, None, None)
+
+    def before_navigate_to(self, url, driver):
+        self._begin('navigate', 'get ' + url, 'navigation')
+
+    def after_navigate_to(self, url, driver):
+        self._end('navigate')
+
+    def before_click(self, element, driver):
+        self._begin('click', 'click', 'interaction')
+
+    def after_click(self, element, driver):
+        self._end('click')
+
+    def before_change_value_of(self, element, driver):
+        self._begin('type', 'send_keys', 'interaction')
+
+    def after_change_value_of(self, element, driver):
+        self._end('type')
+
+    def before_find(self, by, value, driver):
+        self._begin('find', f'find {value}', 'interaction')
+
+    def after_find(self, by, value, driver):
+        self._end('find')
+
+    def on_exception(self, exception, driver):
+        for key in list(self._open):
+            self._end(key)
+
+
+def worker_pid(worker_id):
+    """Trace process row for an xdist worker id ('main' -> 0, 'gw0' -> 1, ...)"""
+    if worker_id.startswith('gw') and worker_id[2:].isdigit():
+        return int(worker_id[2:]) + 1
+    return 0
+
+
+def worker_label(pid):
+    return f"worker gw{pid - 1}" if pid else 'main'
+
+
+def build_trace(event_lists):
+    """Merge per-worker event lists into one Chrome-trace document"""
+    trace_events = []
+    for worker_events in event_lists:
+        trace_events.extend(worker_events)
+
+    for pid in sorted({event['pid'] for event in trace_events}):
+        trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                             'args': {'name': worker_label(pid)}})
+        trace_events.append({'name': 'process_sort_index', 'ph': 'M', 'pid': pid, 'tid': 0,
+                             'args': {'sort_index': pid}})
+    return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+
+def write_trace(path, event_lists):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(build_trace(event_lists), f)
+
+
+def worker_utilization(event_lists):
+    """Busy vs idle time per worker, from the test phase spans"""
+    phases = [e for events in event_lists for e in events if e['cat'] == 'test']
+    if not phases:
+        return []
+
+    run_start = min(e['ts'] for e in phases)
+    run_end = max(e['ts'] + e['dur'] for e in phases)
+    wall = run_end - run_start
+    rows = []
+    for pid in sorted({e['pid'] for e in phases}):
+        busy = sum(e['dur'] for e in phases if e['pid'] == pid)
+        rows.append({'worker': worker_label(pid), 'busy_s': busy / 1e6, 'idle_s': max(0, wall - busy) / 1e6})
+    return rows
+
+
+def slowest_phases(event_lists, top=SLOWEST_TOP):
+    """Longest individual spans plus totals per category"""
+    spans = [e for events in event_lists for e in events if e.get('ph') == 'X']
+    totals = {}
+    for e in spans:
+        totals[e['cat']] = totals.get(e['cat'], 0) + e['dur']
+    slowest = sorted(spans, key=lambda e: -e['dur'])[:top]
+    return slowest, {cat: dur / 1e6 for cat, dur in sorted(totals.items(), key=lambda kv: -kv[1])}
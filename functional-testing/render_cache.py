@@ -0,0 +1,88 @@
+"""
+Render Cache - reuse the static rendering of page templates
+GET /, /login and /signup render byte-identical HTML unless a flash message
+is pending or a user is logged in, so the static rendering is cached per
+(template, template mtime, locale) in a small LRU. Everything else renders
+dynamically from the Jinja templates precompiled at startup
+- RENDER_CACHE config (or DEMO_APP_RENDER_CACHE=0) turns the cache off
+- stats() exposes hit/miss counters (also shown on /healthz)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from flask import render_template, request, session
+
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+class RenderCache:
+    """LRU of static page renderings for one Flask app"""
+
+    def __init__(self, app=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._paths = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dynamic = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('RENDER_CACHE', os.environ.get('DEMO_APP_RENDER_CACHE', '1') != '0')
+        # Compile every template up front so dynamic renders skip the parse step
+        for name in app.jinja_env.list_templates(extensions=['html']):
+            template = app.jinja_env.get_template(name)
+            self._paths[name] = template.filename
+        return self
+
+    def _is_dynamic(self, context):
+        return bool(context) or '_flashes' in session or 'user' in session
+
+    def render(self, template_name, **context):
+        """render_template() that serves static pages from the cache"""
+        if not self.app.config['RENDER_CACHE'] or self._is_dynamic(context):
+            self.dynamic += 1
+            return render_template(template_name, **context)
+
+        key = (template_name, self._mtime(template_name), request.accept_languages.best or '')
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+
+        html = render_template(template_name)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return html
+
+    def _mtime(self, template_name):
+        path = self._paths.get(template_name)
+        return os.path.getmtime(path) if path else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            'enabled': self.app.config['RENDER_CACHE'],
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'dynamic': self.dynamic,
+        }
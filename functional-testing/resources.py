@@ -0,0 +1,146 @@
+"""
+Resources - size the run to the machine and watch browser memory
+- usable_cpus() / available_memory(): CPU affinity and MemAvailable, capped by
+  cgroup (container / CI runner) limits
+- process_tree_rss(pid): resident memory of a process and all its children
+  (chromedriver -> chrome -> renderers), read from /proc
+- auto_workers(): xdist worker count from CPUs, free memory and the measured
+  footprint of one worker (its browsers plus the Python process)
+The footprint is measured by the browser pools during each run and kept in
+.browser_footprint.json (xdist sizes -n auto before the pytest cache exists),
+so `-n auto` gets more accurate after the first run
+Without /proc (macOS, Windows) memory is unknown and only CPUs are counted
+"""
+
+import json
+import os
+
+
+MB = 1024 * 1024
+# Used until a run has measured the real footprint
+DEFAULT_BROWSER_MB = 350
+DEFAULT_WORKER_MB = 120
+# Left for the app server, the OS and whatever else shares the box
+RESERVED_MB = 768
+FOOTPRINT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.browser_footprint.json')
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def load_footprint(path=FOOTPRINT_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_footprint(footprint, path=FOOTPRINT_FILE):
+    """Average a run's measured footprint into the stored one"""
+    previous = load_footprint(path)
+    for key, value in footprint.items():
+        if value and previous.get(key):
+            footprint[key] = round((value + previous[key]) / 2, 1)
+    with open(path, 'w') as f:
+        json.dump(footprint, f, indent=2)
+
+
+def usable_cpus():
+    """CPUs this process may run on, capped by a cgroup CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    # cgroup v2: "max 100000" or "<quota> <period>"
+    quota = (_read('/sys/fs/cgroup/cpu.max') or '').split()
+    if len(quota) == 2 and quota[0] != 'max':
+        cpus = min(cpus, max(1, int(int(quota[0]) / int(quota[1]))))
+    return cpus
+
+
+def available_memory():
+    """Bytes that can be allocated without swapping, or None if unknown"""
+    meminfo = _read('/proc/meminfo')
+    if meminfo is None:
+        return None
+    available = None
+    for line in meminfo.splitlines():
+        if line.startswith('MemAvailable:'):
+            available = int(line.split()[1]) * 1024
+    # cgroup v2 memory limit (containers see the host's MemAvailable)
+    limit = (_read('/sys/fs/cgroup/memory.max') or 'max').strip()
+    current = (_read('/sys/fs/cgroup/memory.current') or '').strip()
+    if limit != 'max' and current:
+        headroom = int(limit) - int(current)
+        available = headroom if available is None else min(available, headroom)
+    return available
+
+
+def _children():
+    """{ppid: [pid, ...]} for every process in /proc"""
+    children = {}
+    try:
+        pids = [name for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return children
+    for pid in pids:
+        stat = _read(f'/proc/{pid}/stat')
+        if not stat:
+            continue
+        # The command name may contain spaces and parentheses, fields follow the last ')'
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(pid))
+    return children
+
+
+def process_rss(pid):
+    status = _read(f'/proc/{pid}/status')
+    if not status:
+        return 0
+    for line in status.splitlines():
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+def process_tree_rss(pid):
+    """RSS in bytes of pid and all its descendants, or None without /proc"""
+    if pid is None or not os.path.isdir('/proc'):
+        return None
+    children = _children()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += process_rss(current)
+        stack.extend(children.get(current, ()))
+    return total
+
+
+def driver_pid(driver):
+    """PID of the local driver service (chromedriver), the root of the browser's process tree"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def auto_workers(footprint=None, browsers_per_worker=1, cpus=None, memory=None):
+    """(workers, reason) for this machine; footprint is {'browser_mb', 'worker_mb'} from earlier runs"""
+    footprint = footprint or {}
+    browser_mb = footprint.get('browser_mb') or DEFAULT_BROWSER_MB
+    worker_mb = (footprint.get('worker_mb') or DEFAULT_WORKER_MB) + browser_mb * browsers_per_worker
+    cpus = cpus or usable_cpus()
+    memory = memory if memory is not None else available_memory()
+
+    if memory is None:
+        return cpus, f"{cpus} CPU(s), memory unknown"
+    by_memory = max(1, int((memory / MB - RESERVED_MB) // worker_mb))
+    workers = max(1, min(cpus, by_memory))
+    measured = 'measured' if footprint.get('browser_mb') else 'default'
+    return workers, (f"{cpus} CPU(s), {memory / MB / 1024:.1f} GB available, "
+                     f"~{worker_mb:.0f} MB per worker ({measured} browser footprint) -> memory allows {by_memory}")
@@ -2,14 +2,40 @@
 Master Test Runner
 Runs smoke tests first, then regression tests if smoke passes
 All tests are now in test_demo_app.py with pytest markers
+Pipelined (default): both phases run inside one in-process pytest session
+(phase_scheduler.py). Every worker launches its browsers while smoke runs,
+regression is dispatched the moment the smoke gate passes, and a smoke
+failure cancels the rest of the run
+--sequential: the old strategy (serial smoke subprocess, then a parallel
+regression subprocess); its wall clock is the baseline the pipelined run
+reports its savings against
+Every phase appends to one JSONL event log (streaming_report.py), which is
+merged into a paginated HTML report and JUnit XML at the end of the run
 """
 
+import json
+import os
 import subprocess
 import sys
+import time
+
+import pytest
+
+import phase_scheduler
+import streaming_report
+
+
+TIMINGS_FILE = ".run_timings.json"
+
+EVENT_LOG = "demo_app_events.jsonl"
+HTML_REPORT_DIR = "demo_app_report"
+JUNIT_REPORT = "demo_app_junit.xml"
+
+REPORT_ARGS = [f"--event-log={EVENT_LOG}"]
 
 
 def run_smoke_tests():
-    """Run smoke tests first"""
+    """Run smoke tests first (sequential strategy)"""
     print("\n" + "="*70)
     print("🔥 STEP 1: RUNNING SMOKE TESTS")
     print("="*70)
@@ -21,20 +47,18 @@ def run_smoke_tests():
         "test_demo_app.py",
         "-v",
         "-m", "smoke",
-        "--html=demo_app_test_report.html",
-        "--self-contained-html",
-        "--css=assets/style.css"
-    ])
+        "--event-phase=smoke",
+    ] + REPORT_ARGS)
 
     return result.returncode
 
 
 def run_regression_tests():
-    """Run regression tests with parallel execution"""
+    """Run regression tests with parallel execution (sequential strategy)"""
     print("\n" + "="*70)
     print("🔄 STEP 2: RUNNING REGRESSION TESTS (PARALLEL EXECUTION)")
     print("="*70)
-    print("Comprehensive tests running on 4 parallel workers...")
+    print("Comprehensive tests running on parallel workers (-n auto)...")
     print("="*70 + "\n")
 
     result = subprocess.run([
@@ -42,11 +66,99 @@ def run_regression_tests():
         "test_demo_app.py",
         "-v",
         "-m", "regression",
-        "-n", "4",  # 4 parallel workers
-        "--html=demo_app_test_report.html",
-        "--self-contained-html",
-        "--css=assets/style.css"
-    ])
+        "-n", "auto",  # sized from CPUs, free memory and the measured browser footprint
+        "-p", "duration_scheduler",
+        "--lpt",  # longest tests first, from the durations of earlier runs
+        "--profile-trace=demo_app_trace.json",
+        "--event-phase=regression",
+    ] + REPORT_ARGS)
+
+    return result.returncode
+
+
+def run_pipelined():
+    """Run smoke and regression as two phases of one session, browsers warming up during smoke"""
+    print("\n" + "="*70)
+    print("🔥 STEP 1: SMOKE TESTS → 🔄 STEP 2: REGRESSION TESTS (PIPELINED)")
+    print("="*70)
+    print("Every worker launches its browser while smoke runs; the run stops at the first smoke failure.")
+    print("Regression starts on the same warm workers the moment smoke passes...")
+    print("="*70 + "\n")
+
+    result = pytest.main([
+        "test_demo_app.py",
+        "-v",
+        "-p", "phase_scheduler",
+        "--phases=smoke,regression",
+        "-n", "auto",  # sized from CPUs, free memory and the measured browser footprint
+        "--prewarm-browsers",
+        "-p", "duration_scheduler",
+        "--lpt",  # longest tests first, from the durations of earlier runs
+        "--profile-trace=demo_app_trace.json",
+    ] + REPORT_ARGS)
+
+    smoke = phase_scheduler.results.get("smoke")
+    smoke_result = 1 if smoke is None or smoke["failed"] else 0
+    return smoke_result, int(result), phase_scheduler.results
+
+
+def run_sequential():
+    """Smoke subprocess, then (if it passed) a regression subprocess"""
+    smoke_result = run_smoke_tests()
+    if smoke_result != 0:
+        return smoke_result, 1, {}
+
+    print("\n" + "="*70)
+    print("✅ SMOKE TESTS PASSED!")
+    print("="*70)
+    print("Proceeding with regression testing...")
+    print("="*70)
+
+    return 0, run_regression_tests(), {}
+
+
+def load_timings():
+    try:
+        with open(TIMINGS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_timing(strategy, seconds):
+    """Remember the wall clock of a complete run per strategy"""
+    timings = load_timings()
+    timings[strategy] = {"seconds": round(seconds, 2), "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+    with open(TIMINGS_FILE, "w") as f:
+        json.dump(timings, f, indent=2)
+
+
+def report_wall_clock(strategy, seconds):
+    print(f"⏱️  Wall clock ({strategy}): {seconds:.1f}s")
+    if strategy != "pipelined":
+        return
+    sequential = load_timings().get("sequential")
+    if sequential:
+        saved = sequential["seconds"] - seconds
+        print(f"   Sequential strategy: {sequential['seconds']:.1f}s (measured {sequential['date']}) "
+              f"→ saved {saved:.1f}s ({saved / sequential['seconds']:.0%})")
+    else:
+        print("   Run `python3 run_all_tests.py --sequential` once to measure the sequential baseline")
+
+
+def run_route_benchmarks():
+    """Fail the run when a route handler got slower than this machine's baseline
+
+    --baseline-dir=DIR is passed on to bench_routes.py (CI keeps its baselines there)
+    """
+    print("\n" + "="*70)
+    print("⏱️  PERFORMANCE GATE: ROUTE BENCHMARKS")
+    print("="*70)
+    print("Comparing route timings with the stored baseline (bench_routes.py)...")
+    print("="*70 + "\n")
+
+    args = [arg for arg in sys.argv[1:] if arg.startswith("--baseline-dir=")]
+    result = subprocess.run([sys.executable, "bench_routes.py", *args])
 
     return result.returncode
 
@@ -56,87 +168,119 @@ def run_all_tests():
     print("\n" + "="*70)
     print("🚀 RUNNING ALL TESTS (SMOKE + REGRESSION + DATA-DRIVEN)")
     print("="*70)
-    print("Running 57+ tests with parallel execution...")
+    print("Running 67+ tests with parallel execution...")
     print("="*70 + "\n")
 
-    result = subprocess.run([
-        sys.executable, "-m", "pytest",
+    result = pytest.main([
         "test_demo_app.py",
         "-v",
-        "-n", "4",  # 4 parallel workers
-        "--html=demo_app_test_report.html",
-        "--self-contained-html",
-        "--css=assets/style.css"
-    ])
+        "-n", "auto",  # sized from CPUs, free memory and the measured browser footprint
+        "-p", "duration_scheduler",
+        "--lpt",  # longest tests first, from the durations of earlier runs
+        "--profile-trace=demo_app_trace.json",
+        "--event-phase=all",
+    ] + REPORT_ARGS)
+
+    return int(result)
+
+
+def start_event_log():
+    """Each runner invocation starts a fresh log; its phases append to it"""
+    if os.path.exists(EVENT_LOG):
+        os.remove(EVENT_LOG)
 
-    return result.returncode
+
+def write_reports():
+    """Merge the event log of every phase into one HTML report and JUnit XML"""
+    if not os.path.exists(EVENT_LOG):
+        return
+    streaming_report.render([EVENT_LOG], HTML_REPORT_DIR, JUNIT_REPORT)
+    print(f"\n📄 Test Report: {HTML_REPORT_DIR}/index.html")
+    print(f"🧾 JUnit XML: {JUNIT_REPORT}")
+    print(f"📜 Event log: {EVENT_LOG}")
+
+
+def describe(counts):
+    return f"{counts['passed']} passed, {counts['failed']} failed"
 
 
 def main():
     """Main test execution flow"""
-    import sys
-
     # Check if user wants to run all tests at once
+    start_event_log()
     if len(sys.argv) > 1 and sys.argv[1] == "--all":
         result = run_all_tests()
+        bench_result = run_route_benchmarks()
         print("\n" + "="*70)
         print("📊 FINAL RESULTS")
         print("="*70)
         if result == 0:
-            print("✅ ALL TESTS PASSED! (5 Smoke + 15 Regression + 37 Data-Driven)")
+            print("✅ ALL TESTS PASSED! (5 Smoke + 15 Regression + 47 Data-Driven)")
         else:
             print("❌ SOME TESTS FAILED")
+        if bench_result != 0:
+            print("❌ ROUTE BENCHMARKS: slower than baseline")
         print("="*70)
-        print("\n📄 Enhanced HTML Test Report: demo_app_test_report.html")
+        write_reports()
+        print("⏱️  Timeline (chrome://tracing / ui.perfetto.dev): demo_app_trace.json")
         print("="*70 + "\n")
-        sys.exit(result)
+        sys.exit(result or bench_result)
 
     # Default: Run smoke first, then regression
+    strategy = "sequential" if "--sequential" in sys.argv[1:] else "pipelined"
     print("\n" + "="*70)
     print("🚀 AUTOMATED TEST SUITE EXECUTION")
     print("="*70)
-    print("Strategy: Smoke → Regression (if smoke passes)")
+    print(f"Strategy: Smoke → Regression (if smoke passes), {strategy}")
     print("="*70)
 
-    # Run smoke tests
-    smoke_result = run_smoke_tests()
+    start = time.perf_counter()
+    if strategy == "pipelined":
+        smoke_result, regression_result, phases = run_pipelined()
+    else:
+        smoke_result, regression_result, phases = run_sequential()
+    elapsed = time.perf_counter() - start
 
     if smoke_result != 0:
         print("\n" + "="*70)
         print("❌ SMOKE TESTS FAILED!")
         print("="*70)
-        print("Skipping regression tests due to smoke test failures.")
+        print("Regression tests were skipped or cancelled due to smoke test failures.")
         print("Fix critical issues first before running full regression.")
-        print("="*70 + "\n")
+        print("="*70)
+        write_reports()
+        print()
         sys.exit(1)
 
-    print("\n" + "="*70)
-    print("✅ SMOKE TESTS PASSED!")
-    print("="*70)
-    print("Proceeding with regression testing...")
-    print("="*70)
-
-    # Run regression tests
-    regression_result = run_regression_tests()
+    record_timing(strategy, elapsed)
+    bench_result = run_route_benchmarks()
 
     print("\n" + "="*70)
     print("📊 FINAL RESULTS")
     print("="*70)
 
+    smoke, regression = phases.get("smoke"), phases.get("regression")
+    smoke_counts = f" ({describe(smoke)})" if smoke else ""
+    regression_counts = f" ({describe(regression)})" if regression else ""
+    print(f"✅ Smoke Tests: PASSED{smoke_counts}")
     if regression_result == 0:
-        print("✅ Smoke Tests: PASSED (5 tests)")
-        print("✅ Regression Tests: PASSED (52+ tests)")
+        print(f"✅ Regression Tests: PASSED{regression_counts}")
         print("\n🎉 ALL TESTS PASSED! Application is stable.")
     else:
-        print("✅ Smoke Tests: PASSED (5 tests)")
-        print("❌ Regression Tests: FAILED")
+        print(f"❌ Regression Tests: FAILED{regression_counts}")
         print("\n⚠️  Some regression tests failed. Check report for details.")
 
+    if bench_result != 0:
+        print("❌ Route Benchmarks: slower than baseline (see bench_routes.py output)")
+
+    print()
+    report_wall_clock(strategy, elapsed)
     print("="*70)
-    print("\n📄 Enhanced HTML Test Report: demo_app_test_report.html")
+    write_reports()
+    print("⏱️  Timeline (chrome://tracing / ui.perfetto.dev): demo_app_trace.json")
     print("="*70 + "\n")
 
-    sys.exit(regression_result)
+    sys.exit(regression_result or bench_result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Production Serving - run demo_app under a pre-forking multi-process server
+Uses gunicorn (pip install gunicorn) with threaded workers instead of the
+single-process Flask dev server, so parallel Selenium workers do not queue
+behind one another
+- Worker processes share users through the SQLite store (DEMO_APP_STORE)
+- A readiness probe polls /healthz once the server is up
+
+Usage:
+    python demo_app.py --mode prod --workers 4 --threads 8
+"""
+
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+DEFAULT_WORKERS = (os.cpu_count() or 2) * 2 + 1
+DEFAULT_THREADS = 4
+DEFAULT_KEEPALIVE = 5
+DEFAULT_STORE = 'sqlite:demo_users.db'
+READY_TIMEOUT = 30
+
+
+def wait_until_ready(base_url, timeout=READY_TIMEOUT):
+    """Poll /healthz until it answers 200; returns seconds waited"""
+    start = time.monotonic()
+    while True:
+        try:
+            with urllib.request.urlopen(f"{base_url}/healthz", timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        if time.monotonic() - start > timeout:
+            raise TimeoutError(f"{base_url} was not ready after {timeout}s")
+        time.sleep(0.1)
+
+
+def run_production(host='127.0.0.1', port=5000, workers=DEFAULT_WORKERS,
+                   threads=DEFAULT_THREADS, keepalive=DEFAULT_KEEPALIVE):
+    """Serve demo_app with gunicorn until interrupted"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("Production mode needs gunicorn: pip install gunicorn")
+
+    # Worker processes must share state, so default to the SQLite store;
+    # strong password hashing unless explicitly overridden
+    if workers > 1:
+        os.environ.setdefault('DEMO_APP_STORE', DEFAULT_STORE)
+    os.environ.setdefault('DEMO_APP_HASH_COST', 'production')
+    base_url = f"http://{host}:{port}"
+
+    def when_ready(server):
+        def probe():
+            try:
+                waited = wait_until_ready(base_url)
+                print(f"Demo app ready at {base_url} ({workers} workers x {threads} threads, "
+                      f"ready in {waited:.2f}s)")
+            except TimeoutError as e:
+                print(f"Readiness check failed: {e}")
+        threading.Thread(target=probe, daemon=True).start()
+
+    class DemoApplication(BaseApplication):
+        def load_config(self):
+            settings = {
+                'bind': f"{host}:{port}",
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                'keepalive': keepalive,
+                # Each worker imports the app itself, so no SQLite handle crosses a fork
+                'preload_app': False,
+                'when_ready': when_ready,
+                'accesslog': None,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from demo_app import app
+            return app
+
+    DemoApplication().run()
@@ -0,0 +1,57 @@
+"""
+Session Bootstrap - start browser tests already logged in (test-only)
+Mints a signed Flask session cookie for a user from the app's secret_key,
+without going through the login form or the running server, and injects it
+into the browser before the first navigation
+- Chrome: set through CDP (Network.setCookie), no page load needed
+- Other drivers: one cheap page load on the app's origin, then add_cookie
+
+Usage:
+    session_bootstrap.log_in(driver, "http://localhost:5000", "test@example.com")
+"""
+
+from urllib.parse import urlsplit
+
+from flask import Flask
+from selenium.common.exceptions import WebDriverException
+
+
+DEFAULT_EMAIL = 'test@example.com'
+
+
+def _secret_key():
+    import demo_app
+    return demo_app.app.secret_key
+
+
+def mint_session_cookie(email=DEFAULT_EMAIL, secret_key=None):
+    """(cookie name, value) of a session logged in as email"""
+    # A bare app with the same key signs exactly like the demo app does
+    signer_app = Flask(__name__)
+    signer_app.secret_key = secret_key or _secret_key()
+    serializer = signer_app.session_interface.get_signing_serializer(signer_app)
+    return signer_app.config['SESSION_COOKIE_NAME'], serializer.dumps({'user': email})
+
+
+def inject_session(driver, base_url, email=DEFAULT_EMAIL, secret_key=None):
+    """Put a logged-in session cookie for base_url into the browser"""
+    name, value = mint_session_cookie(email, secret_key)
+    try:
+        driver.execute_cdp_cmd('Network.setCookie', {
+            'name': name, 'value': value, 'url': base_url, 'path': '/', 'httpOnly': True,
+        })
+        return
+    except (AttributeError, WebDriverException):
+        pass
+
+    # No CDP: cookies can only be added for the origin of the current page
+    if urlsplit(driver.current_url).netloc != urlsplit(base_url).netloc:
+        driver.get(f"{base_url}/healthz")
+    driver.add_cookie({'name': name, 'value': value, 'path': '/', 'httpOnly': True})
+
+
+def log_in(driver, base_url, email=DEFAULT_EMAIL, secret_key=None):
+    """Inject the session and open the dashboard"""
+    inject_session(driver, base_url, email, secret_key)
+    driver.get(f"{base_url}/dashboard")
+    return driver
@@ -0,0 +1,441 @@
+"""
+Streaming Report - append-only JSONL event log, merged HTML and JUnit XML
+- EventLog appends one JSON line per test result while the run is going
+  (pytest --event-log=PATH), so phases, reruns and separate pytest processes
+  can all write to the same log without overwriting each other. A result is
+  written at its test's teardown, so a teardown error joins the result it
+  belongs to (one <testcase>) instead of becoming a second one
+- render() reads any number of logs in one streaming pass and writes
+  * an HTML report: index.html with the summary plus paginated, filterable
+    result tables whose pages are separate files loaded on demand
+  * JUnit XML with one <testsuite> per phase
+  * the slowest profiled phases (setup, navigation, waits, ...) when the run
+    used --profile-trace
+  Memory use is one page of rows per outcome plus counters, whatever the
+  suite size
+
+Usage:
+    pytest test_demo_app.py --event-log=demo_app_events.jsonl
+    python streaming_report.py demo_app_events.jsonl --html demo_app_report --junit demo_app_junit.xml
+"""
+
+import argparse
+import heapq
+import html
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from xml.sax.saxutils import quoteattr, escape
+
+
+DEFAULT_PAGE_SIZE = 100
+SLOWEST_COUNT = 10
+OUTCOMES = ('passed', 'failed', 'error', 'skipped')
+
+
+class EventLog:
+    """Appends events to a JSONL file, one flushed line per event"""
+
+    def __init__(self, path, phase='run'):
+        self.path = path
+        self.phase = phase
+        self.run_id = uuid.uuid4().hex[:12]
+        self._file = open(path, 'a', encoding='utf-8')
+        # Results of tests whose teardown has not been reported yet, by nodeid
+        self._pending = {}
+
+    def write(self, event, **fields):
+        fields.update(event=event, run=self.run_id, ts=round(time.time(), 3))
+        fields.setdefault('phase', self.phase)
+        self._file.write(json.dumps(fields) + '\n')
+        self._file.flush()
+
+    def test_report(self, report, phase=None, markers=(), worker=None):
+        """Log one result per test: its call (or failed/skipped setup) plus any teardown error"""
+        if report.when != 'teardown':
+            if report.when == 'call' or not report.passed:
+                self._pending[report.nodeid] = self._fields(report, phase, markers, worker)
+            return
+        fields = self._pending.pop(report.nodeid, None)
+        if report.failed:
+            teardown = self._fields(report, phase, markers, worker)
+            if fields is None or fields['outcome'] in ('passed', 'skipped'):
+                fields = dict(fields or teardown, outcome='error', when='teardown', message=teardown['message'])
+            else:
+                fields['teardown_error'] = teardown['message']
+        if fields is not None:
+            self.write('test', **fields)
+
+    def _fields(self, report, phase, markers, worker):
+        outcome = report.outcome
+        if report.failed and report.when != 'call':
+            outcome = 'error'
+        fields = {
+            'nodeid': report.nodeid,
+            'phase': phase or self.phase,
+            'outcome': outcome,
+            'when': report.when,
+            'duration': round(report.duration, 4),
+            'markers': sorted(markers),
+            'worker': worker,
+        }
+        if hasattr(report, 'wasxfail'):
+            fields['xfail'] = True
+        for name, value in report.user_properties:
+            if name == 'wait_seconds':
+                fields['wait_seconds'] = value
+        if not report.passed:
+            fields['message'] = report.longreprtext
+        return fields
+
+    def close(self):
+        # Interrupted runs: keep the results that never saw their teardown
+        for fields in self._pending.values():
+            self.write('test', **fields)
+        self._pending.clear()
+        self._file.close()
+
+
+def iter_events(paths):
+    """Events from several logs, one line at a time"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crashed writer
+
+
+class _PageWriter:
+    """Buffers one page of rows for a category and writes it when full"""
+
+    def __init__(self, directory, category, page_size):
+        self.directory = directory
+        self.category = category
+        self.page_size = page_size
+        self.rows = []
+        self.pages = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.page_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        self.pages += 1
+        path = os.path.join(self.directory, f"{self.category}-{self.pages}.js")
+        with open(path, 'w', encoding='utf-8') as f:
+            # JSONP-style so pages also load from file:// without fetch()
+            f.write(f"reportPage({json.dumps(self.category)}, {self.pages}, {json.dumps(self.rows)});\n")
+        self.rows = []
+
+
+def _summary_line(message):
+    """Last line of a pytest longrepr: the exception summary (file:line: Error)"""
+    return message.strip().splitlines()[-1] if message.strip() else ''
+
+
+class _JUnitWriter:
+    """Streams <testcase> elements to one temp file per phase, assembled at the end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.suites = {}
+
+    def add(self, event):
+        phase = event.get('phase', 'run')
+        suite = self.suites.get(phase)
+        if suite is None:
+            handle = tempfile.TemporaryFile('w+', encoding='utf-8')
+            suite = self.suites[phase] = {'file': handle, 'tests': 0, 'failures': 0, 'errors': 0,
+                                          'skipped': 0, 'time': 0.0}
+        module, _, name = event['nodeid'].partition('::')
+        classname = module[:-3].replace('/', '.') if module.endswith('.py') else module
+        suite['tests'] += 1
+        suite['time'] += event.get('duration', 0)
+
+        body = ''
+        message = event.get('message', '')
+        summary = _summary_line(message)
+        if event['outcome'] == 'failed':
+            suite['failures'] += 1
+            body = f"<failure message={quoteattr(summary)}>{escape(message)}</failure>"
+        elif event['outcome'] == 'error':
+            suite['errors'] += 1
+            body = f"<error message={quoteattr(summary)}>{escape(message)}</error>"
+        elif event['outcome'] == 'skipped':
+            suite['skipped'] += 1
+            body = f"<skipped message={quoteattr(summary)}/>"
+        teardown_error = event.get('teardown_error')
+        if teardown_error:
+            # A failed test whose teardown errored too: one testcase, like pytest's own junitxml
+            suite['errors'] += 1
+            body += f"<error message={quoteattr(_summary_line(teardown_error))}>{escape(teardown_error)}</error>"
+        suite['file'].write(
+            f"    <testcase classname={quoteattr(classname)} name={quoteattr(name or module)} "
+            f"time=\"{event.get('duration', 0):.3f}\">{body}</testcase>\n"
+        )
+
+    def close(self):
+        with open(self.path, 'w', encoding='utf-8') as out:
+            out.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+            for phase, suite in self.suites.items():
+                out.write(
+                    f"  <testsuite name={quoteattr(phase)} tests=\"{suite['tests']}\" "
+                    f"failures=\"{suite['failures']}\" errors=\"{suite['errors']}\" "
+                    f"skipped=\"{suite['skipped']}\" time=\"{suite['time']:.3f}\">\n"
+                )
+                suite['file'].seek(0)
+                shutil.copyfileobj(suite['file'], out)
+                suite['file'].close()
+                out.write('  </testsuite>\n')
+            out.write('</testsuites>\n')
+
+
+def render(paths, html_dir=None, junit_path=None, page_size=DEFAULT_PAGE_SIZE):
+    """Merge event logs into an HTML report and/or JUnit XML; returns the summary"""
+    pages_dir = None
+    writers = {}
+    if html_dir:
+        pages_dir = os.path.join(html_dir, 'pages')
+        shutil.rmtree(pages_dir, ignore_errors=True)
+        os.makedirs(pages_dir)
+        writers = {category: _PageWriter(pages_dir, category, page_size) for category in ('all',) + OUTCOMES}
+    junit = _JUnitWriter(junit_path) if junit_path else None
+
+    totals = dict.fromkeys(OUTCOMES, 0)
+    phases = {}
+    runs = set()
+    workers = set()
+    slowest = []
+    profile = {'spans': [], 'totals': {}}
+    duration = 0.0
+    first_ts = last_ts = None
+
+    for event in iter_events(paths):
+        ts = event.get('ts')
+        if ts is not None:
+            first_ts = ts if first_ts is None else min(first_ts, ts)
+            last_ts = ts if last_ts is None else max(last_ts, ts)
+        runs.add(event.get('run'))
+        if event.get('event') == 'slowest_phases':
+            _merge_profile(profile, event)
+            continue
+        if event.get('event') != 'test':
+            continue
+
+        outcome = event['outcome'] if event['outcome'] in totals else 'failed'
+        phase = event.get('phase', 'run')
+        totals[outcome] += 1
+        phase_totals = phases.setdefault(phase, dict.fromkeys(OUTCOMES, 0))
+        phase_totals[outcome] += 1
+        duration += event.get('duration', 0)
+        if event.get('worker'):
+            workers.add(event['worker'])
+
+        key = (event.get('duration', 0), event['nodeid'], phase)
+        if len(slowest) < SLOWEST_COUNT:
+            heapq.heappush(slowest, key)
+        else:
+            heapq.heappushpop(slowest, key)
+
+        if writers:
+            message = event.get('message', '')
+            if event.get('teardown_error'):
+                message = f"{message}\n\nteardown error:\n{event['teardown_error']}".lstrip()
+            row = [event['nodeid'], outcome, phase, event.get('worker') or '', round(event.get('duration', 0), 3),
+                   event.get('wait_seconds', ''), message]
+            writers['all'].add(row)
+            writers[outcome].add(row)
+        if junit:
+            junit.add(event)
+
+    summary = {
+        'totals': totals,
+        'phases': phases,
+        'runs': len(runs - {None}),
+        'workers': sorted(workers),
+        'test_seconds': round(duration, 2),
+        'wall_seconds': round(last_ts - first_ts, 2) if first_ts is not None else 0,
+        'slowest': [{'nodeid': n, 'phase': p, 'duration': d} for d, n, p in sorted(slowest, reverse=True)],
+        'slowest_phases': profile['spans'],
+        'phase_totals': dict(sorted(profile['totals'].items(), key=lambda kv: -kv[1])),
+    }
+
+    if junit:
+        junit.close()
+    if writers:
+        for writer in writers.values():
+            writer.flush()
+        summary['pages'] = {category: writer.pages for category, writer in writers.items()}
+        with open(os.path.join(html_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(_index_html(summary, page_size))
+    return summary
+
+
+def _merge_profile(profile, event):
+    """Fold one run's slowest profiled phases into the report's top SLOWEST_COUNT"""
+    for cat, seconds in event.get('totals', {}).items():
+        profile['totals'][cat] = profile['totals'].get(cat, 0) + seconds
+    spans = profile['spans'] + [dict(span, phase=event.get('phase', 'run')) for span in event.get('spans', [])]
+    profile['spans'] = heapq.nlargest(SLOWEST_COUNT, spans, key=lambda span: span['seconds'])
+
+
+def _slowest_phases_html(summary):
+    if not summary['slowest_phases']:
+        return ''
+    totals = ', '.join(f"{html.escape(cat)} {seconds:.1f}s" for cat, seconds in summary['phase_totals'].items())
+    rows = ''.join(
+        f"<tr><td>{span['seconds']:.2f}s</td><td>{html.escape(span['phase'])}</td><td>{html.escape(span['cat'])}</td>"
+        f"<td>{html.escape(span['name'])}</td><td>{html.escape(span['test'])}</td></tr>"
+        for span in summary['slowest_phases']
+    )
+    return (f"<h2>Slowest phases</h2>\n    <p>Totals: {totals}</p>\n    <table>\n"
+            f"        <tr><th>Duration</th><th>Phase</th><th>Category</th><th>Step</th><th>Test</th></tr>\n"
+            f"        {rows}\n    </table>")
+
+
+def _index_html(summary, page_size):
+    totals = summary['totals']
+    phase_rows = ''.join(
+        f"<tr><td>{html.escape(phase)}</td>" + ''.join(f"<td>{counts[o]}</td>" for o in OUTCOMES) + "</tr>"
+        for phase, counts in summary['phases'].items()
+    )
+    slow_rows = ''.join(
+        f"<tr><td>{row['duration']:.2f}s</td><td>{html.escape(row['phase'])}</td><td>{html.escape(row['nodeid'])}</td></tr>"
+        for row in summary['slowest']
+    )
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Demo App - Test Report</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; padding: 20px; color: #333; }}
+        h1 {{ color: #667eea; }}
+        table {{ border-collapse: collapse; margin-bottom: 20px; }}
+        th, td {{ border: 1px solid #e0e0e0; padding: 6px 10px; text-align: left; vertical-align: top; }}
+        th {{ background: #667eea; color: white; }}
+        .passed {{ color: #2e7d32; }} .failed, .error {{ color: #c62828; }} .skipped {{ color: #f9a825; }}
+        pre {{ white-space: pre-wrap; margin: 0; max-height: 300px; overflow: auto; font-size: 12px; }}
+        .controls {{ margin: 10px 0; }}
+    </style>
+</head>
+<body>
+    <h1>Test Report</h1>
+    <p>
+        <span class="passed">{totals['passed']} passed</span>,
+        <span class="failed">{totals['failed']} failed</span>,
+        <span class="error">{totals['error']} errors</span>,
+        <span class="skipped">{totals['skipped']} skipped</span>
+        - {summary['runs']} run(s), {len(summary['workers'])} worker(s),
+        {summary['test_seconds']}s of test time in {summary['wall_seconds']}s wall clock
+    </p>
+    <table>
+        <tr><th>Phase</th>{''.join(f'<th>{o}</th>' for o in OUTCOMES)}</tr>
+        {phase_rows}
+    </table>
+    <h2>Slowest tests</h2>
+    <table>
+        <tr><th>Duration</th><th>Phase</th><th>Test</th></tr>
+        {slow_rows}
+    </table>
+    {_slowest_phases_html(summary)}
+    <h2>Results</h2>
+    <div class="controls">
+        <select id="category">{''.join(f'<option value="{c}">{c}</option>' for c in ('all',) + OUTCOMES)}</select>
+        <input id="filter" placeholder="Filter this page by test name or phase">
+        <button id="prev">&laquo; Prev</button>
+        <span id="position"></span>
+        <button id="next">Next &raquo;</button>
+    </div>
+    <table>
+        <thead><tr><th>Test</th><th>Outcome</th><th>Phase</th><th>Worker</th><th>Duration (s)</th><th>Wait (s)</th><th>Details</th></tr></thead>
+        <tbody id="rows"></tbody>
+    </table>
+    <script>
+        var PAGES = {json.dumps(summary['pages'])};
+        var PAGE_SIZE = {page_size};
+        var state = {{category: 'all', page: 1, rows: []}};
+
+        function reportPage(category, page, rows) {{
+            if (category !== state.category || page !== state.page) return;
+            state.rows = rows;
+            draw();
+        }}
+
+        function load() {{
+            var total = PAGES[state.category] || 0;
+            document.getElementById('position').textContent = total ? 'page ' + state.page + ' of ' + total : 'no results';
+            state.rows = [];
+            draw();
+            if (!total) return;
+            var script = document.createElement('script');
+            script.src = 'pages/' + state.category + '-' + state.page + '.js';
+            document.body.appendChild(script);
+        }}
+
+        function draw() {{
+            var needle = document.getElementById('filter').value.toLowerCase();
+            var body = document.getElementById('rows');
+            body.textContent = '';
+            state.rows.forEach(function (row) {{
+                if (needle && (row[0] + ' ' + row[2]).toLowerCase().indexOf(needle) === -1) return;
+                var tr = document.createElement('tr');
+                row.forEach(function (value, index) {{
+                    var td = document.createElement('td');
+                    if (index === 6 && value) {{
+                        var pre = document.createElement('pre');
+                        pre.textContent = value;
+                        td.appendChild(pre);
+                    }} else {{
+                        td.textContent = value;
+                    }}
+                    if (index === 1) td.className = value;
+                    tr.appendChild(td);
+                }});
+                body.appendChild(tr);
+            }});
+        }}
+
+        document.getElementById('category').onchange = function () {{ state.category = this.value; state.page = 1; load(); }};
+        document.getElementById('filter').oninput = draw;
+        document.getElementById('prev').onclick = function () {{ if (state.page > 1) {{ state.page--; load(); }} }};
+        document.getElementById('next').onclick = function () {{
+            if (state.page < (PAGES[state.category] || 0)) {{ state.page++; load(); }}
+        }};
+        load();
+    </script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge JSONL test event logs into HTML and JUnit reports')
+    parser.add_argument('logs', nargs='+', help='Event logs written with --event-log')
+    parser.add_argument('--html', metavar='DIR', help='Write the HTML report to DIR/index.html')
+    parser.add_argument('--junit', metavar='PATH', help='Write JUnit XML to PATH')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    summary = render(args.logs, args.html, args.junit, args.page_size)
+    totals = summary['totals']
+    print(f"{totals['passed']} passed, {totals['failed']} failed, {totals['error']} errors, "
+          f"{totals['skipped']} skipped across {summary['runs']} run(s)")
+    if args.html:
+        print(f"HTML report: {os.path.join(args.html, 'index.html')}")
+    if args.junit:
+        print(f"JUnit XML: {args.junit}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Unit Tests - assets.py
+A small Flask app with an AssetPipeline over a temporary static/ folder
+"""
+
+import gzip
+
+import pytest
+from flask import Flask
+
+import assets
+
+pytestmark = pytest.mark.unit
+
+CSS = b"body { font-family: sans-serif; }\n" * 50
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    (tmp_path / 'app.css').write_bytes(CSS)
+    app = Flask(__name__)
+    pipeline = assets.AssetPipeline(str(tmp_path)).init_app(app)
+    pipeline.client = app.test_client()
+    return pipeline
+
+
+def test_url_is_content_hashed(pipeline):
+    url = pipeline.url('app.css')
+
+    assert url.startswith('/assets/app.') and url.endswith('.css')
+    response = pipeline.client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Cache-Control'] == assets.CACHE_CONTROL
+    assert gzip.decompress(response.data) == CSS
+
+
+def test_refused_coding_is_not_served():
+    asset = assets.Asset('app.css', CSS)
+    asset.variants['br'] = b"brotli bytes"
+
+    assert asset.pick("br, gzip")[0] == 'br'
+    assert asset.pick("br;q=0, gzip")[0] == 'gzip'
+    assert asset.pick("gzip;q=0") == ('identity', CSS)
+
+
+def test_missing_variant_falls_back():
+    asset = assets.Asset('app.css', CSS)
+    asset.variants.pop('br', None)
+
+    assert asset.pick("br") == ('identity', CSS)
+
+
+def test_if_none_match_is_304(pipeline):
+    url = pipeline.url('app.css')
+    etag = pipeline.client.get(url).headers['ETag']
+
+    assert pipeline.client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    assert pipeline.client.get('/assets/app.000000000000.css').status_code == 404
@@ -0,0 +1,60 @@
+"""
+Unit Tests - the batch_outcomes fixture of test_demo_app.py
+A one-session pool of fake browsers: a batch submission followed by a driver
+test in the same worker must not wait for the module to end
+"""
+
+import pytest
+
+import browser_pool
+from test_demo_app import BATCHES, batch_outcomes, driver  # noqa: F401 (fixtures under test)
+
+pytestmark = [pytest.mark.unit, pytest.mark.backend('selenium')]
+
+
+class FakeBatchDriver:
+    """Answers batch_submit's script with one outcome per payload"""
+
+    def __init__(self):
+        self.current_url = 'about:blank'
+
+    def get(self, url):
+        self.current_url = url
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, button_id, payloads):
+        return [{'blocked': 'Invalid', 'field': 'email', 'status': None, 'path': '/signup', 'flashes': []}
+                for _ in payloads]
+
+    def execute_script(self, script):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(scope='module')
+def browser_pool_session():
+    pool = browser_pool.BrowserPool(size=1, factory=FakeBatchDriver, max_rss_mb=0)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope='session')
+def base_url():
+    return 'http://demo.test'
+
+
+def test_driver_test_after_batch_gets_the_browser(batch_outcomes, browser_pool_session, request, monkeypatch):
+    monkeypatch.setattr(browser_pool, 'DEFAULT_ACQUIRE_TIMEOUT', 2)
+    outcomes = batch_outcomes("email_format")
+
+    assert set(outcomes) == {case for case, _ in BATCHES["email_format"][2]}
+    # What the next driver test in this worker does: the pool's only session must be free
+    assert request.getfixturevalue('driver') is not None
+    assert browser_pool_session.launches == 1
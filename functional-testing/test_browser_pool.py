@@ -0,0 +1,81 @@
+"""
+Unit Tests - browser_pool.py
+A fake driver stands in for Chrome, so these run without a browser
+"""
+
+import threading
+
+import pytest
+
+import browser_pool
+
+pytestmark = pytest.mark.unit
+
+
+class FakeDriver:
+    """Just enough WebDriver for BrowserPool's reset and quit"""
+
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(size=1, **kwargs):
+    return browser_pool.BrowserPool(size=size, factory=FakeDriver, max_rss_mb=0, **kwargs)
+
+
+def test_release_makes_session_reusable():
+    pool = make_pool()
+    browser = pool.acquire()
+    pool.release(browser)
+
+    assert pool.acquire() is browser
+    assert pool.launches == 1
+
+
+def test_failed_release_recycles_session():
+    pool = make_pool()
+    browser = pool.acquire()
+    pool.release(browser, failed=True)
+
+    assert browser.driver.quit_called
+    assert pool.acquire() is not browser
+    assert pool.launches == 2
+
+
+def test_acquire_timeout_names_borrowers():
+    pool = make_pool()
+    pool.acquire(borrower="test_a.py::test_holds_browser")
+
+    with pytest.raises(browser_pool.PoolExhausted, match="test_holds_browser"):
+        pool.acquire(timeout=0.05, borrower="test_a.py::test_waits")
+
+
+def test_acquire_waits_for_release():
+    pool = make_pool()
+    browser = pool.acquire(borrower="first")
+    timer = threading.Timer(0.05, pool.release, args=(browser,))
+    timer.start()
+
+    assert pool.acquire(timeout=5, borrower="second") is browser
+    timer.join()
+
+
+
+def test_measured_footprint_sizes_for_the_peak():
+    stats = [{'peak_rss_mb': 300.0, 'worker_rss_mb': 80.0},
+             {'peak_rss_mb': 500.0, 'worker_rss_mb': 90.0}]
+
+    assert browser_pool.measured_footprint(stats) == {'browser_mb': 500.0, 'worker_mb': 90.0}
+    assert browser_pool.measured_footprint([{}]) is None
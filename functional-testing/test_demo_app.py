@@ -4,18 +4,30 @@ Includes Smoke Tests (critical path) and Regression Tests (comprehensive)
 - Smoke tests: Quick sanity checks
 - Regression tests: Run in parallel with pytest-xdist
 - Data-driven tests: Using @pytest.mark.parametrize for multiple test data
-- All tests use explicit waits for professional-grade automation
+- All tests use explicit event-driven waits (waits.py), no page_source polling
+- Data-driven suites use the page fixture and can run without a browser
+  (pytest --page-backend=client)
+- Invalid-input datasets are submitted as one batch from a single page load
+  (page.submit_batch, batch_submit.py) by the module-scoped batch_outcomes
+  fixture; each case stays its own test and asserts on its cached outcome
+- Browser tests use the base_url fixture: demo_app started in each worker on
+  a free port, or an already running app with --base-url
+- Tests that create users take the app_state fixture, which removes them
+  again when the test ends, so emails need no timestamps
+- Generated validation tests run thousands of combinatorial and random
+  signup/login cases through the test client (input_generator.py)
 """
 
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+from selenium.webdriver.support.events import EventFiringWebDriver
 
-
-BASE_URL = "http://localhost:5000"
+import browser_pool
+import input_generator
+import page_driver
+import profiler
+import session_bootstrap
+import waits
 
 
 # ==================== TEST DATA ====================
@@ -77,75 +89,167 @@ EMAIL_FORMAT_DATA = [
     ("user@domain .com", "space_in_domain"),
 ]
 
+# Form field ids in the order of the signup datasets' columns
+SIGNUP_FIELDS = ("first_name", "last_name", "email", "password", "confirm_password")
+
+# Datasets submitted as one batch: (path, button id, [(test_case, payload), ...])
+BATCHES = {
+    "invalid_login": ("/login", "login-btn", [
+        (case, {"email": email, "password": password}) for email, password, case in INVALID_LOGIN_DATA
+    ]),
+    "invalid_signup": ("/signup", "signup-btn", [
+        (row[-1], dict(zip(SIGNUP_FIELDS, row[:-1]))) for row in INVALID_SIGNUP_DATA
+    ]),
+    "password_length": ("/signup", "signup-btn", [
+        (case, {"first_name": "Test", "last_name": "User", "email": "test@example.com",
+                "password": password, "confirm_password": password})
+        for password, case in PASSWORD_VALIDATION_DATA
+    ]),
+    "email_format": ("/signup", "signup-btn", [
+        (case, {"first_name": "Test", "last_name": "User", "email": email,
+                "password": "Test123!", "confirm_password": "Test123!"})
+        for email, case in EMAIL_FORMAT_DATA
+    ]),
+}
+
+# Generated validation cases: seeded batches per form (input_generator.py)
+GENERATED_BATCHES = 4
+GENERATED_BATCH_SIZE = 500
+
 
 @pytest.fixture
-def driver():
-    """Setup and teardown browser"""
-    options = webdriver.ChromeOptions()
-    options.add_argument('--start-maximized')
-    options.add_argument('--headless')  # Run in headless mode for speed
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
+def driver(request, browser_pool_session):
+    """Borrow a browser from the worker's pool and hand it back after the test"""
+    browser = browser_pool_session.acquire(timeout=browser_pool.DEFAULT_ACQUIRE_TIMEOUT, borrower=request.node.nodeid)
+
+    if profiler.enabled():
+        # Record navigation and interactions on the suite timeline
+        yield EventFiringWebDriver(browser.driver, profiler.TimelineListener())
+    else:
+        yield browser.driver
 
-    driver = webdriver.Chrome(options=options)
-    driver.implicitly_wait(5)
+    # Recycle only after a failure in a phase that had the browser: a skip
+    # during setup (e.g. app_state without the state API) leaves no rep_call
+    reports = [getattr(request.node, 'rep_' + when, None) for when in ('setup', 'call')]
+    failed = any(report is not None and report.failed for report in reports)
+    browser_pool_session.release(browser, failed=failed)
 
-    yield driver
 
-    driver.quit()
+@pytest.fixture
+def page(request):
+    """Page driver for the selected backend (--page-backend or @pytest.mark.backend)"""
+    marker = request.node.get_closest_marker('backend')
+    backend = marker.args[0] if marker else request.config.getoption('--page-backend')
+
+    if backend == 'client':
+        import demo_app
+        return page_driver.ClientPage(demo_app.app)
+    return page_driver.SeleniumPage(request.getfixturevalue('driver'), request.getfixturevalue('base_url'))
+
+
+@pytest.fixture(scope="module")
+def batch_outcomes(request):
+    """Factory: batch_outcomes(name)[test_case] is that case's outcome in BATCHES[name]
+
+    Each dataset is submitted once per module from a single page load and its
+    outcomes are cached, so the per-case tests only assert. A pooled browser
+    is borrowed for one submission at a time, never held between tests
+    """
+    marker = request.node.get_closest_marker('backend')
+    backend = marker.args[0] if marker else request.config.getoption('--page-backend')
+    cache = {}
+
+    def submit(path, button_id, payloads):
+        if backend == 'client':
+            import demo_app
+            return page_driver.ClientPage(demo_app.app).submit_batch(path, button_id, payloads)
+        pool = request.getfixturevalue('browser_pool_session')
+        browser = pool.acquire(timeout=browser_pool.DEFAULT_ACQUIRE_TIMEOUT, borrower=f"batch_outcomes {path}")
+        failed = True
+        try:
+            page = page_driver.SeleniumPage(browser.driver, request.getfixturevalue('base_url'))
+            outcomes = page.submit_batch(path, button_id, payloads)
+            failed = False
+            return outcomes
+        finally:
+            pool.release(browser, failed=failed)
+
+    def outcomes(name):
+        if name not in cache:
+            path, button_id, cases = BATCHES[name]
+            results = submit(path, button_id, [payload for _, payload in cases])
+            cache[name] = {case: outcome for (case, _), outcome in zip(cases, results)}
+        return cache[name]
+
+    return outcomes
+
+
+@pytest.fixture
+def logged_in_driver(driver, base_url):
+    """Factory: logged_in_driver(email) returns the browser already on the dashboard
+
+    The session cookie is minted from the app's secret_key, so tests that only
+    need an authenticated user skip typing credentials into the login form
+    """
+    def log_in(email=session_bootstrap.DEFAULT_EMAIL):
+        session_bootstrap.log_in(driver, base_url, email)
+        waits.wait_for_url(driver, "dashboard")
+        return driver
+
+    return log_in
 
 
 # ==================== SMOKE TESTS (Critical Path) ====================
 
 @pytest.mark.smoke
-def test_app_is_running(driver):
+def test_app_is_running(driver, base_url):
     """Smoke Test: Verify application is accessible"""
-    driver.get(BASE_URL)
+    driver.get(base_url)
     assert "Login" in driver.title or "Sign Up" in driver.title
 
 
 @pytest.mark.smoke
-def test_login_page_loads_smoke(driver):
+def test_login_page_loads_smoke(driver, base_url):
     """Smoke Test: Login page loads successfully"""
-    driver.get(f"{BASE_URL}/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
+    driver.get(f"{base_url}/login")
+    waits.wait_for_element(driver, "email")
     assert driver.find_element(By.ID, "email").is_displayed()
     assert driver.find_element(By.ID, "password").is_displayed()
     assert driver.find_element(By.ID, "login-btn").is_displayed()
 
 
 @pytest.mark.smoke
-def test_signup_page_loads_smoke(driver):
+def test_signup_page_loads_smoke(driver, base_url):
     """Smoke Test: Signup page loads successfully"""
-    driver.get(f"{BASE_URL}/signup")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "first_name")))
+    driver.get(f"{base_url}/signup")
+    waits.wait_for_element(driver, "first_name")
     assert driver.find_element(By.ID, "first_name").is_displayed()
     assert driver.find_element(By.ID, "email").is_displayed()
 
 
 @pytest.mark.smoke
-def test_valid_login_works_smoke(driver):
+def test_valid_login_works_smoke(driver, base_url):
     """Smoke Test: Valid login redirects to dashboard"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "login-btn").click()
-    WebDriverWait(driver, 10).until(EC.url_contains("dashboard"))
+    waits.wait_for_url(driver, "dashboard")
     assert "dashboard" in driver.current_url
 
 
 @pytest.mark.smoke
-def test_navigation_works_smoke(driver):
+def test_navigation_works_smoke(driver, base_url):
     """Smoke Test: Navigation between pages works"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     signup_link = driver.find_element(By.LINK_TEXT, "Sign up")
     signup_link.click()
-    WebDriverWait(driver, 10).until(EC.url_contains("signup"))
+    waits.wait_for_url(driver, "signup")
     assert "signup" in driver.current_url
 
     login_link = driver.find_element(By.LINK_TEXT, "Login")
     login_link.click()
-    WebDriverWait(driver, 10).until(EC.url_contains("login"))
+    waits.wait_for_url(driver, "login")
     assert "login" in driver.current_url
 
 
@@ -155,24 +259,12 @@ def test_navigation_works_smoke(driver):
 @pytest.mark.login
 @pytest.mark.datadriven
 @pytest.mark.parametrize("email,password,test_case", INVALID_LOGIN_DATA)
-def test_login_with_invalid_data(driver, email, password, test_case):
-    """Data-Driven: Test login with various invalid inputs"""
-    driver.get(f"{BASE_URL}/login")
-
-    if email:
-        driver.find_element(By.ID, "email").send_keys(email)
-    if password:
-        driver.find_element(By.ID, "password").send_keys(password)
-
-    driver.find_element(By.ID, "login-btn").click()
-
-    # Should stay on login page or show error
-    WebDriverWait(driver, 5).until(
-        lambda d: "login" in d.current_url or "Invalid" in d.page_source
-    )
+def test_login_with_invalid_data(batch_outcomes, email, password, test_case):
+    """Data-Driven: Test login with various invalid inputs (whole dataset from one page load)"""
+    outcome = batch_outcomes("invalid_login")[test_case]
 
     # Verify we didn't reach dashboard
-    assert "dashboard" not in driver.current_url, f"Login should fail for {test_case}"
+    assert "dashboard" not in outcome['path'], f"Login should fail for {test_case}"
 
 
 # ==================== DATA-DRIVEN TESTS - SIGNUP ====================
@@ -181,59 +273,39 @@ def test_login_with_invalid_data(driver, email, password, test_case):
 @pytest.mark.signup
 @pytest.mark.datadriven
 @pytest.mark.parametrize("first_name,last_name,email,password,confirm_password,test_case", INVALID_SIGNUP_DATA)
-def test_signup_with_invalid_data(driver, first_name, last_name, email, password, confirm_password, test_case):
-    """Data-Driven: Test signup with various invalid inputs"""
-    driver.get(f"{BASE_URL}/signup")
-
-    if first_name:
-        driver.find_element(By.ID, "first_name").send_keys(first_name)
-    if last_name:
-        driver.find_element(By.ID, "last_name").send_keys(last_name)
-    if email:
-        driver.find_element(By.ID, "email").send_keys(email)
-    if password:
-        driver.find_element(By.ID, "password").send_keys(password)
-    if confirm_password:
-        driver.find_element(By.ID, "confirm_password").send_keys(confirm_password)
-
-    driver.find_element(By.ID, "signup-btn").click()
-
-    # Should stay on signup page or show error
-    WebDriverWait(driver, 10).until(
-        lambda d: "signup" in d.current_url or "already registered" in d.page_source.lower()
-        or "do not match" in d.page_source.lower() or "at least 6" in d.page_source.lower()
-    )
+def test_signup_with_invalid_data(batch_outcomes, first_name, last_name, email, password, confirm_password,
+                                  test_case):
+    """Data-Driven: Test signup with various invalid inputs (whole dataset from one page load)"""
+    outcome = batch_outcomes("invalid_signup")[test_case]
 
-    # Verify we didn't reach login page with success
-    if "login" in driver.current_url:
-        assert "Account created successfully" not in driver.page_source, f"Signup should fail for {test_case}"
+    # Verify the signup was not accepted
+    flashes = [text for _, text in outcome['flashes']]
+    assert not any("Account created successfully" in text for text in flashes), f"Signup should fail for {test_case}"
 
 
 @pytest.mark.regression
 @pytest.mark.signup
 @pytest.mark.datadriven
 @pytest.mark.parametrize("first_name,last_name,password,test_case", VALID_SIGNUP_DATA)
-def test_signup_with_valid_data_multiple(driver, first_name, last_name, password, test_case):
+def test_signup_with_valid_data_multiple(page, app_state, first_name, last_name, password, test_case):
     """Data-Driven: Test signup with multiple valid user data"""
-    driver.get(f"{BASE_URL}/signup")
+    page.open("/signup")
 
-    timestamp = str(int(time.time() * 1000))  # More unique timestamp
-    email = f"{first_name.lower()}.{last_name.lower()}.{timestamp}@example.com"
+    # app_state removes the account afterwards, so the same email works on every run
+    email = f"{first_name.lower()}.{last_name.lower()}@example.com"
 
-    driver.find_element(By.ID, "first_name").send_keys(first_name)
-    driver.find_element(By.ID, "last_name").send_keys(last_name)
-    driver.find_element(By.ID, "email").send_keys(email)
-    driver.find_element(By.ID, "password").send_keys(password)
-    driver.find_element(By.ID, "confirm_password").send_keys(password)
-    driver.find_element(By.ID, "signup-btn").click()
+    page.fill("first_name", first_name)
+    page.fill("last_name", last_name)
+    page.fill("email", email)
+    page.fill("password", password)
+    page.fill("confirm_password", password)
+    page.submit("signup-btn")
 
-    WebDriverWait(driver, 10).until(EC.url_contains("login"))
-    WebDriverWait(driver, 5).until(
-        lambda d: "Account created successfully" in d.page_source
-    )
+    page.wait_for_url("login")
+    page.wait_for_flash("Account created successfully", timeout=5)
 
-    assert "login" in driver.current_url, f"Signup should succeed for {test_case}"
-    assert "Account created successfully" in driver.page_source
+    assert "login" in page.url, f"Signup should succeed for {test_case}"
+    assert "Account created successfully" in page.source
 
 
 @pytest.mark.regression
@@ -241,22 +313,12 @@ def test_signup_with_valid_data_multiple(driver, first_name, last_name, password
 @pytest.mark.datadriven
 @pytest.mark.validation
 @pytest.mark.parametrize("password,test_case", PASSWORD_VALIDATION_DATA)
-def test_signup_password_length_validation(driver, password, test_case):
-    """Data-Driven: Test password length validation with various short passwords"""
-    driver.get(f"{BASE_URL}/signup")
-
-    driver.find_element(By.ID, "first_name").send_keys("Test")
-    driver.find_element(By.ID, "last_name").send_keys("User")
-    driver.find_element(By.ID, "email").send_keys("test@example.com")
-    driver.find_element(By.ID, "password").send_keys(password)
-    driver.find_element(By.ID, "confirm_password").send_keys(password)
-    driver.find_element(By.ID, "signup-btn").click()
+def test_signup_password_length_validation(batch_outcomes, password, test_case):
+    """Data-Driven: Test password length validation with various short passwords (one page load)"""
+    outcome = batch_outcomes("password_length")[test_case]
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "at least 6 characters" in d.page_source
-    )
-
-    assert "at least 6 characters" in driver.page_source, f"Should show error for {test_case}"
+    flashes = [text for _, text in outcome['flashes']]
+    assert any("at least 6 characters" in text for text in flashes), f"Should show error for {test_case}"
 
 
 @pytest.mark.regression
@@ -264,31 +326,50 @@ def test_signup_password_length_validation(driver, password, test_case):
 @pytest.mark.datadriven
 @pytest.mark.validation
 @pytest.mark.parametrize("email,test_case", EMAIL_FORMAT_DATA)
-def test_signup_email_format_validation(driver, email, test_case):
-    """Data-Driven: Test email format validation with various invalid formats"""
-    driver.get(f"{BASE_URL}/signup")
-
-    driver.find_element(By.ID, "first_name").send_keys("Test")
-    driver.find_element(By.ID, "last_name").send_keys("User")
-    driver.find_element(By.ID, "email").send_keys(email)
-    driver.find_element(By.ID, "password").send_keys("Test123!")
-    driver.find_element(By.ID, "confirm_password").send_keys("Test123!")
-    driver.find_element(By.ID, "signup-btn").click()
+def test_signup_email_format_validation(batch_outcomes, email, test_case):
+    """Data-Driven: Test email format validation with various invalid formats (one page load)"""
+    outcome = batch_outcomes("email_format")[test_case]
 
     # Should stay on signup page (HTML5 validation or server-side)
-    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, "email")))
+    assert "signup" in outcome['path'], f"Should reject invalid email for {test_case}"
+
+
+# ==================== GENERATED VALIDATION TESTS ====================
+# Cases from input_generator.py, posted through the Flask test client in
+# batches and checked against a model of the validation rules
+
+@pytest.mark.regression
+@pytest.mark.datadriven
+@pytest.mark.validation
+@pytest.mark.parametrize("form", ["signup", "login"])
+def test_generated_validation_pairwise(form):
+    """Data-Driven: every pair of input classes behaves as the validation model predicts"""
+    result = input_generator.run_batches(form, input_generator.n_wise_cases(form, strength=2))
+
+    assert not result['mismatches'], input_generator.describe(result['mismatches'])
+
+
+@pytest.mark.regression
+@pytest.mark.datadriven
+@pytest.mark.validation
+@pytest.mark.parametrize("form", ["signup", "login"])
+@pytest.mark.parametrize("seed", range(GENERATED_BATCHES))
+def test_generated_validation_random(form, seed):
+    """Data-Driven: a batch of seeded random cases (one batch per test, so xdist spreads them)"""
+    cases = input_generator.random_cases(form, GENERATED_BATCH_SIZE, seed)
+    result = input_generator.run_batches(form, cases, batch_size=GENERATED_BATCH_SIZE, shrink_failures=True)
 
-    assert "signup" in driver.current_url, f"Should reject invalid email for {test_case}"
+    assert not result['mismatches'], input_generator.describe(result['mismatches'])
 
 
 # ==================== REGRESSION TESTS - LOGIN ====================
 
 @pytest.mark.regression
 @pytest.mark.login
-def test_login_page_loads(driver):
+def test_login_page_loads(driver, base_url):
     """Regression: Verify all login page elements are present"""
-    driver.get(f"{BASE_URL}/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
+    driver.get(f"{base_url}/login")
+    waits.wait_for_element(driver, "email")
 
     assert "Login" in driver.title
     assert driver.find_element(By.ID, "email").is_displayed()
@@ -299,14 +380,14 @@ def test_login_page_loads(driver):
 
 @pytest.mark.regression
 @pytest.mark.login
-def test_login_with_valid_credentials(driver):
+def test_login_with_valid_credentials(driver, base_url):
     """Regression: Login with correct credentials"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "login-btn").click()
 
-    WebDriverWait(driver, 10).until(EC.url_contains("dashboard"))
+    waits.wait_for_url(driver, "dashboard")
     assert "dashboard" in driver.current_url
     assert "Welcome" in driver.page_source
 
@@ -314,58 +395,54 @@ def test_login_with_valid_credentials(driver):
 @pytest.mark.regression
 @pytest.mark.login
 @pytest.mark.validation
-def test_login_with_empty_email(driver):
+def test_login_with_empty_email(driver, base_url):
     """Regression: Login fails with empty email"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "login-btn").click()
 
-    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, "email")))
+    waits.wait_for_element(driver, "email", timeout=5)
     assert "login" in driver.current_url
 
 
 @pytest.mark.regression
 @pytest.mark.login
 @pytest.mark.validation
-def test_login_with_empty_password(driver):
+def test_login_with_empty_password(driver, base_url):
     """Regression: Login fails with empty password"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
     driver.find_element(By.ID, "login-btn").click()
 
-    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, "password")))
+    waits.wait_for_element(driver, "password", timeout=5)
     assert "login" in driver.current_url
 
 
 @pytest.mark.regression
 @pytest.mark.login
 @pytest.mark.validation
-def test_login_with_wrong_password(driver):
+def test_login_with_wrong_password(driver, base_url):
     """Regression: Login fails with incorrect password"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
     driver.find_element(By.ID, "password").send_keys("WrongPassword123")
     driver.find_element(By.ID, "login-btn").click()
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "Invalid email or password" in d.page_source
-    )
+    waits.wait_for_flash(driver, "Invalid email or password")
     assert "Invalid email or password" in driver.page_source
 
 
 @pytest.mark.regression
 @pytest.mark.login
 @pytest.mark.validation
-def test_login_with_unregistered_email(driver):
+def test_login_with_unregistered_email(driver, base_url):
     """Regression: Login fails with non-existent email"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     driver.find_element(By.ID, "email").send_keys("nonexistent@example.com")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "login-btn").click()
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "Invalid email or password" in d.page_source
-    )
+    waits.wait_for_flash(driver, "Invalid email or password")
     assert "Invalid email or password" in driver.page_source
 
 
@@ -373,10 +450,10 @@ def test_login_with_unregistered_email(driver):
 
 @pytest.mark.regression
 @pytest.mark.signup
-def test_signup_page_loads(driver):
+def test_signup_page_loads(driver, base_url):
     """Regression: Verify all signup page elements are present"""
-    driver.get(f"{BASE_URL}/signup")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "first_name")))
+    driver.get(f"{base_url}/signup")
+    waits.wait_for_element(driver, "first_name")
 
     assert "Sign Up" in driver.title
     assert driver.find_element(By.ID, "first_name").is_displayed()
@@ -389,22 +466,19 @@ def test_signup_page_loads(driver):
 
 @pytest.mark.regression
 @pytest.mark.signup
-def test_signup_with_valid_data(driver):
+def test_signup_with_valid_data(driver, base_url, app_state):
     """Regression: Signup with valid information"""
-    driver.get(f"{BASE_URL}/signup")
-    timestamp = str(int(time.time()))
+    driver.get(f"{base_url}/signup")
 
     driver.find_element(By.ID, "first_name").send_keys("John")
     driver.find_element(By.ID, "last_name").send_keys("Doe")
-    driver.find_element(By.ID, "email").send_keys(f"john{timestamp}@example.com")
+    driver.find_element(By.ID, "email").send_keys("john.doe@example.com")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "confirm_password").send_keys("Test123!")
     driver.find_element(By.ID, "signup-btn").click()
 
-    WebDriverWait(driver, 10).until(EC.url_contains("login"))
-    WebDriverWait(driver, 5).until(
-        lambda d: "Account created successfully" in d.page_source
-    )
+    waits.wait_for_url(driver, "login")
+    waits.wait_for_flash(driver, "Account created successfully", timeout=5)
     assert "login" in driver.current_url
     assert "Account created successfully" in driver.page_source
 
@@ -412,25 +486,25 @@ def test_signup_with_valid_data(driver):
 @pytest.mark.regression
 @pytest.mark.signup
 @pytest.mark.validation
-def test_signup_with_empty_first_name(driver):
+def test_signup_with_empty_first_name(driver, base_url):
     """Regression: Signup fails with empty first name"""
-    driver.get(f"{BASE_URL}/signup")
+    driver.get(f"{base_url}/signup")
     driver.find_element(By.ID, "last_name").send_keys("Doe")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
     driver.find_element(By.ID, "password").send_keys("Test123!")
     driver.find_element(By.ID, "confirm_password").send_keys("Test123!")
     driver.find_element(By.ID, "signup-btn").click()
 
-    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, "first_name")))
+    waits.wait_for_element(driver, "first_name", timeout=5)
     assert "signup" in driver.current_url
 
 
 @pytest.mark.regression
 @pytest.mark.signup
 @pytest.mark.validation
-def test_signup_with_short_password(driver):
+def test_signup_with_short_password(driver, base_url):
     """Regression: Signup fails with password < 6 characters"""
-    driver.get(f"{BASE_URL}/signup")
+    driver.get(f"{base_url}/signup")
     driver.find_element(By.ID, "first_name").send_keys("John")
     driver.find_element(By.ID, "last_name").send_keys("Doe")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
@@ -438,18 +512,16 @@ def test_signup_with_short_password(driver):
     driver.find_element(By.ID, "confirm_password").send_keys("123")
     driver.find_element(By.ID, "signup-btn").click()
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "at least 6 characters" in d.page_source
-    )
+    waits.wait_for_flash(driver, "at least 6 characters")
     assert "at least 6 characters" in driver.page_source
 
 
 @pytest.mark.regression
 @pytest.mark.signup
 @pytest.mark.validation
-def test_signup_with_mismatched_passwords(driver):
+def test_signup_with_mismatched_passwords(driver, base_url):
     """Regression: Signup fails when passwords don't match"""
-    driver.get(f"{BASE_URL}/signup")
+    driver.get(f"{base_url}/signup")
     driver.find_element(By.ID, "first_name").send_keys("John")
     driver.find_element(By.ID, "last_name").send_keys("Doe")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
@@ -457,18 +529,16 @@ def test_signup_with_mismatched_passwords(driver):
     driver.find_element(By.ID, "confirm_password").send_keys("Different123!")
     driver.find_element(By.ID, "signup-btn").click()
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "Passwords do not match" in d.page_source
-    )
+    waits.wait_for_flash(driver, "Passwords do not match")
     assert "Passwords do not match" in driver.page_source
 
 
 @pytest.mark.regression
 @pytest.mark.signup
 @pytest.mark.validation
-def test_signup_with_existing_email(driver):
+def test_signup_with_existing_email(driver, base_url):
     """Regression: Signup fails with already registered email"""
-    driver.get(f"{BASE_URL}/signup")
+    driver.get(f"{base_url}/signup")
     driver.find_element(By.ID, "first_name").send_keys("John")
     driver.find_element(By.ID, "last_name").send_keys("Doe")
     driver.find_element(By.ID, "email").send_keys("test@example.com")
@@ -476,9 +546,7 @@ def test_signup_with_existing_email(driver):
     driver.find_element(By.ID, "confirm_password").send_keys("Test123!")
     driver.find_element(By.ID, "signup-btn").click()
 
-    WebDriverWait(driver, 10).until(
-        lambda d: "Email already registered" in d.page_source
-    )
+    waits.wait_for_flash(driver, "Email already registered")
     assert "Email already registered" in driver.page_source
 
 
@@ -486,38 +554,34 @@ def test_signup_with_existing_email(driver):
 
 @pytest.mark.regression
 @pytest.mark.navigation
-def test_navigation_login_to_signup(driver):
+def test_navigation_login_to_signup(driver, base_url):
     """Regression: Navigate from login to signup page"""
-    driver.get(f"{BASE_URL}/login")
+    driver.get(f"{base_url}/login")
     signup_link = driver.find_element(By.LINK_TEXT, "Sign up")
     signup_link.click()
 
-    WebDriverWait(driver, 10).until(EC.url_contains("signup"))
+    waits.wait_for_url(driver, "signup")
     assert "signup" in driver.current_url
 
 
 @pytest.mark.regression
 @pytest.mark.navigation
-def test_navigation_signup_to_login(driver):
+def test_navigation_signup_to_login(driver, base_url):
     """Regression: Navigate from signup to login page"""
-    driver.get(f"{BASE_URL}/signup")
+    driver.get(f"{base_url}/signup")
     login_link = driver.find_element(By.LINK_TEXT, "Login")
     login_link.click()
 
-    WebDriverWait(driver, 10).until(EC.url_contains("login"))
+    waits.wait_for_url(driver, "login")
     assert "login" in driver.current_url
 
 
 @pytest.mark.regression
 @pytest.mark.navigation
-def test_dashboard_accessible_after_login(driver):
-    """Regression: Dashboard is accessible after successful login"""
-    driver.get(f"{BASE_URL}/login")
-    driver.find_element(By.ID, "email").send_keys("test@example.com")
-    driver.find_element(By.ID, "password").send_keys("Test123!")
-    driver.find_element(By.ID, "login-btn").click()
+def test_dashboard_accessible_after_login(logged_in_driver):
+    """Regression: Dashboard is accessible to a logged-in user"""
+    driver = logged_in_driver("test@example.com")
 
-    WebDriverWait(driver, 10).until(EC.url_contains("dashboard"))
     assert "dashboard" in driver.current_url
     assert "Welcome" in driver.page_source
 
@@ -533,7 +597,7 @@ if __name__ == "__main__":
     pytest.main([
         __file__,
         "-v",
-        "-n", "4",  # Run tests in parallel with 4 workers
+        "-n", "auto",  # As many workers as CPUs and memory allow (conftest.py)
         "--html=demo_app_test_report.html",
         "--self-contained-html",
         "--css=assets/style.css"
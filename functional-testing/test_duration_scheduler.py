@@ -0,0 +1,83 @@
+"""
+Unit Tests - duration_scheduler.py
+The scheduler runs against fake xdist nodes, so no workers are started
+"""
+
+import pytest
+
+import duration_scheduler
+
+pytestmark = pytest.mark.unit
+
+
+def test_estimates_prefer_recorded_then_marker_average():
+    durations = {
+        "t.py::test_slow_smoke": {'seconds': 6.0, 'markers': ['smoke']},
+        "t.py::test_fast_smoke": {'seconds': 2.0, 'markers': ['smoke']},
+        "t.py::test_unit": {'seconds': 0.5, 'markers': ['unit']},
+    }
+    tests = {
+        "t.py::test_slow_smoke": ['smoke'],
+        "t.py::test_new_smoke_unit": ['smoke', 'unit'],
+        "t.py::test_new_plain": [],
+    }
+
+    estimates = duration_scheduler.estimate_durations(durations, tests)
+
+    assert estimates == {"t.py::test_slow_smoke": 6.0, "t.py::test_new_smoke_unit": 4.0,
+                         "t.py::test_new_plain": pytest.approx(8.5 / 3)}
+    assert duration_scheduler.estimate_durations({}, {"t.py::a": []}) == {"t.py::a": duration_scheduler.DEFAULT_ESTIMATE}
+
+
+def test_interleave_gives_each_worker_a_long_and_a_next_longest():
+    assert duration_scheduler.interleave(list("abcdefg"), 3) == list("adbecfg")
+    assert duration_scheduler.interleave(list("ab"), 3) == list("ab")
+
+
+class FakeScheduler:
+    def __init__(self, collection, estimates, workers):
+        self.collection = collection
+        self._estimates = estimates
+        self.nodes = [object() for _ in range(workers)]
+
+
+def test_lpt_order_is_longest_first_and_stable():
+    collection = ["t.py::a", "t.py::b", "t.py::c", "t.py::d", "t.py::e"]
+    scheduler = FakeScheduler(collection, {"t.py::a": 1.0, "t.py::b": 5.0, "t.py::c": 3.0, "t.py::d": 3.0}, 1)
+
+    order = duration_scheduler.lpt_order(scheduler, range(len(collection)))
+
+    assert [collection[i] for i in order] == ["t.py::b", "t.py::c", "t.py::d", "t.py::a", "t.py::e"]
+
+
+class FakeNode:
+    def __init__(self):
+        self.shutting_down = False
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+@pytest.mark.skipif(duration_scheduler.LoadScheduling is object, reason="needs pytest-xdist")
+def test_workers_hold_exactly_two_tests():
+    scheduler = duration_scheduler.LptScheduling.__new__(duration_scheduler.LptScheduling)
+    node = FakeNode()
+    scheduler.node2pending = {node: []}
+    scheduler.pending = list(range(100))
+
+    def send(node, count):
+        items, scheduler.pending[:] = scheduler.pending[:count], scheduler.pending[count:]
+        scheduler.node2pending[node].extend(items)
+    scheduler._send_tests = send
+
+    scheduler.check_schedule(node)
+    assert scheduler.node2pending[node] == [0, 1]
+
+    for _ in range(3):
+        scheduler.node2pending[node].pop(0)
+        scheduler.check_schedule(node, duration=0.01)
+        assert len(scheduler.node2pending[node]) == duration_scheduler.IN_HAND
+
+    scheduler.pending.clear()
+    scheduler.check_schedule(node)
+    assert node.shutting_down
@@ -0,0 +1,109 @@
+"""
+Unit Tests - impact.py
+A throwaway git repository stands in for the app root, so `git diff` sees
+exactly the change each test makes
+"""
+
+import subprocess
+
+import pytest
+
+import impact
+
+pytestmark = pytest.mark.unit
+
+APP = """import os
+
+def login():
+    return 'login'
+
+def signup():
+    return 'signup'
+"""
+
+
+def git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text(APP)
+    (tmp_path / "helpers.py").write_text("HELP = 1\n")
+    (tmp_path / "test_app.py").write_text("import app\nimport helpers\n")
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "login.html").write_text("<h1>Login</h1>\n")
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+    monkeypatch.setattr(impact, 'ROOT', str(tmp_path))
+    return tmp_path
+
+
+def impact_map(repo, hashes=None):
+    app_hash = hashes or impact.working_tree_hash("app.py")
+    return {'tests': {
+        "test_app.py::test_login": {'files': {'app.py': [4]}, 'hashes': {'app.py': app_hash}},
+        "test_app.py::test_signup": {'files': {'app.py': [7]}, 'hashes': {'app.py': app_hash}},
+        "test_app.py::test_page": {'files': {'templates/login.html': [0]}, 'hashes': {}},
+    }}
+
+
+def edit(path, old, new):
+    path.write_text(path.read_text().replace(old, new))
+
+
+def test_changed_lines_on_the_ref_side(repo):
+    edit(repo / "app.py", "return 'login'", "return 'log in'")
+    edit(repo / "app.py", "def signup():", "def signup():\n    pass")
+
+    assert impact.changed_lines('HEAD') == {'app.py': {4, 6, 7}}
+
+
+def test_function_body_change_selects_its_tests(repo):
+    plan_map = impact_map(repo)
+    edit(repo / "app.py", "return 'login'", "return 'log in'")
+
+    plan = impact.plan_selection(plan_map, 'HEAD')
+
+    assert plan['full'] is None
+    assert plan['affected'] == {"test_app.py::test_login"}
+
+
+def test_template_change_selects_tests_that_rendered_it(repo):
+    plan_map = impact_map(repo)
+    edit(repo / "templates" / "login.html", "Login", "Log in")
+
+    plan = impact.plan_selection(plan_map, 'HEAD')
+
+    assert plan['affected'] == {"test_app.py::test_page"}
+
+
+def test_import_time_change_runs_everything(repo):
+    plan_map = impact_map(repo)
+    edit(repo / "app.py", "import os", "import sys")
+
+    assert "outside a function" in impact.plan_selection(plan_map, 'HEAD')['full']
+
+
+def test_untraced_suite_module_change_runs_everything(repo):
+    plan_map = impact_map(repo)
+    edit(repo / "helpers.py", "HELP = 1", "HELP = 2")
+
+    assert "helpers.py changed" in impact.plan_selection(plan_map, 'HEAD')['full']
+
+
+def test_stale_map_runs_everything(repo):
+    plan = impact.plan_selection(impact_map(repo, hashes="recorded-against-other-contents"), 'HEAD')
+
+    assert plan['stale'] == {"test_app.py::test_login", "test_app.py::test_signup"}
+    assert plan['full'].startswith("2 test(s) recorded against other file contents")
+
+
+def test_no_map_runs_everything(repo):
+    assert "no impact map" in impact.plan_selection({}, 'HEAD')['full']
+
+
+def test_function_body_lines():
+    assert impact.function_body_lines(APP) == {4, 7}
@@ -0,0 +1,104 @@
+"""
+Unit Tests - middleware.py
+A small Flask app with ResponseOptimizer, driven through the test client
+"""
+
+import gzip
+
+import pytest
+from flask import Flask, flash
+
+import middleware
+
+pytestmark = pytest.mark.unit
+
+PAGE = "<html><body>" + "Demo App login page " * 100 + "</body></html>"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.secret_key = "unit-test"
+    middleware.ResponseOptimizer(app)
+
+    @app.route('/page')
+    def page():
+        return PAGE
+
+    @app.route('/tiny')
+    def tiny():
+        return "<p>hi</p>"
+
+    @app.route('/flashed')
+    def flashed():
+        flash("Account created successfully!", "success")
+        return PAGE
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip", "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0.5, identity", "gzip"),
+    ("GZIP", "gzip"),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=bogus", None),
+])
+def test_negotiate_encoding(header, expected, monkeypatch):
+    monkeypatch.setattr(middleware, 'brotli', None)
+    assert middleware.negotiate_encoding(header) == expected
+
+
+def test_brotli_refused_with_q_zero(monkeypatch):
+    monkeypatch.setattr(middleware, 'brotli', object())
+    assert middleware.negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert middleware.negotiate_encoding("br, gzip") == "br"
+
+
+def test_page_is_gzipped(client, monkeypatch):
+    monkeypatch.setattr(middleware, 'brotli', None)
+    response = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data).decode() == PAGE
+
+
+def test_small_page_is_not_compressed(client):
+    response = client.get('/tiny', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_etag_is_strong_and_differs_per_encoding(client, monkeypatch):
+    monkeypatch.setattr(middleware, 'brotli', None)
+    plain = client.get('/page', headers={'Accept-Encoding': 'identity'})
+    gzipped = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+
+    plain_tag, plain_weak = plain.get_etag()
+    gzip_tag, gzip_weak = gzipped.get_etag()
+    assert plain_tag and gzip_tag
+    assert not plain_weak and not gzip_weak
+    assert plain_tag != gzip_tag
+
+
+def test_matching_if_none_match_gets_304(client, monkeypatch):
+    monkeypatch.setattr(middleware, 'brotli', None)
+    first = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+
+    again = client.get('/page', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    other_coding = client.get('/page', headers={'Accept-Encoding': 'identity',
+                                                  'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 304
+    assert again.data == b''
+    assert other_coding.status_code == 200
+
+
+def test_page_with_flash_messages_gets_no_etag(client):
+    response = client.get('/flashed')
+
+    assert response.get_etag() == (None, None)
@@ -0,0 +1,67 @@
+"""
+Unit Tests - passwords.py
+Hashers use the 'test' cost preset so every check stays fast
+"""
+
+import pytest
+
+import passwords
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def hasher():
+    hasher = passwords.PasswordHasher(iterations=passwords.COST_PRESETS['test'], workers=1)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_verifies_only_its_password(hasher):
+    encoded = hasher.hash("Test123!")
+
+    assert encoded.startswith(f"{passwords.ALGORITHM}$1000$")
+    assert hasher.verify("Test123!", encoded)
+    assert not hasher.verify("test123!", encoded)
+
+
+def test_hashes_are_salted(hasher):
+    assert hasher.hash("Test123!") != hasher.hash("Test123!")
+
+
+def test_stored_iterations_win_over_the_hasher_cost(hasher):
+    stronger = passwords.PasswordHasher(iterations=2_000, workers=1)
+    encoded = stronger.hash("Test123!")
+    stronger.shutdown()
+
+    assert hasher.verify("Test123!", encoded)
+
+
+@pytest.mark.parametrize("encoded", [None, "", "not-a-hash", "md5$1$c2FsdA$ZGlnZXN0"])
+def test_unknown_user_or_malformed_hash_fails(hasher, encoded):
+    assert not hasher.verify("Test123!", encoded)
+
+
+def test_saturated_pool_raises_busy(hasher, monkeypatch):
+    monkeypatch.setattr(passwords, 'ADMISSION_TIMEOUT', 0.01)
+    slots = hasher.workers * (1 + passwords.PENDING_PER_WORKER)
+    for _ in range(slots):
+        hasher._slots.acquire()
+
+    with pytest.raises(passwords.HashingBusy):
+        hasher.hash("Test123!")
+
+    for _ in range(slots):
+        hasher._slots.release()
+    assert hasher.verify("Test123!", hasher.hash("Test123!"))
+
+
+@pytest.mark.parametrize("cost,iterations", [("test", 1_000), ("production", 600_000), ("5000", 5_000), (42, 42)])
+def test_resolve_cost(cost, iterations):
+    assert passwords.resolve_cost(cost) == iterations
+
+
+@pytest.mark.parametrize("cost", ["0", "-3", "fast"])
+def test_resolve_cost_rejects_invalid(cost):
+    with pytest.raises(ValueError):
+        passwords.resolve_cost(cost)
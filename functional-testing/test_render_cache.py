@@ -0,0 +1,88 @@
+"""
+Unit Tests - render_cache.py
+Templates are written to a temporary folder so a test can change them
+"""
+
+import os
+
+import pytest
+from flask import Flask, flash, session
+
+import render_cache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def app(tmp_path):
+    (tmp_path / "login.html").write_text("<h1>Login</h1>")
+    (tmp_path / "signup.html").write_text("<h1>Signup</h1>")
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.secret_key = "unit-test"
+    app.config['RENDER_CACHE'] = True
+    return app
+
+
+def render(app, cache, name, **context):
+    with app.test_request_context('/'):
+        return cache.render(name, **context)
+
+
+def test_second_render_is_a_hit(app):
+    cache = render_cache.RenderCache(app)
+
+    first = render(app, cache, "login.html")
+    second = render(app, cache, "login.html")
+
+    assert first == second == "<h1>Login</h1>"
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_context_flashes_and_login_render_dynamically(app):
+    cache = render_cache.RenderCache(app)
+
+    render(app, cache, "login.html", user="x")
+    with app.test_request_context('/'):
+        flash("Please login first", "error")
+        cache.render("login.html")
+    with app.test_request_context('/'):
+        session['user'] = "test@example.com"
+        cache.render("login.html")
+
+    assert cache.dynamic == 3
+    assert cache.stats()['entries'] == 0
+
+
+def test_changed_template_is_rendered_again(app, tmp_path):
+    cache = render_cache.RenderCache(app)
+    render(app, cache, "login.html")
+
+    path = tmp_path / "login.html"
+    path.write_text("<h1>New login</h1>")
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    app.jinja_env.cache.clear()
+
+    assert render(app, cache, "login.html") == "<h1>New login</h1>"
+    assert cache.misses == 2
+
+
+def test_least_recently_used_entry_is_evicted(app):
+    cache = render_cache.RenderCache(app, max_entries=1)
+
+    render(app, cache, "login.html")
+    render(app, cache, "signup.html")
+    render(app, cache, "login.html")
+
+    assert cache.evictions == 2
+    assert cache.hits == 0
+
+
+def test_disabled_cache_always_renders(app):
+    app.config['RENDER_CACHE'] = False
+    cache = render_cache.RenderCache(app)
+
+    render(app, cache, "login.html")
+    render(app, cache, "login.html")
+
+    assert cache.stats() == {'enabled': False, 'entries': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'dynamic': 2}
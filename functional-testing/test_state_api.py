@@ -0,0 +1,99 @@
+"""
+Unit Tests - demo_app's test-only state API (snapshot_state / restore_state)
+Driven through the Flask test client; every snapshot a test opens is restored
+"""
+
+import pytest
+
+import demo_app
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(demo_app.app.config, 'LOGIN_THROTTLE', True)
+    monkeypatch.setitem(demo_app.app.config, 'TEST_STATE_API', True)
+    # Roomy per-client bucket, small slow per-email bucket: only the email limit bites
+    monkeypatch.setitem(demo_app.app.config, 'LOGIN_THROTTLE_CLIENT', (1000, 1.0))
+    monkeypatch.setitem(demo_app.app.config, 'LOGIN_THROTTLE_EMAIL', (3, 0.01))
+    demo_app.throttle.reset()
+    yield demo_app.app.test_client()
+    monkeypatch.undo()
+    demo_app.throttle.reset()
+
+
+def sign_up(client, email, headers=None):
+    return client.post('/signup', headers=headers, data={
+        'first_name': "Test", 'last_name': "User", 'email': email,
+        'password': "Test123!", 'confirm_password': "Test123!",
+    })
+
+
+def fail_login(client, email, headers=None):
+    return client.post('/login', headers=headers, data={'email': email, 'password': "wrong-password"})
+
+
+def test_restore_removes_only_the_snapshots_own_users(client):
+    outer = demo_app.snapshot_state()
+    sign_up(client, "outer@example.com")
+    inner = demo_app.snapshot_state()
+    sign_up(client, "inner@example.com")
+
+    demo_app.restore_state(inner)
+    assert "inner@example.com" not in demo_app.users_db
+    assert "outer@example.com" in demo_app.users_db
+
+    demo_app.restore_state(outer)
+    assert "outer@example.com" not in demo_app.users_db
+    assert "test@example.com" in demo_app.users_db
+
+
+def test_rejected_signup_is_not_rolled_back(client):
+    snapshot = demo_app.snapshot_state()
+    sign_up(client, "test@example.com")
+
+    demo_app.restore_state(snapshot)
+
+    assert "test@example.com" in demo_app.users_db
+
+
+def test_header_snapshots_are_isolated_from_each_other(client):
+    first = client.post('/_test/snapshot').get_json()
+    second = client.post('/_test/snapshot').get_json()
+    sign_up(client, "first@example.com", {first['header']: str(first['snapshot'])})
+    sign_up(client, "second@example.com", {second['header']: str(second['snapshot'])})
+
+    response = client.post(f"/_test/restore/{first['snapshot']}")
+
+    assert response.status_code == 200
+    assert "first@example.com" not in demo_app.users_db
+    assert "second@example.com" in demo_app.users_db
+    client.post(f"/_test/restore/{second['snapshot']}")
+    assert "second@example.com" not in demo_app.users_db
+
+
+def test_restore_refunds_only_the_snapshots_throttle_charges(client):
+    burst = demo_app.app.config['LOGIN_THROTTLE_EMAIL'][0]
+    snapshot = client.post('/_test/snapshot').get_json()
+    headers = {snapshot['header']: str(snapshot['snapshot'])}
+    for _ in range(burst):
+        fail_login(client, "locked@example.com", headers)
+    for _ in range(burst):
+        fail_login(client, "other@example.com")
+
+    client.post(f"/_test/restore/{snapshot['snapshot']}")
+
+    assert demo_app.throttle.emails.has_tokens("locked@example.com")
+    assert not demo_app.throttle.emails.has_tokens("other@example.com")
+
+
+def test_state_api_is_off_unless_enabled(client, monkeypatch):
+    monkeypatch.setitem(demo_app.app.config, 'TEST_STATE_API', False)
+
+    assert client.post('/_test/snapshot').status_code == 404
+    assert client.post('/_test/restore/1').status_code == 404
+
+
+def test_unknown_snapshot_is_404(client):
+    assert client.post('/_test/restore/999999').status_code == 404
@@ -0,0 +1,126 @@
+"""
+Unit Tests - streaming_report.py
+Fake TestReports go through EventLog; render() reads the log back
+"""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import streaming_report
+
+pytestmark = pytest.mark.unit
+
+
+class FakeReport:
+    """The TestReport attributes EventLog reads"""
+
+    def __init__(self, nodeid, when, outcome, message='', duration=0.1):
+        self.nodeid = nodeid
+        self.when = when
+        self.outcome = outcome
+        self.passed = outcome == 'passed'
+        self.failed = outcome == 'failed'
+        self.skipped = outcome == 'skipped'
+        self.duration = duration
+        self.user_properties = [('wait_seconds', 0.5)] if when == 'call' else []
+        self.longreprtext = message
+
+
+def log_test(log, nodeid, setup='passed', call='passed', teardown='passed'):
+    log.test_report(FakeReport(nodeid, 'setup', setup, 'setup broke' if setup == 'failed' else ''))
+    if setup == 'passed':
+        log.test_report(FakeReport(nodeid, 'call', call, 'E  assert False' if call == 'failed' else ''))
+    log.test_report(FakeReport(nodeid, 'teardown', teardown, 'teardown broke' if teardown == 'failed' else ''))
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = streaming_report.EventLog(str(path), phase='smoke')
+    yield log, path
+    if not log._file.closed:
+        log.close()
+
+
+def read_tests(path):
+    return [event for event in map(json.loads, path.read_text().splitlines()) if event['event'] == 'test']
+
+
+def test_one_event_per_test(event_log):
+    log, path = event_log
+    log_test(log, "t.py::test_pass")
+    log_test(log, "t.py::test_fail", call='failed')
+    log_test(log, "t.py::test_fail_and_teardown", call='failed', teardown='failed')
+    log_test(log, "t.py::test_pass_and_teardown", teardown='failed')
+    log_test(log, "t.py::test_setup_error", setup='failed')
+    log.close()
+
+    events = {event['nodeid'].split('::')[1]: event for event in read_tests(path)}
+    assert len(read_tests(path)) == 5
+    assert events['test_pass']['outcome'] == 'passed'
+    assert events['test_pass']['wait_seconds'] == 0.5
+    assert events['test_fail_and_teardown']['outcome'] == 'failed'
+    assert events['test_fail_and_teardown']['teardown_error'] == 'teardown broke'
+    assert events['test_pass_and_teardown']['outcome'] == 'error'
+    assert events['test_pass_and_teardown']['message'] == 'teardown broke'
+    assert events['test_setup_error']['outcome'] == 'error'
+    assert events['test_setup_error']['phase'] == 'smoke'
+
+
+def test_close_keeps_results_without_teardown(event_log):
+    log, path = event_log
+    log.test_report(FakeReport("t.py::test_interrupted", 'call', 'passed'))
+    log.close()
+
+    assert [event['nodeid'] for event in read_tests(path)] == ["t.py::test_interrupted"]
+
+
+def test_junit_has_one_testcase_per_test(event_log, tmp_path):
+    log, path = event_log
+    log_test(log, "t.py::test_pass")
+    log_test(log, "t.py::test_fail_and_teardown", call='failed', teardown='failed')
+    log_test(log, "t.py::test_pass_and_teardown", teardown='failed')
+    log.close()
+    junit = tmp_path / "junit.xml"
+
+    summary = streaming_report.render([str(path)], junit_path=str(junit))
+
+    suite = ET.parse(junit).getroot().find('testsuite')
+    assert suite.get('name') == 'smoke'
+    assert [case.get('name') for case in suite.iter('testcase')] == [
+        'test_pass', 'test_fail_and_teardown', 'test_pass_and_teardown']
+    assert (suite.get('tests'), suite.get('failures'), suite.get('errors')) == ('3', '1', '2')
+    assert summary['totals'] == {'passed': 1, 'failed': 1, 'error': 1, 'skipped': 0}
+
+
+def test_logs_merge_into_paginated_html(tmp_path):
+    paths = []
+    for phase in ('smoke', 'regression'):
+        path = tmp_path / f"{phase}.jsonl"
+        log = streaming_report.EventLog(str(path), phase=phase)
+        for n in range(3):
+            log_test(log, f"t.py::test_{phase}_{n}")
+        log.write('slowest_phases', totals={'navigation': 1.5},
+                  spans=[{'seconds': 1.5, 'cat': 'navigation', 'name': 'get /login', 'test': f"t.py::test_{phase}_0"}])
+        log.close()
+        paths.append(str(path))
+    html_dir = tmp_path / "report"
+
+    summary = streaming_report.render(paths, html_dir=str(html_dir), page_size=2)
+
+    assert summary['phases'] == {'smoke': {'passed': 3, 'failed': 0, 'error': 0, 'skipped': 0},
+                                 'regression': {'passed': 3, 'failed': 0, 'error': 0, 'skipped': 0}}
+    assert summary['pages']['all'] == 3
+    assert summary['phase_totals'] == {'navigation': 3.0}
+    assert len(summary['slowest_phases']) == 2
+    assert (html_dir / "pages" / "passed-3.js").exists()
+    assert "Slowest phases" in (html_dir / "index.html").read_text()
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"event": "test", "nodeid": "t.py::test_a", "outcome": "passed"}\n{"event": "te')
+
+    assert streaming_report.render([str(path)])['totals']['passed'] == 1
@@ -0,0 +1,129 @@
+"""
+Unit Tests - throttle.py
+TokenBuckets run on a fake clock; LoginThrottle runs inside a request context
+"""
+
+import pytest
+from flask import Flask, g
+
+import throttle
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_then_empty(clock):
+    buckets = throttle.TokenBuckets(burst=3, rate=1.0, clock=clock)
+
+    assert [buckets.take("k") for _ in range(4)] == [True, True, True, False]
+    assert not buckets.has_tokens("k")
+    assert buckets.retry_after("k") == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_rate_up_to_burst(clock):
+    buckets = throttle.TokenBuckets(burst=2, rate=0.5, clock=clock)
+    buckets.take("k")
+    buckets.take("k")
+
+    clock.now += 2
+    assert buckets.take("k")
+    assert not buckets.take("k")
+
+    clock.now += 100
+    assert [buckets.take("k") for _ in range(3)] == [True, True, False]
+
+
+def test_idle_buckets_are_evicted_after_ttl(clock):
+    buckets = throttle.TokenBuckets(burst=2, rate=1.0, clock=clock)
+    buckets.take("old")
+
+    clock.now += buckets.ttl
+    buckets.take("new")
+
+    assert len(buckets) == 1
+    assert buckets.evictions == 1
+    assert buckets.has_tokens("old")
+
+
+def test_least_recent_key_is_evicted_over_max_keys(clock):
+    buckets = throttle.TokenBuckets(burst=1, rate=0.001, max_keys=2, clock=clock)
+    for key in ("a", "b", "c"):
+        buckets.take(key)
+
+    assert len(buckets) == 2
+    assert buckets.has_tokens("a")
+    assert not buckets.has_tokens("c")
+
+
+def test_refund_is_capped_at_burst(clock):
+    buckets = throttle.TokenBuckets(burst=2, rate=0.001, clock=clock)
+    buckets.take("k")
+    buckets.take("k")
+
+    buckets.refund("k", tokens=5)
+    buckets.refund("unknown")
+
+    assert [buckets.take("k") for _ in range(3)] == [True, True, False]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(LOGIN_THROTTLE=True, LOGIN_THROTTLE_CLIENT=(3, 0.001), LOGIN_THROTTLE_EMAIL=(2, 0.001))
+    return app
+
+
+def test_client_bucket_limits_login_attempts(app):
+    limiter = throttle.LoginThrottle(app)
+    with app.test_request_context('/login', method='POST', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        results = [limiter.check(f"user{n}@example.com") for n in range(4)]
+
+    assert results[:3] == [0, 0, 0]
+    assert results[3] > 0
+    assert limiter.stats()['rejected_client'] == 1
+
+
+def test_failed_logins_lock_the_email_only(app):
+    limiter = throttle.LoginThrottle(app)
+    with app.test_request_context('/login', method='POST'):
+        limiter.failed("Victim@Example.com")
+        limiter.failed("victim@example.com")
+
+        assert limiter.check("victim@example.com") > 0
+        assert limiter.check("other@example.com") == 0
+    assert limiter.stats()['rejected_email'] == 1
+
+
+def test_disabled_throttle_allows_everything(app):
+    app.config['LOGIN_THROTTLE'] = False
+    limiter = throttle.LoginThrottle(app)
+    with app.test_request_context('/login', method='POST'):
+        for _ in range(10):
+            limiter.failed("a@example.com")
+            assert limiter.check("a@example.com") == 0
+
+
+def test_charges_are_recorded_and_refunded(app):
+    limiter = throttle.LoginThrottle(app)
+    with app.test_request_context('/login', method='POST', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        g.throttle_charges = charges = []
+        limiter.check("a@example.com")
+        limiter.failed("a@example.com")
+        limiter.failed("a@example.com")
+
+        assert charges == [('clients', '10.0.0.1'), ('emails', 'a@example.com'), ('emails', 'a@example.com')]
+        assert limiter.check("a@example.com") > 0
+        limiter.refund(charges)
+        assert limiter.check("a@example.com") == 0
@@ -0,0 +1,85 @@
+"""
+Unit Tests - user_store.py
+Both backends run the same checks; the SQLite store uses a temporary file
+"""
+
+import threading
+
+import pytest
+
+import user_store
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = user_store.create_user_store("memory")
+    else:
+        store = user_store.create_user_store(f"sqlite:{tmp_path / 'users.db'}")
+    yield store
+    store.close()
+
+
+def test_create_and_get(store):
+    assert store.create("a@example.com", {"first_name": "A"})
+
+    assert store.get("a@example.com") == {"first_name": "A"}
+    assert "a@example.com" in store
+    assert store.get("missing@example.com") is None
+    assert store.count() == 1
+
+
+def test_duplicate_email_is_rejected(store):
+    assert store.create("a@example.com", {"first_name": "First"})
+
+    assert not store.create("a@example.com", {"first_name": "Second"})
+    assert store.get("a@example.com") == {"first_name": "First"}
+    assert store.count() == 1
+
+
+def test_parallel_signups_for_one_email_create_one_user(store):
+    results = []
+    barrier = threading.Barrier(8)
+
+    def sign_up(n):
+        barrier.wait()
+        results.append(store.create("race@example.com", {"n": n}))
+
+    threads = [threading.Thread(target=sign_up, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert store.count() == 1
+
+
+def test_delete(store):
+    store.create("a@example.com", {})
+    store.create("b@example.com", {})
+
+    store.delete("a@example.com")
+    store.delete("missing@example.com")
+
+    assert "a@example.com" not in store
+    assert "b@example.com" in store
+
+
+def test_sqlite_store_survives_reopen(tmp_path):
+    path = tmp_path / "users.db"
+    first = user_store.SqliteUserStore(str(path), pool_size=1)
+    first.create("a@example.com", {"first_name": "A"})
+    first.close()
+
+    second = user_store.SqliteUserStore(str(path), pool_size=1)
+    assert second.get("a@example.com") == {"first_name": "A"}
+    assert not second.create("a@example.com", {})
+    second.close()
+
+
+def test_unknown_store_spec():
+    with pytest.raises(ValueError, match="Unknown user store"):
+        user_store.create_user_store("redis://localhost")
@@ -0,0 +1,176 @@
+"""
+Login Throttle - token buckets that reject abusive logins before credential work
+- Per-client bucket (remote address): every login POST takes a token
+- Per-email bucket: every failed login takes a token, so a user's own
+  successful logins never lock them out
+- A request is rejected with 429 when either bucket is empty, before the user
+  store or the password hasher is touched
+Buckets live in an LRU (OrderedDict) with a size cap and a TTL; a bucket idle
+for the TTL has refilled completely, so evicting it loses nothing. Every check
+is O(1) amortized and memory is bounded by max_keys per table
+
+Config: LOGIN_THROTTLE (DEMO_APP_THROTTLE=0 disables), LOGIN_THROTTLE_CLIENT and
+LOGIN_THROTTLE_EMAIL as (burst, tokens per second)
+Test snapshots (demo_app.snapshot_state) collect the charges made under them in
+g.throttle_charges; refund() gives exactly those tokens back on restore
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, request
+
+
+DEFAULT_CLIENT_LIMIT = (10, 2.0)
+DEFAULT_EMAIL_LIMIT = (20, 0.5)
+DEFAULT_MAX_KEYS = 100000
+
+
+class TokenBuckets:
+    """Token bucket per key with LRU + TTL eviction"""
+
+    def __init__(self, burst, rate, max_keys=DEFAULT_MAX_KEYS, clock=time.monotonic):
+        self.burst = burst
+        self.rate = rate
+        self.max_keys = max_keys
+        # Idle this long and the bucket is full again: same as not tracking it
+        self.ttl = burst / rate
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _refilled(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return [float(self.burst), now]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        return bucket
+
+    def _store(self, key, bucket, now):
+        self._buckets[key] = bucket
+        self._buckets.move_to_end(key)
+        # Oldest first: stop at the first bucket that is still live
+        while self._buckets:
+            oldest_key, oldest = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - oldest[1] < self.ttl:
+                break
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+    def has_tokens(self, key):
+        """True when key could spend a token now (does not spend it)"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return True
+            return bucket[0] + (self.clock() - bucket[1]) * self.rate >= 1
+
+    def take(self, key):
+        """Spend a token for key; False (and nothing spent) when the bucket is empty"""
+        now = self.clock()
+        with self._lock:
+            bucket = self._refilled(key, now)
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            self._store(key, bucket, now)
+            return allowed
+
+    def retry_after(self, key):
+        """Seconds until key has a token again"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return 0.0
+            tokens = bucket[0] + (self.clock() - bucket[1]) * self.rate
+            return max(0.0, (1 - tokens) / self.rate)
+
+    def refund(self, key, tokens=1):
+        """Give back tokens spent by key, never above the burst"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + tokens)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """Flask extension holding the per-client and per-email buckets"""
+
+    def __init__(self, app=None):
+        self.clients = self.emails = None
+        self.allowed = 0
+        self.rejected_client = 0
+        self.rejected_email = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('LOGIN_THROTTLE', os.environ.get('DEMO_APP_THROTTLE', '1') != '0')
+        app.config.setdefault('LOGIN_THROTTLE_CLIENT', DEFAULT_CLIENT_LIMIT)
+        app.config.setdefault('LOGIN_THROTTLE_EMAIL', DEFAULT_EMAIL_LIMIT)
+        self.reset()
+        return self
+
+    def reset(self):
+        """Fresh buckets from the current config"""
+        self.clients = TokenBuckets(*self.app.config['LOGIN_THROTTLE_CLIENT'])
+        self.emails = TokenBuckets(*self.app.config['LOGIN_THROTTLE_EMAIL'])
+
+    @property
+    def enabled(self):
+        return self.app.config['LOGIN_THROTTLE']
+
+    def check(self, email):
+        """Seconds to wait before retrying, or 0 when the attempt may go ahead"""
+        if not self.enabled:
+            return 0
+        email = email.lower()
+        # Peek the email bucket first so a locked-out email does not drain the client bucket
+        if not self.emails.has_tokens(email):
+            self.rejected_email += 1
+            return self.emails.retry_after(email)
+        client = request.remote_addr or 'unknown'
+        if not self.clients.take(client):
+            self.rejected_client += 1
+            return self.clients.retry_after(client)
+        self._charged('clients', client)
+        self.allowed += 1
+        return 0
+
+    def failed(self, email):
+        """Charge a failed login to its email"""
+        if self.enabled and self.emails.take(email.lower()):
+            self._charged('emails', email.lower())
+
+    def _charged(self, table, key):
+        charges = g.get('throttle_charges')
+        if charges is not None:
+            charges.append((table, key))
+
+    def refund(self, charges):
+        """Give back charges recorded as (table, key), e.g. a test snapshot's"""
+        for table, key in charges:
+            getattr(self, table).refund(key)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'allowed': self.allowed,
+            'rejected_client': self.rejected_client,
+            'rejected_email': self.rejected_email,
+            'tracked_clients': len(self.clients),
+            'tracked_emails': len(self.emails),
+            'evictions': self.clients.evictions + self.emails.evictions,
+        }
@@ -0,0 +1,157 @@
+"""
+User Store - pluggable, thread-safe storage for demo_app users
+- MemoryUserStore: dict with striped locks (default, fast, lost on restart)
+- SqliteUserStore: SQLite in WAL mode with a connection pool, a unique
+  index on email and fixed parameterized statements (survives restarts and
+  can be shared by several server processes)
+Both expose an atomic create() so signup cannot race two requests into
+registering the same email, and delete() for demo_app's test-only state
+rollback
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+DEFAULT_STRIPES = 16
+DEFAULT_POOL_SIZE = 8
+
+
+class UserStore:
+    """Interface shared by the store backends"""
+
+    def get(self, email):
+        """User record for email, or None"""
+        raise NotImplementedError
+
+    def create(self, email, record):
+        """Insert record if email is not registered yet; True if it was created"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def delete(self, email):
+        """Remove email's user if there is one"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __contains__(self, email):
+        return self.get(email) is not None
+
+    def seed(self, users):
+        """Create any of users (email -> record) that do not exist yet"""
+        for email, record in users.items():
+            self.create(email, dict(record))
+
+
+class MemoryUserStore(UserStore):
+    """In-process store; one lock per stripe of the key space"""
+
+    def __init__(self, stripes=DEFAULT_STRIPES):
+        self._users = {}
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _lock(self, email):
+        return self._locks[hash(email) % len(self._locks)]
+
+    def get(self, email):
+        record = self._users.get(email)
+        return dict(record) if record is not None else None
+
+    def create(self, email, record):
+        with self._lock(email):
+            if email in self._users:
+                return False
+            self._users[email] = dict(record)
+            return True
+
+    def count(self):
+        return len(self._users)
+
+    def delete(self, email):
+        with self._lock(email):
+            self._users.pop(email, None)
+
+
+class SqliteUserStore(UserStore):
+    """SQLite-backed store in WAL mode with pooled connections"""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users ("
+        " id INTEGER PRIMARY KEY,"
+        " email TEXT NOT NULL,"
+        " record TEXT NOT NULL)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email)",
+    )
+    # Kept as constants so sqlite3's statement cache reuses the prepared statements
+    _SELECT = "SELECT record FROM users WHERE email = ?"
+    _INSERT = "INSERT OR IGNORE INTO users (email, record) VALUES (?, ?)"
+    _COUNT = "SELECT COUNT(*) FROM users"
+    _DELETE = "DELETE FROM users WHERE email = ?"
+
+    def __init__(self, path, pool_size=DEFAULT_POOL_SIZE):
+        self.path = path
+        self._pool = queue.LifoQueue()
+        self._connections = []
+        for _ in range(pool_size):
+            connection = self._connect()
+            self._connections.append(connection)
+            self._pool.put(connection)
+
+        with self._connection() as connection:
+            for statement in self._SCHEMA:
+                connection.execute(statement)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False,
+                                     isolation_level=None, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    @contextmanager
+    def _connection(self):
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def get(self, email):
+        with self._connection() as connection:
+            row = connection.execute(self._SELECT, (email,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def create(self, email, record):
+        with self._connection() as connection:
+            cursor = connection.execute(self._INSERT, (email, json.dumps(record)))
+        return cursor.rowcount == 1
+
+    def count(self):
+        with self._connection() as connection:
+            return connection.execute(self._COUNT).fetchone()[0]
+
+    def delete(self, email):
+        with self._connection() as connection:
+            connection.execute(self._DELETE, (email,))
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+
+
+def create_user_store(spec='memory'):
+    """Build a store from a spec string: 'memory' or 'sqlite:<path>'"""
+    if spec == 'memory':
+        return MemoryUserStore()
+    if spec.startswith('sqlite:'):
+        return SqliteUserStore(spec[len('sqlite:'):] or 'demo_users.db')
+    raise ValueError(f"Unknown user store {spec!r} (expected 'memory' or 'sqlite:<path>')")
@@ -0,0 +1,137 @@
+"""
+Event-driven waits - wait inside the browser instead of polling page_source
+Each wait runs one execute_async_script call that resolves as soon as a
+MutationObserver (DOM changes) or navigation listener sees the condition,
+so no page source is transferred while waiting
+- wait_for_flash: a flash message containing text appears
+- wait_for_text: text appears anywhere in the page body
+- wait_for_element: an element with the given id is in the DOM
+- wait_for_url: the URL contains a fragment (survives full page navigations)
+Time spent in waits is accumulated per test for the wait-time report
+"""
+
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+import profiler
+
+
+DEFAULT_TIMEOUT = 10
+
+# Extra time WebDriver allows the script beyond our own JS timer
+SCRIPT_TIMEOUT_SLACK = 1.0
+
+_DOM_WAIT_JS = """
+var mode = arguments[0], text = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+function found() {
+    if (mode === 'flash') {
+        var nodes = document.querySelectorAll('.flash');
+        for (var i = 0; i < nodes.length; i++) {
+            if (nodes[i].textContent.indexOf(text) !== -1) return true;
+        }
+        return false;
+    }
+    if (mode === 'id') return !!document.getElementById(text);
+    return !!document.body && document.body.textContent.indexOf(text) !== -1;
+}
+if (found()) return done(true);
+var observer = new MutationObserver(function () {
+    if (found()) { clearTimeout(timer); observer.disconnect(); done(true); }
+});
+var timer = setTimeout(function () { observer.disconnect(); done(false); }, timeoutMs);
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+"""
+
+_URL_WAIT_JS = """
+var fragment = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+if (location.href.indexOf(fragment) !== -1) return done(true);
+function check() {
+    if (location.href.indexOf(fragment) !== -1) { cleanup(); done(true); }
+}
+function cleanup() {
+    clearTimeout(timer);
+    window.removeEventListener('popstate', check);
+    window.removeEventListener('hashchange', check);
+}
+window.addEventListener('popstate', check);
+window.addEventListener('hashchange', check);
+var timer = setTimeout(function () { cleanup(); done(false); }, timeoutMs);
+"""
+
+_stats = {'seconds': 0.0, 'count': 0}
+
+
+def reset_stats():
+    """Start a fresh per-test wait tally"""
+    _stats['seconds'] = 0.0
+    _stats['count'] = 0
+
+
+def stats():
+    """Wait tally since the last reset_stats()"""
+    return dict(_stats)
+
+
+def record(seconds):
+    _stats['seconds'] += seconds
+    _stats['count'] += 1
+
+
+@contextmanager
+def _tally(description):
+    """Count the block in the per-test tally and the profiler timeline"""
+    start = time.perf_counter()
+    try:
+        with profiler.span('wait ' + description, 'wait'):
+            yield
+    finally:
+        record(time.perf_counter() - start)
+
+
+def _wait_in_page(driver, script, args, timeout, description):
+    """Run an async wait script, re-arming it when a navigation unloads the page"""
+    deadline = time.monotonic() + timeout
+    with _tally(description):
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+            driver.set_script_timeout(remaining + SCRIPT_TIMEOUT_SLACK)
+            try:
+                if driver.execute_async_script(script, *args, int(remaining * 1000)):
+                    return True
+            except JavascriptException as e:
+                # A form submit or link click replaced the document mid-wait;
+                # check again on the new page
+                if 'unload' not in str(e).lower():
+                    raise
+
+
+def wait_for_flash(driver, text, timeout=DEFAULT_TIMEOUT):
+    """Wait until a .flash message containing text is on the page"""
+    return _wait_in_page(driver, _DOM_WAIT_JS, ('flash', text), timeout, f"flash message {text!r}")
+
+
+def wait_for_text(driver, text, timeout=DEFAULT_TIMEOUT):
+    """Wait until text appears in the page body"""
+    return _wait_in_page(driver, _DOM_WAIT_JS, ('text', text), timeout, f"text {text!r}")
+
+
+def wait_for_element(driver, element_id, timeout=DEFAULT_TIMEOUT):
+    """Wait until an element with element_id is in the DOM"""
+    return _wait_in_page(driver, _DOM_WAIT_JS, ('id', element_id), timeout, f"element #{element_id}")
+
+
+def wait_for_url(driver, fragment, timeout=DEFAULT_TIMEOUT):
+    """Wait until the current URL contains fragment"""
+    return _wait_in_page(driver, _URL_WAIT_JS, (fragment,), timeout, f"URL containing {fragment!r}")
+
+
+def timed(fn, *args, **kwargs):
+    """Run any other wait (e.g. WebDriverWait.until) and count it in the tally"""
+    with _tally(getattr(fn, '__name__', 'condition')):
+        return fn(*args, **kwargs)
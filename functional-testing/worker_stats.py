@@ -0,0 +1,44 @@
+"""
+Worker Stats - share per-worker measurements with the controller process
+Works the same with and without pytest-xdist
+- Workers publish into config.workeroutput, which xdist ships back on shutdown
+- The controller (or a plain single-process run) keeps everything locally
+"""
+
+
+def _local(config):
+    if not hasattr(config, '_worker_stats'):
+        config._worker_stats = {}
+    return config._worker_stats
+
+
+def is_worker(config):
+    """True when running inside an xdist worker process"""
+    return hasattr(config, 'workeroutput')
+
+
+def worker_id(config):
+    """xdist worker id ('gw0', 'gw1', ...) or 'main' without xdist"""
+    if is_worker(config):
+        return config.workerinput.get('workerid', 'gw?')
+    return 'main'
+
+
+def publish(config, key, data):
+    """Publish one worker's stats under key"""
+    if is_worker(config):
+        config.workeroutput.setdefault('stats', {})[key] = data
+    else:
+        _local(config).setdefault(key, []).append(data)
+
+
+def collect(config, node):
+    """Pull published stats off a finished xdist node (call from pytest_testnodedown)"""
+    workeroutput = getattr(node, 'workeroutput', None) or {}
+    for key, data in workeroutput.get('stats', {}).items():
+        _local(config).setdefault(key, []).append(data)
+
+
+def gather(config, key):
+    """All stats published under key, one entry per worker"""
+    return list(_local(config).get(key, []))
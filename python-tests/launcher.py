@@ -0,0 +1,10 @@
+# Makes the shared browser launcher at the repo root (cached driver, warm
+# profile, lean arguments) importable from this folder:
+#     from launcher import browser_launch
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_launch  # noqa: E402,F401
@@ -1,18 +1,20 @@
 # Brave Search Automation Test Suite - Without Pytest
 # Manual test execution with try/except blocks and result tracking
 
-from selenium import webdriver
+import os
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from launcher import browser_launch
+
 
 # Setup browser driver
 def setup_driver():
-    options = webdriver.ChromeOptions()
-    options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-
-    driver = webdriver.Chrome(options=options)
+    # HEADLESS=1 runs without a window
+    driver = browser_launch.launch(headless=os.environ.get("HEADLESS") == "1",
+                                   binary_location=browser_launch.BRAVE_MAC)
     driver.maximize_window()
     return driver
 
@@ -139,3 +141,4 @@ if __name__ == "__main__":
         if driver:
             driver.quit()
             print("\nBrowser closed.")
+        print(browser_launch.report())
@@ -1,18 +1,20 @@
 # Import required libraries
+import os
+
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from launcher import browser_launch
+
 
 # Setup and teardown browser for each test
 @pytest.fixture
 def driver():
-    options = webdriver.ChromeOptions()
-    options.binary_location = "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-
-    driver = webdriver.Chrome(options=options)
+    # HEADLESS=1 runs without a window
+    driver = browser_launch.launch(headless=os.environ.get("HEADLESS") == "1",
+                                   binary_location=browser_launch.BRAVE_MAC)
     driver.maximize_window()
 
     yield driver